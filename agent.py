@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from host_sampler import HostSampler
+from sample_codec import MIME_TYPE, encode_batch
+from sample_store import SHIPPED_COLUMNS, SampleStore, shipped_row
+
+
+# 원격 서버에 배포하는 경량 에이전트 (Flask/numpy 없이 psutil과 표준 라이브러리만 사용)
+#
+# MetricsCollector와 같은 HostSampler로 수집해 고정 크기 버퍼에 보관하고,
+# 중앙 수집기는 /api/samples?since=<seq> 로 마지막으로 받은 이후의 샘플을 한 번에 가져간다.
+# Accept: application/x-monitor-samples 이면 sample_codec 형식으로 압축해 보낸다.
+#
+#   python agent.py --port 5001
+#   python agent.py --unix-socket /run/monitor-agent.sock
+
+DEFAULT_CONFIG = {
+    'host': '0.0.0.0',
+    'port': 5001,
+    'unix_socket': None,
+    'sample_interval': 1.0,
+    'buffer_size': 3600,  # 중앙 수집기가 이 시간(샘플 수) 이상 끊겨 있으면 유실
+    'max_batch': 3600,
+    'disk_usage_path': '/',
+    # 코어별/디스크별/NIC별 메트릭 (켜면 extended_metrics를 불러옴)
+    'extended_metrics': False,
+    'metric_families': {},
+    'collection_budget_ms': 20.0,
+}
+
+# 요청 헤더 최대 크기 (에이전트는 작은 GET 요청만 받음)
+MAX_HEADER_LINES = 100
+
+
+def load_config(path='config/agent.json'):
+    config = dict(DEFAULT_CONFIG)
+    try:
+        with open(path, 'r') as f:
+            config.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    return config
+
+
+class Agent:
+    """HostSampler로 주기 수집한 샘플을 순번과 함께 링 버퍼에 보관"""
+
+    def __init__(self, config):
+        self.config = config
+        self.sampler = HostSampler(config['disk_usage_path'])
+        self.buffer = SampleStore(config['buffer_size'], SHIPPED_COLUMNS)
+        self.extended = None
+        if config['extended_metrics']:
+            from extended_metrics import ExtendedCollector
+            self.extended = ExtendedCollector(
+                config['metric_families'], config['collection_budget_ms']
+            )
+        self.started_at = time.time()
+        self._latest = None
+        self._stop_event = threading.Event()
+
+    def tick(self):
+        now = time.time()
+        metrics = self.sampler.sample(now)
+        if self.extended is not None:
+            metrics.update(self.extended.collect(now))
+        self.buffer.append(shipped_row(metrics))
+        # 최신 샘플은 요청마다 다시 직렬화하지 않도록 JSON 바이트로 보관
+        self._latest = json.dumps(metrics, separators=(',', ':')).encode('utf-8')
+
+    def run(self):
+        interval = self.config['sample_interval']
+        next_run = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Error in agent tick: {e}")
+            next_run = max(next_run + interval, time.monotonic())
+            self._stop_event.wait(next_run - time.monotonic())
+
+    def start(self):
+        self.tick()
+        threading.Thread(target=self.run, name='agent-sampler', daemon=True).start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def latest(self):
+        return self._latest
+
+    def batch(self, since, limit):
+        """순번 since부터의 샘플 (since가 None이면 최신 샘플 하나부터)
+
+        head_seq는 다음에 기록될 순번, started_at은 에이전트 재시작 감지용이다.
+        """
+        head = self.buffer.next_seq
+        if since is None:
+            since = max(head - 1, 0)
+        first, rows = self.buffer.since(since, min(limit, self.config['max_batch']))
+        return {
+            'columns': self.buffer.column_names,
+            'rows': rows,
+            'first_seq': first,
+            'head_seq': head,
+            'started_at': self.started_at,
+        }
+
+
+class AgentRequestHandler(socketserver.StreamRequestHandler):
+    """GET만 처리하는 최소 HTTP/1.1 핸들러 (keep-alive 지원)
+
+    http.server는 http.client/email/ssl까지 불러와 시작 시간이 길어지므로 사용하지 않는다.
+    """
+
+    def handle(self):
+        while True:
+            request_line = self.rfile.readline(8192)
+            if not request_line:
+                return
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                self._send(400, {'error': 'Bad request'}, keep_alive=False)
+                return
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = self.rfile.readline(8192)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' and (
+                version != 'HTTP/1.0' or connection == 'keep-alive'
+            )
+            if method != 'GET':
+                self._send(405, {'error': 'Method not allowed'}, keep_alive)
+            else:
+                self._route(target, headers, keep_alive)
+            if not keep_alive:
+                return
+
+    def _route(self, target, headers, keep_alive):
+        agent = self.server.agent
+        url = urlsplit(target)
+        if url.path == '/api/metrics':
+            latest = agent.latest()
+            if latest is None:
+                self._send(503, {'error': 'No metrics collected yet'}, keep_alive)
+            else:
+                self._send(200, latest, keep_alive)
+        elif url.path == '/api/samples':
+            query = parse_qs(url.query)
+            try:
+                since = int(query['since'][0]) if 'since' in query else None
+                limit = int(query.get('limit', [str(agent.config['max_batch'])])[0])
+            except ValueError:
+                self._send(400, {'error': 'Invalid since or limit parameter'}, keep_alive)
+                return
+            if (since is not None and since < 0) or limit < 1:
+                self._send(400, {'error': 'Invalid since or limit parameter'}, keep_alive)
+                return
+            batch = agent.batch(since, limit)
+            if MIME_TYPE in headers.get('accept', ''):
+                body = encode_batch(
+                    batch['columns'], batch['rows'],
+                    batch['first_seq'], batch['head_seq'], batch['started_at']
+                )
+                self._send(200, body, keep_alive, MIME_TYPE)
+            else:
+                self._send(200, batch, keep_alive)
+        else:
+            self._send(404, {'error': 'Not found'}, keep_alive)
+
+    def _send(self, status, body, keep_alive, content_type='application/json'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed', 503: 'Service Unavailable'}[status]
+        self.wfile.write((
+            f'HTTP/1.1 {status} {reason}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1') + body)
+
+
+class AgentTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class AgentUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:  # Windows
+    AgentUnixServer = None
+
+
+def make_server(agent, host='0.0.0.0', port=5001, unix_socket=None):
+    if unix_socket:
+        if AgentUnixServer is None:
+            raise ValueError("Unix sockets are not supported on this platform")
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = AgentUnixServer(unix_socket, AgentRequestHandler)
+    else:
+        server = AgentTCPServer((host, port), AgentRequestHandler)
+    server.agent = agent
+    return server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Lightweight metrics agent')
+    parser.add_argument('--config', default='config/agent.json')
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--unix-socket')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = load_config(args.config)
+    for key in ('host', 'port', 'unix_socket'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+
+    agent = Agent(config)
+    server = make_server(agent, config['host'], config['port'], config['unix_socket'])
+    agent.start()
+    address = config['unix_socket'] or f"{config['host']}:{config['port']}"
+    print(f"Agent listening on {address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+from datetime import datetime
+
+import numpy as np
+
+
+# 규칙 상태 (서버 x 규칙 배열에 저장)
+OK, PENDING, FIRING, RESOLVED = 0, 1, 2, 3
+STATE_NAMES = ('ok', 'pending', 'firing', 'resolved')
+
+
+class AlertRule:
+    """config/alert_rules.json 의 규칙 하나"""
+
+    def __init__(self, rule):
+        self.id = rule['id']
+        self.metric = rule['metric']
+        self.path = tuple(self.metric.split('.'))
+        self.type = rule.get('type', self.path[0])
+        self.above = float(rule['above'])
+        # 해제 임계값 (히스테리시스), 기본은 발생 임계값과 동일
+        self.clear = float(rule.get('clear', self.above))
+        self.for_seconds = float(rule.get('for_seconds', 0))
+        self.severity = rule.get('severity', 'medium')
+        self.servers = rule.get('servers')
+
+    def applies_to(self, server_id):
+        return self.servers is None or server_id in self.servers
+
+
+class AlertEngine:
+    """서버/규칙별 상태 머신 (ok -> pending -> firing -> resolved) 기반 알림 엔진
+
+    한 샘플에 대해 모든 규칙을 배열 연산으로 한 번에 평가하며,
+    상태가 firing/resolved로 바뀌는 순간에만 알림을 만든다 (중복 제거).
+    """
+
+    def __init__(self, rules):
+        self.rules = [AlertRule(rule) for rule in rules]
+        self._above = np.array([rule.above for rule in self.rules], dtype=float)
+        self._clear = np.array([rule.clear for rule in self.rules], dtype=float)
+        self._for_seconds = np.array([rule.for_seconds for rule in self.rules], dtype=float)
+        # 같은 메트릭을 보는 규칙이 여러 개여도 값은 한 번만 꺼냄
+        self._paths = sorted({rule.path for rule in self.rules})
+        self._path_index = np.array(
+            [self._paths.index(rule.path) for rule in self.rules], dtype=int
+        )
+        self._servers = {}
+
+    def _server_state(self, server_id):
+        state = self._servers.get(server_id)
+        if state is None:
+            n = len(self.rules)
+            state = {
+                'state': np.full(n, OK, dtype=np.int8),
+                'since': np.zeros(n, dtype=float),
+                'mask': np.array([rule.applies_to(server_id) for rule in self.rules], dtype=bool),
+            }
+            self._servers[server_id] = state
+        return state
+
+    def _extract(self, metrics):
+        values = np.full(len(self._paths), np.nan)
+        for i, path in enumerate(self._paths):
+            value = metrics
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    value = None
+                    break
+                value = value[key]
+            if isinstance(value, (int, float)):
+                values[i] = value
+        return values
+
+    def evaluate(self, server_id, timestamp, metrics):
+        """샘플 하나를 평가하고 새로 발생/해제된 알림 목록 반환"""
+        if not self.rules:
+            return []
+        server = self._server_state(server_id)
+        state, since, mask = server['state'], server['since'], server['mask']
+        values = self._extract(metrics)[self._path_index]
+
+        # NaN(값 없음)은 비교 결과가 모두 False라 상태가 유지됨
+        with np.errstate(invalid='ignore'):
+            over = (values > self._above) & mask
+            under = (values < self._clear) | ~mask
+
+        idle = (state == OK) | (state == RESOLVED)
+        start = idle & over
+        since[start] = timestamp
+        state[idle] = OK
+        state[start] = PENDING
+
+        # 조건이 지속 시간 동안 유지되지 않으면 다시 ok
+        state[(state == PENDING) & ~over] = OK
+        fired = (state == PENDING) & over & (timestamp - since >= self._for_seconds)
+        resolved = (state == FIRING) & under
+
+        state[fired] = FIRING
+        state[resolved] = RESOLVED
+
+        alerts = []
+        for i in np.flatnonzero(fired | resolved):
+            alerts.append(self._make_alert(server_id, self.rules[i], values[i], state[i], timestamp))
+        return alerts
+
+    def _make_alert(self, server_id, rule, value, state, timestamp):
+        state_name = STATE_NAMES[state]
+        if state == FIRING:
+            message = f"{rule.metric} is {round(float(value), 2)} (above {rule.above:g})"
+        else:
+            message = f"{rule.metric} recovered to {round(float(value), 2)} (below {rule.clear:g})"
+        return {
+            'type': rule.type,
+            'rule': rule.id,
+            'server_id': server_id,
+            'state': state_name,
+            'severity': rule.severity,
+            'value': round(float(value), 2),
+            'threshold': rule.above if state == FIRING else rule.clear,
+            'message': message,
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat()
+        }
+
+    def active(self):
+        """현재 pending/firing 상태인 규칙 목록"""
+        active = []
+        for server_id, server in self._servers.items():
+            for i in np.flatnonzero((server['state'] == PENDING) | (server['state'] == FIRING)):
+                active.append({
+                    'server_id': server_id,
+                    'rule': self.rules[i].id,
+                    'state': STATE_NAMES[server['state'][i]],
+                    'since': datetime.fromtimestamp(server['since'][i]).isoformat()
+                })
+        return active
@@ -0,0 +1,129 @@
+import json
+import os
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+
+from instrumentation import ALERT_SAVE_SECONDS, ALERTS_SAVED
+
+
+class AlertJournal:
+    """JSON Lines 형식의 추가 전용 알림 저널
+
+    append는 메모리 인덱스와 큐에만 넣고 즉시 반환하며, 실제 디스크 기록은
+    백그라운드 스레드가 배치로 처리한다. 파일이 커지면 최근 알림만 남기고
+    임시 파일 + os.replace로 원자적으로 압축한다.
+    """
+
+    def __init__(self, path, legacy_path=None, max_recent=1000, batch_size=100,
+                 flush_interval=1.0, fsync=True, compact_threshold=10000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.compact_threshold = max(compact_threshold, max_recent)
+        # 조회용 최근 알림 (append 시점에 갱신)
+        self.recent = deque(maxlen=max_recent)
+        # 압축에 사용할, 실제로 파일에 기록된 최근 알림 (기록 스레드만 갱신)
+        self._written = deque(maxlen=max_recent)
+        self._line_count = 0
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+
+        self._load(legacy_path)
+        self._thread = threading.Thread(target=self._run, name='alert-journal', daemon=True)
+        self._thread.start()
+
+    def _load(self, legacy_path):
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        alert = json.loads(line)
+                    except ValueError:
+                        # 비정상 종료로 잘린 마지막 줄은 무시
+                        continue
+                    self.recent.append(alert)
+                    self._written.append(alert)
+                    self._line_count += 1
+        elif legacy_path and Path(legacy_path).exists():
+            # 기존 alerts.json 내용을 저널로 한 번만 옮김
+            with open(legacy_path, 'r') as f:
+                legacy_alerts = json.load(f)
+            self.recent.extend(legacy_alerts)
+            self._write_batch(legacy_alerts)
+
+    def append(self, alert):
+        self.recent.append(alert)
+        self._queue.put(alert)
+
+    def extend(self, alerts):
+        for alert in alerts:
+            self.append(alert)
+
+    def submit(self, task):
+        """기록 스레드에서 실행할 작업 추가 (다른 상태 파일 저장 등, 알림 배치 기록 뒤에 실행)"""
+        self._queue.put(task)
+
+    def get_recent(self):
+        return list(self.recent)
+
+    def flush(self):
+        """대기 중인 알림이 모두 기록될 때까지 대기"""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                alerts = [item for item in batch if not callable(item)]
+                if alerts:
+                    self._write_batch(alerts)
+            except Exception as e:
+                print(f"Error writing alert journal: {e}")
+            for task in batch:
+                if callable(task):
+                    try:
+                        task()
+                    except Exception as e:
+                        print(f"Error running alert journal task: {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch):
+        with ALERT_SAVE_SECONDS.time(), open(self.path, 'a') as f:
+            f.write(''.join(json.dumps(alert) + '\n' for alert in batch))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        ALERTS_SAVED.inc(amount=len(batch))
+        self._written.extend(batch)
+        self._line_count += len(batch)
+        if self._line_count > self.compact_threshold:
+            self.compact()
+
+    def compact(self):
+        """최근 알림만 남긴 파일로 원자적 교체"""
+        tmp_path = self.path.with_suffix('.tmp')
+        alerts = list(self._written)
+        with open(tmp_path, 'w') as f:
+            f.write(''.join(json.dumps(alert) + '\n' for alert in alerts))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._line_count = len(alerts)
@@ -0,0 +1,345 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+
+# 서버/메트릭별 이동 기준선 대비 이상치 감지
+#
+# 고정 임계값 대신 시간 기반 EWMA 평균/분산(z-score) 또는 EWMA 중앙값/절대편차(MAD)로
+# 기준선을 만들고, 같은 시간대(0~23시)의 기준선이 충분히 쌓이면 그것을 우선 사용한다.
+# 샘플마다 메트릭 수에 비례하는 상수 시간으로 갱신되며 상태는 주기적으로 JSON 파일에 저장된다.
+
+DEFAULT_SETTINGS = {
+    'enabled': True,
+    'metrics': ['cpu', 'memory.usage_percent', 'disk_io.read_iops', 'disk_io.write_iops'],
+    'method': 'zscore',  # 'zscore' 또는 'mad'
+    # 전체 기준선 반감기 (초)
+    'half_life': 3600,
+    # 시간대별 기준선 반감기 (해당 시간대에 관측한 시간 기준, 7이면 약 일주일)
+    'seasonal_half_life_hours': 7,
+    'threshold': 4.0,  # |점수| 가 이 값을 넘는 샘플이 for_samples번 연속되면 발생
+    'clear': 2.0,  # 이 값 아래로 내려오면 해제
+    'for_samples': 3,
+    'warmup_samples': 300,
+    'seasonal_warmup_samples': 600,
+    # 값이 거의 일정한 메트릭에서 작은 변화로 알림이 나지 않도록 하는 최소 편차
+    'min_scale': 1.0,
+    'severity': 'medium',
+    'checkpoint_path': 'data/anomaly_state.json',
+    'checkpoint_interval': 300,
+}
+
+# 수집 간격이 길게 비어도 한 샘플이 기준선을 덮어쓰지 않도록 경과 시간 상한 (초)
+MAX_GAP = 60.0
+# 이상 구간의 샘플은 이 비율의 가중치로만 기준선에 반영
+ANOMALY_WEIGHT = 0.1
+# 정규분포에서 MAD -> 표준편차 환산 계수
+MAD_SCALE = 1.4826
+# MAD 방식에서 중앙값 갱신 시 편차를 자르는 배수 (Huber)
+HUBER_CLIP = 3.0
+
+CHECKPOINT_VERSION = 1
+STATE_FIELDS = ('mean', 'var', 'median', 'dev', 'count')
+
+
+def _elapsed(last_time, timestamp):
+    """직전 갱신 이후 경과 시간 (처음이거나 길게 비었으면 MAX_GAP)"""
+    if last_time is None or np.isnan(last_time):
+        return MAX_GAP
+    return min(max(timestamp - last_time, 0.0), MAX_GAP)
+
+
+def _new_baseline(shape):
+    return {
+        'mean': np.zeros(shape),
+        'var': np.zeros(shape),
+        'median': np.zeros(shape),
+        'dev': np.zeros(shape),
+        'count': np.zeros(shape),
+    }
+
+
+def _baseline_lists(baseline):
+    return {field: baseline[field].tolist() for field in STATE_FIELDS}
+
+
+class AnomalyDetector:
+    """서버별 메트릭 배열에 대해 기준선 갱신과 점수 계산을 한 번에 수행"""
+
+    def __init__(self, writer=None, **settings):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings)
+        self.metrics = list(self.settings['metrics'])
+        self._paths = [tuple(metric.split('.')) for metric in self.metrics]
+        self._tau = self.settings['half_life'] / math.log(2)
+        self._seasonal_tau = self.settings['seasonal_half_life_hours'] * 3600 / math.log(2)
+        self.checkpoint_path = Path(self.settings['checkpoint_path'])
+        self._servers = {}
+        self._last_checkpoint = time.time()
+        # 주기 저장은 writer(작업 함수를 받는 callable)에게 넘겨 샘플링 스레드에서 파일을 쓰지 않음
+        self._writer = writer or (lambda task: task())
+        # 마지막 저장 이후 갱신이 있었는지 (갱신하지 않은 인스턴스가 저장된 상태를 덮어쓰지 않도록)
+        self._dirty = False
+        # 저장 순번: 큐에 늦게 남아 있던 오래된 상태가 더 최신 저장을 덮어쓰지 않도록
+        self._checkpoint_seq = 0
+        self._written_seq = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _server_state(self, server_id):
+        state = self._servers.get(server_id)
+        if state is None:
+            n = len(self.metrics)
+            state = {
+                'last_time': None,
+                'global': _new_baseline(n),
+                # [시간대, 메트릭]
+                'seasonal': _new_baseline((24, n)),
+                'seasonal_time': np.full(24, np.nan),
+                'streak': np.zeros(n, dtype=int),
+                'firing': np.zeros(n, dtype=bool),
+                'since': np.zeros(n),
+            }
+            self._servers[server_id] = state
+        return state
+
+    def _extract(self, metrics):
+        values = np.full(len(self._paths), np.nan)
+        for i, path in enumerate(self._paths):
+            value = metrics
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    value = None
+                    break
+                value = value[key]
+            if isinstance(value, (int, float)):
+                values[i] = value
+        return values
+
+    def _score(self, baseline, values):
+        if self.settings['method'] == 'mad':
+            center = baseline['median']
+            scale = MAD_SCALE * baseline['dev']
+        else:
+            center = baseline['mean']
+            scale = np.sqrt(baseline['var'])
+        return (values - center) / np.maximum(scale, self.settings['min_scale']), center
+
+    def _update(self, baseline, values, alpha):
+        """시간 기반 EWMA 갱신 (값이 없는 메트릭은 그대로)"""
+        valid = ~np.isnan(values)
+        first = valid & (baseline['count'] == 0)
+        # 첫 샘플은 그대로 기준선으로 사용
+        baseline['mean'][first] = values[first]
+        baseline['median'][first] = values[first]
+
+        update = valid & ~first
+        x = values[update]
+        a = alpha[update]
+        mean = baseline['mean'][update]
+        diff = x - mean
+        increment = a * diff
+        baseline['mean'][update] = mean + increment
+        baseline['var'][update] = (1 - a) * (baseline['var'][update] + diff * increment)
+
+        median = baseline['median'][update]
+        dev = baseline['dev'][update]
+        clip = HUBER_CLIP * np.maximum(MAD_SCALE * dev, self.settings['min_scale'])
+        baseline['median'][update] = median + a * np.clip(x - median, -clip, clip)
+        baseline['dev'][update] = (1 - a) * dev + a * np.abs(x - median)
+        baseline['count'][valid] += 1
+
+    def update(self, server_id, timestamp, metrics):
+        """샘플 하나로 기준선을 갱신하고 새로 발생/해제된 이상 알림 목록 반환"""
+        if not self.settings['enabled']:
+            return []
+        values = self._extract(metrics)
+        data = None
+        with self._lock:
+            alerts = self._evaluate(server_id, timestamp, values)
+            self._dirty = True
+            if timestamp - self._last_checkpoint >= self.settings['checkpoint_interval']:
+                data = self._checkpoint_data()
+                self._last_checkpoint = timestamp
+        if data is not None:
+            self._writer(lambda: self._write_checkpoint(data))
+        return alerts
+
+    def _evaluate(self, server_id, timestamp, values):
+        state = self._server_state(server_id)
+        hour = time.localtime(timestamp).tm_hour
+        glob = state['global']
+        # 시간대 행의 뷰이므로 갱신이 그대로 state['seasonal']에 반영됨
+        seasonal = {field: array[hour] for field, array in state['seasonal'].items()}
+
+        # 시간대 기준선이 충분하면 그것을, 아니면 전체 기준선을 사용 (둘 다 부족하면 평가 안 함)
+        global_score, global_center = self._score(glob, values)
+        seasonal_score, seasonal_center = self._score(seasonal, values)
+        use_seasonal = seasonal['count'] >= self.settings['seasonal_warmup_samples']
+        score = np.where(use_seasonal, seasonal_score, global_score)
+        center = np.where(use_seasonal, seasonal_center, global_center)
+        ready = use_seasonal | (glob['count'] >= self.settings['warmup_samples'])
+        score[~ready | np.isnan(values)] = np.nan
+
+        with np.errstate(invalid='ignore'):
+            over = np.abs(score) > self.settings['threshold']
+            under = np.abs(score) < self.settings['clear']
+
+        # 이상 구간의 값은 기준선에 약하게만 반영 (지속되면 결국 새 기준선이 됨)
+        weight = np.where(over, ANOMALY_WEIGHT, 1.0)
+        dt = _elapsed(state['last_time'], timestamp)
+        self._update(glob, values, weight * (1 - math.exp(-dt / self._tau)))
+        dt = _elapsed(state['seasonal_time'][hour], timestamp)
+        self._update(seasonal, values, weight * (1 - math.exp(-dt / self._seasonal_tau)))
+        state['last_time'] = timestamp
+        state['seasonal_time'][hour] = timestamp
+
+        streak, firing, since = state['streak'], state['firing'], state['since']
+        streak[over] += 1
+        streak[~over] = 0
+        since[over & (streak == 1)] = timestamp
+        fired = ~firing & (streak >= self.settings['for_samples'])
+        resolved = firing & under
+        firing[fired] = True
+        firing[resolved] = False
+
+        alerts = []
+        for i in np.flatnonzero(fired | resolved):
+            alerts.append(self._make_alert(
+                server_id, i, values[i], center[i], score[i], bool(fired[i]), timestamp
+            ))
+        return alerts
+
+    def _make_alert(self, server_id, index, value, baseline, score, fired, timestamp):
+        metric = self.metrics[index]
+        value = round(float(value), 2)
+        baseline = round(float(baseline), 2)
+        score = round(float(score), 2)
+        if fired:
+            direction = 'above' if score > 0 else 'below'
+            message = (
+                f"{metric} is {value}, {abs(score):g} deviations {direction} baseline {baseline}"
+            )
+        else:
+            message = f"{metric} returned to baseline {baseline} (value {value})"
+        return {
+            'type': 'anomaly',
+            'rule': f'anomaly:{metric}',
+            'server_id': server_id,
+            'state': 'firing' if fired else 'resolved',
+            'severity': self.settings['severity'],
+            'value': value,
+            'baseline': baseline,
+            'score': score,
+            'threshold': self.settings['threshold'] if fired else self.settings['clear'],
+            'message': message,
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat()
+        }
+
+    def active(self):
+        """현재 발생 중인 이상 알림 목록 (AlertEngine.active와 같은 형식)"""
+        active = []
+        with self._lock:
+            for server_id, state in self._servers.items():
+                for i in np.flatnonzero(state['firing']):
+                    active.append({
+                        'server_id': server_id,
+                        'rule': f'anomaly:{self.metrics[i]}',
+                        'state': 'firing',
+                        'since': datetime.fromtimestamp(state['since'][i]).isoformat()
+                    })
+        return active
+
+    def baselines(self, server_id):
+        """서버의 메트릭별 현재 기준선 (평가 전이면 None)"""
+        with self._lock:
+            state = self._servers.get(server_id)
+            if state is None:
+                return None
+            return {
+                metric: {
+                    'mean': round(float(state['global']['mean'][i]), 2),
+                    'std': round(float(np.sqrt(state['global']['var'][i])), 2),
+                    'median': round(float(state['global']['median'][i]), 2),
+                    'mad': round(float(MAD_SCALE * state['global']['dev'][i]), 2),
+                    'samples': int(state['global']['count'][i]),
+                }
+                for i, metric in enumerate(self.metrics)
+            }
+
+    def checkpoint(self):
+        """현재 상태를 바로 저장 (종료 시 사용, 마지막 저장 이후 갱신이 없으면 생략)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = self._checkpoint_data()
+        self._write_checkpoint(data)
+
+    def _checkpoint_data(self):
+        # 락을 잡은 상태에서 호출 (배열을 리스트로 복사하므로 이후 갱신과 무관)
+        self._dirty = False
+        self._checkpoint_seq += 1
+        return {
+            'seq': self._checkpoint_seq,
+            'version': CHECKPOINT_VERSION,
+            'metrics': self.metrics,
+            'servers': {
+                server_id: {
+                    'last_time': state['last_time'],
+                    'global': _baseline_lists(state['global']),
+                    'seasonal': _baseline_lists(state['seasonal']),
+                    'seasonal_time': state['seasonal_time'].tolist(),
+                    'streak': state['streak'].tolist(),
+                    'firing': state['firing'].tolist(),
+                    'since': state['since'].tolist(),
+                }
+                for server_id, state in self._servers.items()
+            }
+        }
+
+    def _write_checkpoint(self, data):
+        """기준선 상태를 임시 파일에 쓴 뒤 원자적으로 교체"""
+        try:
+            with self._write_lock:
+                if data['seq'] <= self._written_seq:
+                    return
+                self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.checkpoint_path.with_suffix('.tmp')
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.checkpoint_path)
+                self._written_seq = data['seq']
+        except Exception as e:
+            print(f"Error writing anomaly checkpoint: {e}")
+
+    def load_checkpoint(self):
+        """저장된 기준선 복원 (메트릭 구성이 바뀌었으면 무시하고 새로 학습)"""
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Error loading anomaly checkpoint: {e}")
+            return
+        if data.get('version') != CHECKPOINT_VERSION or data.get('metrics') != self.metrics:
+            print("Anomaly checkpoint does not match configured metrics, starting fresh")
+            return
+
+        with self._lock:
+            for server_id, saved in data['servers'].items():
+                state = self._server_state(server_id)
+                state['last_time'] = saved['last_time']
+                for field in STATE_FIELDS:
+                    state['global'][field] = np.array(saved['global'][field], dtype=float)
+                    state['seasonal'][field] = np.array(saved['seasonal'][field], dtype=float)
+                state['seasonal_time'] = np.array(saved['seasonal_time'], dtype=float)
+                state['streak'] = np.array(saved['streak'], dtype=int)
+                state['firing'] = np.array(saved['firing'], dtype=bool)
+                state['since'] = np.array(saved['since'], dtype=float)
@@ -1,20 +1,76 @@
+import atexit
 import logging
+import os
+import time
 from datetime import datetime
-from pathlib import Path
 
-from flask import Flask, jsonify, render_template, request, send_file
+from flask import Flask, Response, g, jsonify, render_template, request, send_file
 from flask_cors import CORS
 
+from instrumentation import (CONTENT_TYPE, HTTP_REQUEST_SECONDS, REGISTRY, exposition,
+                             host_families, with_labels)
 from metrics_collector import MetricsCollector
+from primary_rpc import PrimaryClient, PrimaryProxy
+from sampler import MetricsSampler
+from shared_ring import SharedRingReader
+from wire import api_response
 
 app = Flask(__name__)
 CORS(app)
 
-# 로깅 설정
-logging.basicConfig(level=logging.DEBUG)
+# serve.py의 워커로 실행되면 MONITOR_ROLE=reader (샘플러는 별도 프로세스)
+ROLE = os.environ.get('MONITOR_ROLE', 'standalone')
+
+# 로깅 설정 (요청마다 DEBUG 로그를 남기는 것은 개발 서버에서만)
+logging.basicConfig(level=logging.DEBUG if ROLE == 'standalone' else logging.INFO)
 logger = logging.getLogger(__name__)
 
-metrics_collector = MetricsCollector()
+if __name__ == '__mp_main__':
+    # python app.py로 실행했을 때 리포트 작업 프로세스(forkserver/spawn)가 이 모듈을 다시 불러옴:
+    # 작업 함수만 실행하므로 수집기/샘플러를 만들지 않음
+    metrics_collector = metrics_sampler = None
+elif ROLE == 'reader':
+    # 스냅샷은 공유 링에서 읽고, 주 프로세스 상태는 RPC로 조회
+    metrics_collector = PrimaryProxy(
+        MetricsCollector(read_only=True),
+        PrimaryClient(os.environ['MONITOR_RPC_ADDRESS'],
+                      bytes.fromhex(os.environ['MONITOR_RPC_AUTHKEY']))
+    )
+    metrics_sampler = SharedRingReader(
+        os.environ['MONITOR_RING_PATH'],
+        backfill=metrics_collector.config['stream_backfill']
+    )
+else:
+    metrics_collector = MetricsCollector()
+    metrics_sampler = MetricsSampler(
+        metrics_collector,
+        interval=metrics_collector.config['sample_interval'],
+        backfill=metrics_collector.config['stream_backfill']
+    )
+    # 종료 시 저널을 비우고 마지막 주기 저장 이후 학습한 기준선도 남김 (serve.py는 주 프로세스 종료 시 처리)
+    atexit.register(metrics_collector.close)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    # 스트리밍 응답(SSE, CSV)은 응답 헤더를 보낼 때까지의 시간
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, route, request.method, str(response.status_code)
+        )
+    return response
+
+# 요청을 처리하는 프로세스에서만 샘플러 시작 (리로더 부모 프로세스 제외)
+@app.before_request
+def start_sampler():
+    metrics_sampler.start()
+    metrics_collector.start_remote_collection()
+    metrics_collector.start_process_tracking()
 
 @app.route('/')
 @app.route('/dashboard')
@@ -28,21 +84,146 @@ def reports():
 @app.route('/api/metrics', methods=['GET'])
 def get_metrics():
     try:
-        return jsonify(metrics_collector.get_all_metrics()), 200
+        server_id = request.args.get('server', 'local')
+        if server_id != 'local':
+            if server_id not in metrics_collector.get_servers():
+                return jsonify({'error': f'Unknown server: {server_id}'}), 404
+            metrics = metrics_collector.get_remote_metrics(server_id)
+            if metrics is None:
+                return jsonify({'error': 'No metrics collected yet'}), 503
+            return api_response(metrics, etag=f"{server_id}-{metrics['timestamp']}")
+
+        # 샘플러가 발행한 최신 스냅샷을 그대로 반환
+        snapshot = metrics_sampler.latest()
+        if snapshot is None:
+            return jsonify({'error': 'No metrics collected yet'}), 503
+        # 같은 스냅샷을 다시 요청하면 304 반환
+        return api_response(snapshot.metrics, body=snapshot.payload, etag=f'local-{snapshot.seq}')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """모니터 자체 지표와 최신 호스트 메트릭을 Prometheus 텍스트 형식으로 반환"""
+    try:
+        families = [metrics_collector.get_self_metrics()]
+        if ROLE == 'reader':
+            # 수집 관련 지표는 주 프로세스에서, HTTP 지표는 응답한 워커에서 (워커별 label로 구분)
+            families.append(with_labels(REGISTRY.collect(), worker=str(os.getpid())))
+        snapshot = metrics_sampler.latest()
+        if snapshot is not None:
+            families.append(host_families(snapshot.metrics))
+        return Response(exposition(*families), content_type=CONTENT_TYPE)
     except Exception as e:
+        logger.exception("Error exposing metrics")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/metrics/stream', methods=['GET'])
+def stream_metrics():
+    # 재연결 시 브라우저가 보내는 Last-Event-ID 이후 스냅샷부터 이어서 전송
+    since_seq = request.headers.get('Last-Event-ID', type=int)
+    backfill = min(
+        request.args.get('backfill', 0, type=int),
+        metrics_collector.config['stream_backfill']
+    )
+
+    def events():
+        # 모든 구독자가 같은 미리 인코딩된 프레임을 공유
+        for snapshot in metrics_sampler.subscribe(since_seq=since_seq, backfill=backfill):
+            yield snapshot.frame if snapshot is not None else b': keep-alive\n\n'
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/servers', methods=['GET'])
+def get_servers():
+    try:
+        return jsonify(metrics_collector.get_server_status())
+    except Exception as e:
+        logger.exception("Error getting server status")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/processes/top', methods=['GET'])
+def get_top_processes():
+    try:
+        sort = request.args.get('sort', 'cpu')
+        n = request.args.get('n', 10, type=int)
+        if n < 1:
+            return jsonify({'error': 'Invalid n parameter'}), 400
+
+        try:
+            top = metrics_collector.get_top_processes(sort, n)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if top is None:
+            return jsonify({'error': 'Process table not ready'}), 503
+        return api_response(top, etag=f"processes-{top['seq']}-{sort}-{n}")
+    except Exception as e:
+        logger.exception("Error getting top processes")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/supervisor', methods=['GET'])
+def get_supervisor_status():
+    status = metrics_collector.get_supervisor_status()
+    if status is None:
+        return jsonify({'error': 'Supervisor status not available'}), 404
+    return jsonify(status)
+
+@app.route('/api/metrics/history', methods=['GET'])
+def get_metrics_history():
+    try:
+        metric = request.args.get('metric', 'cpu_usage')
+        end = request.args.get('to', type=float) or time.time()
+        start = request.args.get('from', type=float) or end - 3600
+        # 구간 길이와 무관하게 응답 크기를 제한
+        points = min(request.args.get('points', 500, type=int), 5000)
+
+        if metric not in metrics_collector.HISTORY_METRICS:
+            return jsonify({'error': f'Unknown metric: {metric}'}), 400
+        if start >= end or points < 3:
+            return jsonify({'error': 'Invalid range or points parameter'}), 400
+
+        return api_response(metrics_collector.get_history(metric, start, end, points))
+    except Exception as e:
+        logger.exception("Error getting metrics history")
+        return jsonify({'error': str(e)}), 500
+
+def csv_response(chunks, download_name):
+    """CSV 청크 제너레이터를 임시 파일 없이 바로 스트리밍"""
+    return Response(
+        chunks,
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={download_name}'}
+    )
+
+@app.route('/api/alerts', methods=['GET'])
+def get_alerts():
+    try:
+        return api_response(metrics_collector.get_alerts(), etag=True)
+    except Exception as e:
+        logger.exception("Error getting alerts")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/alerts/active', methods=['GET'])
+def get_active_alerts():
+    try:
+        return jsonify(metrics_collector.get_active_alerts())
+    except Exception as e:
+        logger.exception("Error getting active alerts")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/export-csv', methods=['GET'])
 def export_csv():
     try:
-        file_path = metrics_collector.export_to_csv()
-        if file_path:
-            return send_file(
-                file_path,
-                mimetype='text/csv',
-                as_attachment=True,
-                download_name=Path(file_path).name
-            )
+        start = request.args.get('from', type=float)
+        end = request.args.get('to', type=float)
+        chunks = metrics_collector.stream_csv(start, end)
+        if chunks is not None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            return csv_response(chunks, f'metrics_log_{timestamp}.csv')
         return jsonify({'error': 'No data available'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -59,22 +240,22 @@ def generate_report():
 
         report_date = data.get('date')
         report_type = data.get('type')
+        resolution = data.get('resolution')
 
         if not report_date or not report_type:
             logger.error("Missing required parameters")
             return jsonify({'error': 'Missing date or type parameter'}), 400
 
+        if resolution and resolution not in metrics_collector.RESOLUTIONS:
+            logger.error(f"Invalid resolution: {resolution}")
+            return jsonify({'error': 'Invalid resolution parameter'}), 400
+
         logger.info(f"Generating {report_type} report for date {report_date}")
-        file_path = metrics_collector.generate_report(report_date, report_type)
+        chunks = metrics_collector.stream_report(report_date, report_type, resolution)
         
-        if file_path:
-            logger.info(f"Report generated successfully at {file_path}")
-            return send_file(
-                file_path,
-                mimetype='text/csv',
-                as_attachment=True,
-                download_name=f"system_report_{report_type}_{report_date}.csv"
-            )
+        if chunks is not None:
+            logger.info(f"Streaming {report_type} report for date {report_date}")
+            return csv_response(chunks, f"system_report_{report_type}_{report_date}.csv")
         
         logger.error("No data available for report generation")
         return jsonify({'error': 'No data available'}), 404
@@ -86,12 +267,74 @@ def generate_report():
 @app.route('/api/reports', methods=['GET'])
 def get_reports():
     try:
-        reports = metrics_collector.get_report_list()
-        return jsonify(reports)
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+        version = metrics_collector.get_report_catalog_version()
+        reports = metrics_collector.get_report_list(limit, offset)
+        response = api_response(reports, etag=f'reports-{version}-{limit}-{offset}')
+        response.headers['X-Total-Count'] = str(metrics_collector.get_report_count())
+        return response
     except Exception as e:
         logger.exception("Error getting report list")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/reports/summary', methods=['GET'])
+def get_report_summary():
+    try:
+        report_date = request.args.get('date')
+        report_type = request.args.get('type', 'daily')
+        if not report_date:
+            return jsonify({'error': 'Missing date parameter'}), 400
+
+        try:
+            summary = metrics_collector.get_report_summary(report_date, report_type)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if summary is None:
+            return jsonify({'error': 'No data available for the specified period'}), 404
+        return api_response(summary)
+    except Exception as e:
+        logger.exception("Error getting report summary")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/reports/jobs', methods=['POST'])
+def create_report_job():
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Invalid request format'}), 400
+
+        data = request.json
+        report_date = data.get('date')
+        report_type = data.get('type')
+        if not report_date or not report_type:
+            return jsonify({'error': 'Missing date or type parameter'}), 400
+
+        try:
+            job = metrics_collector.submit_report_job(report_date, report_type, data.get('resolution'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        logger.info(f"Report job {job['id']} ({report_type}, {report_date}) is {job['status']}")
+        return jsonify(job), 202
+    except Exception as e:
+        logger.exception("Error creating report job")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/reports/jobs/<job_id>', methods=['GET'])
+def get_report_job(job_id):
+    job = metrics_collector.get_report_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/reports/jobs/<job_id>', methods=['DELETE'])
+def cancel_report_job(job_id):
+    job = metrics_collector.cancel_report_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
 @app.route('/api/reports/<report_id>/download', methods=['GET'])
 def download_report(report_id):
     try:
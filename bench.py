@@ -0,0 +1,307 @@
+import argparse
+import contextlib
+import http.client
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import psutil
+
+from report_builder import report_range
+from segment_store import RECORD_FORMAT, record_dtype
+
+
+# 수집기/API/리포트/메모리 성능 측정 스크립트
+#
+# 실제 data/, logs/ 를 건드리지 않도록 임시 작업 디렉터리에서 실행하고 결과를 JSON으로 출력한다.
+#
+#   python bench.py --output bench.json
+#   python bench.py --baseline bench.json   # 이전 결과와 비교 (회귀가 있으면 종료 코드 1)
+
+REPO_DIR = Path(__file__).resolve().parent
+
+BENCHMARKS = ('collector', 'api', 'memory', 'reports')
+
+RANGES = {
+    'day': 'daily',
+    'week': 'weekly',
+    'month': 'monthly',
+}
+
+
+def percentiles(values_ms):
+    values = np.asarray(values_ms, dtype=np.float64)
+    return {
+        'mean_ms': round(float(values.mean()), 4),
+        'p50_ms': round(float(np.percentile(values, 50)), 4),
+        'p90_ms': round(float(np.percentile(values, 90)), 4),
+        'p99_ms': round(float(np.percentile(values, 99)), 4),
+        'max_ms': round(float(values.max()), 4),
+    }
+
+
+@contextlib.contextmanager
+def workspace(keep=False):
+    """config/를 복사한 임시 디렉터리로 이동 (수집기는 작업 디렉터리 기준 경로 사용)"""
+    previous = os.getcwd()
+    directory = Path(tempfile.mkdtemp(prefix='monitor-bench-'))
+    shutil.copytree(REPO_DIR / 'config', directory / 'config')
+    os.chdir(directory)
+    try:
+        yield directory
+    finally:
+        os.chdir(previous)
+        if not keep:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_collector(collector, samples):
+    """get_all_metrics 한 번(수집 + 알림 평가 + 저장)의 비용"""
+    for _ in range(10):
+        collector.get_all_metrics()
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        collector.get_all_metrics()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'samples': samples, **percentiles(timings)}
+
+
+def bench_api(clients, requests):
+    """로컬 서버에 clients개의 동시 연결로 /api/metrics 요청"""
+    from werkzeug.serving import make_server
+
+    from app import app, metrics_sampler
+    # 요청마다 남는 DEBUG/접속 로그가 측정을 왜곡하지 않도록 끔
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    metrics_sampler.start()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+
+    per_client = max(1, requests // clients)
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+
+    def client(index):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        for _ in range(per_client):
+            started = time.perf_counter()
+            try:
+                conn.request('GET', '/api/metrics')
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[index] += 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            latencies[index].append((time.perf_counter() - started) * 1000)
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for worker in threads:
+        worker.start()
+    for worker in threads:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    total = per_client * clients
+    return {
+        'clients': clients,
+        'requests': total,
+        'errors': sum(errors),
+        'requests_per_sec': round(total / elapsed, 2),
+        **percentiles([value for values in latencies for value in values]),
+    }
+
+
+def bench_memory(collector, samples):
+    """샘플 저장 경로(메모리 버퍼 + 세그먼트 + 롤업)의 RSS 증가량"""
+    process = psutil.Process()
+    template = collector.get_all_metrics()
+    start_ts = time.time()
+    rss_before = process.memory_info().rss
+    started = time.perf_counter()
+    for i in range(samples):
+        metrics = dict(template, timestamp=start_ts + i)
+        collector.save_metrics_to_log(metrics)
+    elapsed = time.perf_counter() - started
+    growth = process.memory_info().rss - rss_before
+    return {
+        'samples': samples,
+        'rss_growth_bytes': growth,
+        'bytes_per_million_samples': round(growth * 1_000_000 / samples),
+        'store_us_per_sample': round(elapsed * 1_000_000 / samples, 3),
+    }
+
+
+def write_synthetic_segments(data_path, start, end, seed=0):
+    """[start, end) 구간을 1초 간격 샘플로 채운 일 세그먼트 파일 생성"""
+    dtype = record_dtype(RECORD_FORMAT)
+    rng = np.random.default_rng(seed)
+    directory = Path(data_path) / 'metrics'
+    directory.mkdir(parents=True, exist_ok=True)
+    day = datetime.fromtimestamp(start)
+    total = 0
+    while day.timestamp() < end:
+        next_day = day + timedelta(days=1)
+        timestamps = np.arange(day.timestamp(), min(next_day.timestamp(), end), 1.0)
+        records = np.empty(len(timestamps), dtype=dtype)
+        records['f0'] = timestamps
+        records['f1'] = rng.uniform(0, 100, len(timestamps))
+        records['f2'] = 16.0
+        records['f3'] = rng.uniform(4, 12, len(timestamps))
+        records['f4'] = records['f3'] / 16.0 * 100
+        records['f5'] = rng.exponential(100, len(timestamps))
+        records['f6'] = rng.exponential(50, len(timestamps))
+        records.tofile(directory / f"{day.strftime('%Y-%m-%d')}.seg")
+        total += len(timestamps)
+        day = next_day
+    return total
+
+
+def bench_reports(collector, ranges, resolutions):
+    """지난달 데이터를 1초 간격으로 만든 뒤 구간/해상도별 generate_report 시간 측정"""
+    # 지난달 1일을 기준으로 월/주/일 구간이 모두 데이터 안에 들어오도록 선택
+    first = (datetime.now().replace(day=1) - timedelta(days=1)).replace(day=1)
+    month_start, month_end = report_range(first.strftime('%Y-%m-%d'), 'monthly')
+    monday = first + timedelta(days=(7 - first.weekday()) % 7)
+    dates = {
+        'day': monday.strftime('%Y-%m-%d'),
+        'week': monday.strftime('%Y-%m-%d'),
+        'month': first.strftime('%Y-%m-%d'),
+    }
+    started = time.perf_counter()
+    written = write_synthetic_segments(collector.data_path, month_start, month_end)
+    results = {'synthetic_samples': written, 'synthetic_write_seconds': round(time.perf_counter() - started, 3)}
+
+    for name in ranges:
+        for resolution in resolutions:
+            started = time.perf_counter()
+            path = collector.generate_report(dates[name], RANGES[name], resolution)
+            elapsed = time.perf_counter() - started
+            results[f'{name}_{resolution}'] = {
+                'seconds': round(elapsed, 4),
+                'bytes': os.path.getsize(path) if path else 0,
+            }
+    return results
+
+
+def flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{name}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+# 비교 대상 지표 (나머지는 실행 조건이므로 제외)
+LOWER_IS_BETTER = ('_ms', 'seconds', 'bytes_per_million_samples', 'us_per_sample', 'errors')
+HIGHER_IS_BETTER = ('per_sec',)
+
+
+def compare(current, baseline, tolerance):
+    """baseline 대비 tolerance 비율 이상 나빠진 지표 목록"""
+    regressions = []
+    current_flat = flatten(current)
+    for name, old in flatten(baseline).items():
+        new = current_flat.get(name)
+        if new is None or 'synthetic' in name:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            worse = new < old * (1 - tolerance)
+        elif name.endswith(LOWER_IS_BETTER):
+            worse = new > old * (1 + tolerance) and new - old > 1e-3
+        else:
+            continue
+        if worse:
+            regressions.append({'metric': name, 'baseline': old, 'current': new})
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Monitoring middleware benchmarks')
+    parser.add_argument('--only', default=','.join(BENCHMARKS),
+                        help=f"comma separated subset of {', '.join(BENCHMARKS)}")
+    parser.add_argument('--samples', type=int, default=1000, help='get_all_metrics calls')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent API clients')
+    parser.add_argument('--requests', type=int, default=4000, help='total API requests')
+    parser.add_argument('--memory-samples', type=int, default=1_000_000)
+    parser.add_argument('--ranges', default='day,week,month')
+    parser.add_argument('--resolutions', default='raw,summary')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--baseline', help='previous JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--keep', action='store_true', help='keep the temporary workspace')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    selected = [name for name in args.only.split(',') if name]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        sys.exit(f"Unknown benchmark: {', '.join(sorted(unknown))}")
+
+    output = {
+        'meta': {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': {},
+    }
+    with workspace(args.keep):
+        from metrics_collector import MetricsCollector
+        collector = MetricsCollector()
+        results = output['results']
+        if 'collector' in selected:
+            results['collector'] = bench_collector(collector, args.samples)
+        if 'api' in selected:
+            results['api'] = bench_api(args.clients, args.requests)
+        if 'memory' in selected:
+            results['memory'] = bench_memory(collector, args.memory_samples)
+        if 'reports' in selected:
+            results['reports'] = bench_reports(
+                collector, args.ranges.split(','), args.resolutions.split(',')
+            )
+        collector.close()
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        output['regressions'] = compare(output['results'], baseline['results'], args.tolerance)
+        exit_code = 1 if output['regressions'] else 0
+
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def lttb_indices(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets 로 남길 점의 인덱스 배열 반환
+
+    첫 점과 마지막 점은 항상 남기고, 나머지 구간을 threshold - 2개의 버킷으로
+    나눠 각 버킷에서 이전 선택점/다음 버킷 평균과 만드는 삼각형 넓이가
+    가장 큰 점을 고른다. 피크 모양을 유지하면서 점 개수를 고정할 수 있다.
+    버킷 안의 넓이 계산은 numpy로 한 번에 처리한다.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.arange(min(n, threshold))
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # 다음 버킷의 평균점
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+
+        ax, ay = xs[a], ys[a]
+        areas = np.abs((ax - avg_x) * (ys[start:end] - ay) - (ax - xs[start:end]) * (avg_y - ay))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    indices[-1] = n - 1
+    return indices
@@ -0,0 +1,169 @@
+import time
+
+import psutil
+
+
+# 확장 메트릭 패밀리 (config/collector.json 의 metric_families 로 켜고 끔)
+DEFAULT_FAMILIES = {
+    'per_cpu': True,
+    'per_disk': True,
+    'per_nic': True,
+    'load_avg': True,
+}
+
+# 집계에서 제외할 가상 디스크 장치
+EXCLUDED_DISK_PREFIXES = ('loop', 'ram', 'zram')
+
+# 비용이 큰 패밀리는 최대 이 틱 수마다 한 번만 수집
+MAX_STRIDE = 60
+
+# 비용 이동 평균 가중치
+COST_ALPHA = 0.2
+
+
+def _rates(current, previous, elapsed, fields):
+    """장치별 누적 카운터 두 개에서 초당 변화량 계산 (카운터가 리셋되면 0)"""
+    rates = {}
+    for name, counters in current.items():
+        last = previous.get(name)
+        if last is None or elapsed <= 0:
+            continue
+        rates[name] = {
+            label: round(max(getattr(counters, field) - getattr(last, field), 0) / elapsed, 2)
+            for label, field in fields
+        }
+    return rates
+
+
+class _Family:
+    """패밀리 하나의 수집 함수와 비용/주기 상태"""
+
+    def __init__(self, name, collect):
+        self.name = name
+        self.collect = collect
+        self.avg_ms = None
+        self.stride = 1
+        self.countdown = 0
+        self.last = None
+
+
+class ExtendedCollector:
+    """코어별 CPU, 디스크별/NIC별 처리량, load average를 틱마다 한 번에 수집
+
+    패밀리마다 psutil 호출은 한 번이고, 측정된 비용 합이 budget_ms를 넘으면
+    비싼 패밀리부터 수집 주기를 늘려 수집기 자체의 부하를 제한한다.
+    """
+
+    DISK_FIELDS = (
+        ('read_bytes_per_sec', 'read_bytes'),
+        ('write_bytes_per_sec', 'write_bytes'),
+        ('read_iops', 'read_count'),
+        ('write_iops', 'write_count'),
+    )
+    NIC_FIELDS = (
+        ('recv_bytes_per_sec', 'bytes_recv'),
+        ('sent_bytes_per_sec', 'bytes_sent'),
+        ('recv_packets_per_sec', 'packets_recv'),
+        ('sent_packets_per_sec', 'packets_sent'),
+    )
+
+    def __init__(self, families=None, budget_ms=20.0):
+        enabled = dict(DEFAULT_FAMILIES)
+        enabled.update(families or {})
+        self.budget_ms = budget_ms
+        self.last_ms = 0.0
+        self._disk_counters = {}
+        self._disk_time = None
+        self._nic_counters = {}
+        self._nic_time = None
+        collectors = {
+            'per_cpu': self._collect_per_cpu,
+            'per_disk': self._collect_per_disk,
+            'per_nic': self._collect_per_nic,
+            'load_avg': self._collect_load_avg,
+        }
+        self.families = [
+            _Family(name, collect) for name, collect in collectors.items() if enabled.get(name)
+        ]
+        if enabled.get('per_cpu'):
+            # 첫 호출은 기준값만 설정 (interval=None 은 직전 호출 이후의 사용률)
+            psutil.cpu_percent(interval=None, percpu=True)
+
+    def _collect_per_cpu(self, now):
+        return {'cpu_per_core': psutil.cpu_percent(interval=None, percpu=True)}
+
+    def _collect_per_disk(self, now):
+        counters = {
+            name: value
+            for name, value in (psutil.disk_io_counters(perdisk=True) or {}).items()
+            if not name.startswith(EXCLUDED_DISK_PREFIXES)
+        }
+        elapsed = now - self._disk_time if self._disk_time is not None else 0
+        rates = _rates(counters, self._disk_counters, elapsed, self.DISK_FIELDS)
+        self._disk_counters, self._disk_time = counters, now
+        return {'disks': rates}
+
+    def _collect_per_nic(self, now):
+        counters = psutil.net_io_counters(pernic=True) or {}
+        elapsed = now - self._nic_time if self._nic_time is not None else 0
+        rates = _rates(counters, self._nic_counters, elapsed, self.NIC_FIELDS)
+        self._nic_counters, self._nic_time = counters, now
+        return {'network': rates}
+
+    def _collect_load_avg(self, now):
+        load1, load5, load15 = psutil.getloadavg()
+        return {'load_avg': {'1m': round(load1, 2), '5m': round(load5, 2), '15m': round(load15, 2)}}
+
+    def _adjust_strides(self):
+        # 예산 초과 시 틱당 비용이 가장 큰 패밀리의 주기를 두 배로, 여유가 있으면 절반으로
+        per_tick = sum(family.avg_ms / family.stride for family in self.families)
+        if per_tick > self.budget_ms:
+            costly = max(
+                (family for family in self.families if family.stride < MAX_STRIDE),
+                key=lambda family: family.avg_ms / family.stride,
+                default=None
+            )
+            if costly is not None:
+                costly.stride = min(costly.stride * 2, MAX_STRIDE)
+        elif per_tick < self.budget_ms / 2:
+            for family in self.families:
+                if family.stride > 1 and per_tick + family.avg_ms / family.stride < self.budget_ms:
+                    family.stride //= 2
+                    break
+
+    def collect(self, now=None):
+        """이번 틱의 확장 메트릭 반환 (건너뛴 패밀리는 직전 값을 재사용)"""
+        now = time.time() if now is None else now
+        metrics = {}
+        tick_start = time.perf_counter()
+        for family in self.families:
+            family.countdown -= 1
+            if family.countdown <= 0 or family.last is None:
+                started = time.perf_counter()
+                try:
+                    family.last = family.collect(now)
+                except Exception as e:
+                    print(f"Error collecting {family.name} metrics: {e}")
+                    family.last = family.last or {}
+                cost_ms = (time.perf_counter() - started) * 1000
+                if family.avg_ms is None:
+                    family.avg_ms = cost_ms
+                else:
+                    family.avg_ms += COST_ALPHA * (cost_ms - family.avg_ms)
+                family.countdown = family.stride
+            metrics.update(family.last)
+        self.last_ms = (time.perf_counter() - tick_start) * 1000
+        self._adjust_strides()
+        metrics['collector'] = self.cost()
+        return metrics
+
+    def cost(self):
+        """수집 비용 통계 (ms) 와 패밀리별 수집 주기"""
+        return {
+            'last_ms': round(self.last_ms, 3),
+            'budget_ms': self.budget_ms,
+            'families': {
+                family.name: {'avg_ms': round(family.avg_ms, 3), 'every': family.stride}
+                for family in self.families
+            }
+        }
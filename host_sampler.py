@@ -0,0 +1,107 @@
+import time
+from datetime import datetime
+
+import psutil
+
+from instrumentation import PSUTIL_CALL_SECONDS
+from rolling import MultiWindow, RollingWindow
+
+
+# 호스트 기본 메트릭 수집 (MetricsCollector와 경량 에이전트가 같은 코드를 사용)
+#
+# psutil과 표준 라이브러리만 사용하므로 에이전트가 Flask/numpy 없이 불러올 수 있다.
+
+
+class HostSampler:
+    """CPU/메모리/디스크 메트릭 수집기 (CPU와 IOPS는 이동 평균)"""
+
+    def __init__(self, disk_usage_path='/'):
+        self.disk_usage_path = disk_usage_path
+        self.last_disk_io = psutil.disk_io_counters()
+        self.last_disk_time = time.time()
+        self.SAMPLE_DURATION = 300  # 5분
+        self.read_iops_window = RollingWindow(self.SAMPLE_DURATION)
+        self.write_iops_window = RollingWindow(self.SAMPLE_DURATION)
+
+        self.CPU_SAMPLE_DURATION = 60  # 1분
+        # load average처럼 1분/5분/15분 윈도우를 함께 유지
+        self.CPU_LOAD_DURATIONS = (60, 300, 900)
+        self.cpu_windows = MultiWindow(self.CPU_LOAD_DURATIONS, ewma=True)
+        self.last_cpu_time = time.time()
+
+    # CPU 사용률 계산
+    def calculate_cpu_average(self):
+        current_time = time.time()
+        with PSUTIL_CALL_SECONDS.time('cpu_percent'):
+            cpu_percent = psutil.cpu_percent(interval=None)
+        self.cpu_windows.add(current_time, cpu_percent)
+        return round(self.cpu_windows[self.CPU_SAMPLE_DURATION].mean, 2)
+
+    def get_cpu_load(self):
+        """1분/5분/15분 평균 CPU 사용률"""
+        return {
+            f'{duration // 60}m': round(mean, 2)
+            for duration, mean in self.cpu_windows.means().items()
+        }
+
+    def calculate_disk_io(self):
+        try:
+            with PSUTIL_CALL_SECONDS.time('disk_io_counters'):
+                current_disk_io = psutil.disk_io_counters()
+            current_time = time.time()
+            time_delta = current_time - self.last_disk_time
+
+            if time_delta > 0:
+                read_count_delta = current_disk_io.read_count - self.last_disk_io.read_count
+                write_count_delta = current_disk_io.write_count - self.last_disk_io.write_count
+
+                self.read_iops_window.add(current_time, read_count_delta / time_delta)
+                self.write_iops_window.add(current_time, write_count_delta / time_delta)
+
+                self.last_disk_io = current_disk_io
+                self.last_disk_time = current_time
+
+                return {
+                    'read_iops': round(self.read_iops_window.mean, 2),
+                    'write_iops': round(self.write_iops_window.mean, 2)
+                }
+        except Exception as e:
+            print(f"Error in calculate_disk_io: {e}")
+        return {'read_iops': 0, 'write_iops': 0}
+
+    # 메모리 정보 수집
+    def get_memory_info(self):
+        with PSUTIL_CALL_SECONDS.time('virtual_memory'):
+            memory = psutil.virtual_memory()
+        return {
+            'total_gb': round(memory.total / (1024 * 1024 * 1024), 2),
+            'used_gb': round(memory.used / (1024 * 1024 * 1024), 2),
+            'usage_percent': memory.percent
+        }
+
+    # 디스크 사용량 수집
+    def get_disk_usage(self):
+        try:
+            with PSUTIL_CALL_SECONDS.time('disk_usage'):
+                usage = psutil.disk_usage(self.disk_usage_path)
+            return {
+                'total_gb': round(usage.total / (1024 * 1024 * 1024), 2),
+                'used_gb': round(usage.used / (1024 * 1024 * 1024), 2),
+                'usage_percent': usage.percent
+            }
+        except Exception as e:
+            print(f"Error in get_disk_usage: {e}")
+            return {'total_gb': 0, 'used_gb': 0, 'usage_percent': 0}
+
+    def sample(self, now=None):
+        """기본 메트릭 한 번 수집 (get_all_metrics 형식, server_id 제외)"""
+        now = time.time() if now is None else now
+        return {
+            'cpu': self.calculate_cpu_average(),
+            'cpu_load': self.get_cpu_load(),
+            'memory': self.get_memory_info(),
+            'disk_io': self.calculate_disk_io(),
+            'disk': self.get_disk_usage(),
+            'datetime': datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': now
+        }
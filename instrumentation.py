@@ -0,0 +1,346 @@
+import threading
+import time
+from bisect import bisect_left
+
+
+# 모니터 자체의 성능 지표 (Prometheus 텍스트 형식으로 /metrics에 노출)
+#
+# 카운터/히스토그램은 스레드별 셀에 락 없이 누적하고, 스크랩할 때만 합산한다.
+# 종료된 스레드의 셀은 새 스레드가 등록될 때와 스크랩할 때 retired 셀로 합치므로
+# 스크랩하지 않아도 요청 스레드가 늘어나는 만큼 크기가 커지지 않는다.
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 초 단위 지연 시간 버킷 (0.1ms ~ 10s)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+# 리포트 생성처럼 오래 걸리는 작업용 버킷 (10ms ~ 10분)
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+class _Metric:
+    """스레드별 셀 {label 값 튜플: [값...]} 을 관리하는 기반 클래스"""
+
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        # (스레드, 셀) 목록은 스레드가 처음 기록할 때와 스크랩할 때만 락으로 보호
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _cells(self):
+        cells = getattr(self._local, 'cells', None)
+        if cells is None:
+            cells = self._local.cells = {}
+            with self._lock:
+                self._retire_dead()
+                self._shards.append((threading.current_thread(), cells))
+        return cells
+
+    def _retire_dead(self):
+        # 종료된 스레드는 더 이상 기록하지 않으므로 안전하게 합칠 수 있음 (락을 잡은 상태에서 호출)
+        alive = []
+        for thread, cells in self._shards:
+            if thread.is_alive():
+                alive.append((thread, cells))
+            else:
+                self._merge_into(self._retired, cells)
+        self._shards = alive
+
+    def _new_cell(self):
+        raise NotImplementedError
+
+    def _cell(self, labels):
+        cells = self._cells()
+        cell = cells.get(labels)
+        if cell is None:
+            cell = cells[labels] = self._new_cell()
+        return cell
+
+    def _merged(self):
+        """모든 스레드의 셀을 label별로 합산"""
+        with self._lock:
+            self._retire_dead()
+            merged = {}
+            self._merge_into(merged, self._retired)
+            for _, cells in self._shards:
+                self._merge_into(merged, cells)
+        return merged
+
+    @staticmethod
+    def _merge_into(target, cells):
+        # 다른 스레드가 기록 중일 수 있으므로 dict를 한 번에 복사한 뒤 읽음
+        for labels, cell in list(cells.items()):
+            total = target.get(labels)
+            if total is None:
+                target[labels] = list(cell)
+            else:
+                for i, value in enumerate(cell):
+                    total[i] += value
+
+    def _labels(self, labels, **extra):
+        result = dict(zip(self.labelnames, labels))
+        result.update(extra)
+        return result
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (이름은 _total로 끝나야 함)"""
+
+    kind = 'counter'
+
+    def _new_cell(self):
+        return [0]
+
+    def inc(self, *labels, amount=1):
+        self._cell(labels)[0] += amount
+
+    def collect(self):
+        samples = [
+            (self.name, self._labels(labels), cell[0])
+            for labels, cell in sorted(self._merged().items())
+        ]
+        return (self.name, self.kind, self.help, samples)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_cell(self):
+        # 버킷별 개수 (마지막은 +Inf), 합계, 개수
+        return [0] * (len(self.buckets) + 3)
+
+    def observe(self, value, *labels):
+        cell = self._cell(labels)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def time(self, *labels):
+        """with 블록의 실행 시간을 기록하는 컨텍스트 매니저"""
+        return _Timer(self, labels)
+
+    def collect(self):
+        samples = []
+        bounds = [f'{bound:g}' for bound in self.buckets] + ['+Inf']
+        for labels, cell in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, cell):
+                cumulative += count
+                samples.append((self.name + '_bucket', self._labels(labels, le=bound), cumulative))
+            samples.append((self.name + '_sum', self._labels(labels), cell[-2]))
+            samples.append((self.name + '_count', self._labels(labels), cell[-1]))
+        return (self.name, self.kind, self.help, samples)
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Gauge:
+    """스크랩할 때 callback()으로 값을 읽는 게이지
+
+    callback은 숫자 하나 또는 [(label 값 튜플, 값)] 목록을 반환한다.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, help, callback, labelnames=()):
+        self.name = name
+        self.help = help
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def collect(self):
+        values = self.callback()
+        if not isinstance(values, list):
+            values = [((), values)]
+        samples = [
+            (self.name, dict(zip(self.labelnames, labels)), value)
+            for labels, value in values
+        ]
+        return (self.name, self.kind, self.help, samples)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name, help, callback, labelnames=()):
+        return self.register(Gauge(name, help, callback, labelnames))
+
+    def collect(self):
+        """(이름, 종류, 설명, [(샘플 이름, labels, 값)]) 목록 (프로세스 간 전달 가능)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = []
+        for metric in metrics:
+            try:
+                families.append(metric.collect())
+            except Exception as e:
+                print(f"Error collecting {metric.name}: {e}")
+        return families
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'monitor_http_request_duration_seconds', 'HTTP request latency by route.',
+    ('route', 'method', 'status')
+)
+PSUTIL_CALL_SECONDS = REGISTRY.histogram(
+    'monitor_psutil_call_duration_seconds', 'Duration of psutil calls made by the collector.',
+    ('call',)
+)
+COLLECT_SECONDS = REGISTRY.histogram(
+    'monitor_collect_duration_seconds', 'Duration of one full get_all_metrics collection.'
+)
+ALERT_SAVE_SECONDS = REGISTRY.histogram(
+    'monitor_alert_save_duration_seconds', 'Duration of alert journal batch writes.'
+)
+ALERTS_SAVED = REGISTRY.counter('monitor_alerts_saved_total', 'Alerts written to the alert journal.')
+REPORT_SECONDS = REGISTRY.histogram(
+    'monitor_report_generation_duration_seconds', 'Report generation time.',
+    ('type', 'resolution', 'mode'), buckets=SLOW_BUCKETS
+)
+
+
+def with_labels(families, **labels):
+    """모든 샘플에 label을 추가한 패밀리 목록 (다른 프로세스 지표와 합칠 때 사용)"""
+    return [
+        (name, kind, help, [(sample, dict(sample_labels, **labels), value)
+                            for sample, sample_labels, value in samples])
+        for name, kind, help, samples in families
+    ]
+
+
+def host_families(metrics):
+    """샘플러 스냅샷의 호스트 메트릭을 게이지 패밀리로 변환"""
+    gb = 1024 * 1024 * 1024
+
+    def family(name, help, samples):
+        return (name, 'gauge', help, samples)
+
+    families = [
+        family('monitor_host_cpu_usage_percent', 'CPU usage (1 minute average).',
+               [(None, {}, metrics['cpu'])]),
+        family('monitor_host_cpu_load_percent', 'Average CPU usage over a window.',
+               [(None, {'window': window}, value)
+                for window, value in metrics.get('cpu_load', {}).items()]),
+        family('monitor_host_memory_total_bytes', 'Total physical memory.',
+               [(None, {}, metrics['memory']['total_gb'] * gb)]),
+        family('monitor_host_memory_used_bytes', 'Used physical memory.',
+               [(None, {}, metrics['memory']['used_gb'] * gb)]),
+        family('monitor_host_memory_usage_percent', 'Memory usage.',
+               [(None, {}, metrics['memory']['usage_percent'])]),
+        family('monitor_host_disk_iops', 'Disk operations per second (5 minute average).',
+               [(None, {'direction': 'read'}, metrics['disk_io']['read_iops']),
+                (None, {'direction': 'write'}, metrics['disk_io']['write_iops'])]),
+        family('monitor_host_disk_used_bytes', 'Used space on the monitored filesystem.',
+               [(None, {}, metrics['disk']['used_gb'] * gb)]),
+        family('monitor_host_disk_usage_percent', 'Usage of the monitored filesystem.',
+               [(None, {}, metrics['disk']['usage_percent'])]),
+        family('monitor_host_sample_timestamp_seconds', 'Time of the exposed sample.',
+               [(None, {}, metrics['timestamp'])]),
+    ]
+    if 'cpu_per_core' in metrics:
+        families.append(family(
+            'monitor_host_cpu_core_usage_percent', 'CPU usage per core.',
+            [(None, {'core': str(core)}, value)
+             for core, value in enumerate(metrics['cpu_per_core'])]
+        ))
+    if 'load_avg' in metrics:
+        families.append(family(
+            'monitor_host_load_average', 'System load average.',
+            [(None, {'window': window}, value) for window, value in metrics['load_avg'].items()]
+        ))
+    for key, prefix, device_label in (('disks', 'monitor_host_device', 'device'),
+                                      ('network', 'monitor_host_network', 'interface')):
+        by_field = {}
+        for device, rates in metrics.get(key, {}).items():
+            for field, value in rates.items():
+                by_field.setdefault(field, []).append((None, {device_label: device}, value))
+        for field, samples in by_field.items():
+            families.append(family(f'{prefix}_{field}', f'{field} per {device_label}.', samples))
+
+    # 샘플 이름이 None이면 패밀리 이름과 같음
+    return [
+        (name, kind, help, [(sample or name, labels, value) for sample, labels, value in samples])
+        for name, kind, help, samples in families
+    ]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value is None:
+        return 'NaN'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def exposition(*family_lists):
+    """패밀리 목록들을 Prometheus 텍스트 형식으로 변환
+
+    같은 이름의 패밀리는 샘플을 합치고, 샘플이 없는 패밀리는 생략한다.
+    """
+    merged = {}
+    for families in family_lists:
+        for name, kind, help, samples in families:
+            if name in merged:
+                merged[name][2].extend(samples)
+            else:
+                merged[name] = (kind, help, list(samples))
+
+    lines = []
+    for name, (kind, help, samples) in merged.items():
+        if not samples:
+            continue
+        lines.append(f'# HELP {name} {help}')
+        lines.append(f'# TYPE {name} {kind}')
+        for sample, labels, value in samples:
+            if labels:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f'{sample}{{{label_text}}} {_format_value(value)}')
+            else:
+                lines.append(f'{sample} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
@@ -1,33 +1,157 @@
-import csv
+import itertools
 import json
 import time
-from datetime import datetime, timedelta
 from pathlib import Path
 
-import psutil
+import numpy as np
+
+from alert_engine import AlertEngine
+from alert_journal import AlertJournal
+from anomaly_detector import AnomalyDetector
+from downsample import lttb_indices
+from extended_metrics import ExtendedCollector
+from host_sampler import HostSampler
+from instrumentation import COLLECT_SECONDS, REGISTRY, REPORT_SECONDS
+from process_table import ProcessTable
+from remote_collector import RemoteCollector
+from report_builder import (DEFAULT_REPORT_RESOLUTIONS, RESOLUTIONS, csv_chunks, file_chunks,
+                            new_report_entry, new_report_path, report_range,
+                            resolve_resolution, tee_to_file)
+from report_catalog import ReportCatalog
+from report_jobs import ReportJobManager
+from report_stats import compute_summary, summary_rows, thresholds_from_rules
+from rollups import TIERS, RollupManager
+from sample_store import COLUMN_NAMES, row_from_metrics
+from segment_store import SegmentStore
+from supervisor import read_status
+
+
+# 보관 기간이 지난 세그먼트를 정리하는 주기 (초)
+PRUNE_INTERVAL = 3600
 
 
 # 메트릭 수집 클래스 추가
-class MetricsCollector:
-    def __init__(self):
-        self.last_disk_io = psutil.disk_io_counters()
-        self.last_disk_time = time.time()
-        self.bandwidth_samples = []
-        self.SAMPLE_DURATION = 300  # 5분
-        
-        self.cpu_samples = []
-        self.CPU_SAMPLE_DURATION = 60  # 1분
-        self.last_cpu_time = time.time()
-        self.log_data = []
+class MetricsCollector(HostSampler):
+    RESOLUTIONS = RESOLUTIONS
+    DEFAULT_REPORT_RESOLUTIONS = DEFAULT_REPORT_RESOLUTIONS
+    HISTORY_METRICS = COLUMN_NAMES[1:]
+
+    def __init__(self, read_only=False):
+        # read_only: 다중 워커 모드의 워커용 (디스크 기록/알림 저널/롤업 재생 없이 조회만)
+        self.read_only = read_only
         self.log_file_path = Path("logs")
         self.log_file_path.mkdir(exist_ok=True)
+        self.config = self._load_config()
+        super().__init__(self.config['disk_usage_path'])
+        # 코어별/디스크별/NIC별 메트릭 (패밀리별 on/off, 틱당 수집 비용 예산)
+        self.extended_collector = ExtendedCollector(
+            self.config['metric_families'], self.config['collection_budget_ms']
+        )
+        # 샘플은 일 단위 세그먼트 파일에 기록 (내보내기/리포트/차트 모두 세그먼트에서 읽음)
+        self.data_path = Path(self.config['data_dir'])
+        self.data_path.mkdir(parents=True, exist_ok=True)
+        # 리포트 목록/다운로드는 디렉터리 스캔 대신 카탈로그에서 조회
+        self.report_catalog = ReportCatalog(self.log_file_path, self.data_path / 'reports.db')
+        self.segment_store = SegmentStore(self.data_path / 'metrics')
+        # 리포트/장기 차트용 1분/1시간/1일 롤업
+        self.rollups = RollupManager(self.data_path / 'rollups')
+        if not read_only:
+            REGISTRY.gauge('monitor_segment_store_bytes', 'Disk used by sample segments by tier.',
+                           self._segment_sizes, ('tier',))
+        # 보관 기간 정리는 시작 후 첫 샘플에서 한 번, 이후 PRUNE_INTERVAL마다
+        self._next_prune = 0
+        if not read_only:
+            self._rebuild_rollups()
         self.servers = self._load_servers()
-        self.alerts = self._load_alerts()
+        # 알림은 백그라운드에서 배치 기록되는 저널에 저장 (기존 alerts.json은 최초 1회 이전)
+        self.alert_journal = None if read_only else AlertJournal(
+            self.data_path / 'alerts.jsonl',
+            legacy_path='config/alerts.json',
+            max_recent=self.config['max_recent_alerts'],
+            fsync=self.config['alert_fsync']
+        )
         self.alert_thresholds = {
             'cpu': 80,
             'memory': 90,
             'disk': 85
         }
+        alert_rules = self._load_alert_rules()
+        self.alert_engine = AlertEngine(alert_rules)
+        # 고정 임계값 규칙과 별도로 서버/메트릭별 이동 기준선 대비 이상치도 알림으로 기록
+        # 주기 저장은 알림 저널의 기록 스레드에서 수행
+        self.anomaly_detector = None if read_only else AnomalyDetector(self.alert_journal.submit, **{
+            'checkpoint_path': str(self.data_path / 'anomaly_state.json'),
+            **self.config['anomaly_detection']
+        })
+        if self.anomaly_detector is not None:
+            self.anomaly_detector.load_checkpoint()
+        # 요약 리포트의 임계값 초과 시간은 알림 규칙의 임계값 기준
+        self.summary_thresholds = thresholds_from_rules(alert_rules)
+        # 대용량 리포트는 요청 스레드 밖의 프로세스 풀에서 생성
+        self.report_jobs = ReportJobManager(
+            self.data_path, self.log_file_path, self.report_catalog,
+            max_workers=self.config['report_workers'],
+            thresholds=self.summary_thresholds
+        )
+        # 상위 프로세스 표는 샘플러와 별도 주기로 갱신
+        self.process_table = ProcessTable(
+            interval=self.config['process_interval'], top_n=self.config['process_top_n']
+        )
+        # 원격 서버는 에이전트의 /api/metrics를 동시에 폴링
+        self.remote_collector = RemoteCollector(
+            self.servers,
+            interval=self.config['sample_interval'],
+            timeout=self.config['remote_timeout'],
+            max_backoff=self.config['remote_max_backoff'],
+            max_concurrency=self.config['remote_max_concurrency'],
+            on_metrics=self._on_remote_metrics,
+            batch_interval=self.config['remote_batch_interval']
+        )
+
+    def _load_config(self):
+        config = {
+            'sample_interval': 1.0,
+            'retention_seconds': 86400,  # 기간 없이 내보낼 때의 기본 구간 (1일)
+            'data_dir': 'data',
+            'segment_retention_days': 30,  # 원본 세그먼트 보관 기간 (0이면 삭제하지 않음)
+            # 롤업 단계별 보관 기간 (일, 없는 단계는 삭제하지 않음)
+            'rollup_retention_days': {'1m': 90, '1h': 730},
+            'max_recent_alerts': 1000,
+            'alert_fsync': True,
+            'disk_usage_path': '/',
+            'remote_timeout': 2.0,
+            'remote_max_backoff': 60,
+            'remote_max_concurrency': 200,
+            'remote_batch_interval': 10.0,  # 에이전트에서 배치로 가져오는 주기 (초)
+            'stream_backfill': 60,
+            'report_workers': 2,
+            'metric_families': {},
+            'collection_budget_ms': 20.0,
+            'process_interval': 5.0,
+            'process_top_n': 50,
+            # 감시기별 상태 파일 (monitor_Mac.py / serve.py)
+            'supervisor_status_paths': {
+                'monitor': 'data/supervisor.json',
+                'serve': 'data/serve.json',
+            },
+            'ring_slots': 256,
+            'ring_slot_size': 16384,  # 최소 슬롯 크기 (첫 스냅샷 크기의 2배가 더 크면 그 값)
+            # anomaly_detector.DEFAULT_SETTINGS 중 바꿀 항목
+            'anomaly_detection': {}
+        }
+        try:
+            with open('config/collector.json', 'r') as f:
+                config.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        return config
+
+    def _rebuild_rollups(self):
+        """아직 롤업에 반영되지 않은 원본 샘플을 다시 반영"""
+        try:
+            self.rollups.replay(self.segment_store.rows(self.rollups.replay_start(), None))
+        except Exception as e:
+            print(f"Error rebuilding rollups: {e}")
 
     def _load_servers(self):
         try:
@@ -36,292 +160,366 @@ class MetricsCollector:
         except FileNotFoundError:
             return {'local': {'name': 'Local Server', 'host': 'localhost'}}
 
-    def _load_alerts(self):
+    def _load_alert_rules(self):
         try:
-            with open('config/alerts.json', 'r') as f:
+            with open('config/alert_rules.json', 'r') as f:
                 return json.load(f)
         except FileNotFoundError:
-            return []
+            # 규칙 파일이 없으면 기본 임계값으로 즉시 발생하는 규칙 사용
+            return [
+                {'id': 'cpu_high', 'metric': 'cpu', 'above': self.alert_thresholds['cpu']},
+                {'id': 'memory_high', 'metric': 'memory.usage_percent',
+                 'above': self.alert_thresholds['memory']},
+                {'id': 'disk_full', 'metric': 'disk.usage_percent',
+                 'above': self.alert_thresholds['disk']}
+            ]
 
     def get_servers(self):
         return self.servers
 
+    def get_server_status(self):
+        """서버별 수집 상태 (원격 서버는 마지막 성공 시각/실패 횟수 포함)"""
+        return {
+            server_id: dict(server, **self.remote_collector.status(server_id))
+            for server_id, server in self.servers.items()
+        }
+
+    def start_remote_collection(self):
+        self.remote_collector.start()
+
+    def get_remote_metrics(self, server_id):
+        return self.remote_collector.latest(server_id)
+
+    def _on_remote_metrics(self, metrics):
+        # 원격 샘플도 서버별 상태 머신으로 알림 평가
+        alerts = self.check_alerts(metrics)
+        if alerts:
+            self.alert_journal.extend(alerts)
+
+    def start_process_tracking(self):
+        self.process_table.start()
+
+    def get_top_processes(self, sort='cpu', n=10):
+        """CPU/메모리/IO 기준 상위 프로세스 (잘못된 정렬 기준은 ValueError)"""
+        return self.process_table.top(sort, min(n, self.config['process_top_n']))
+
+    def get_supervisor_status(self):
+        """감시기(monitor_Mac.py, serve.py)별 자식 프로세스 상태 (어느 감시기도 실행한 적 없으면 None)"""
+        statuses = {}
+        for name, path in self.config['supervisor_status_paths'].items():
+            try:
+                statuses[name] = read_status(path)
+            except Exception as e:
+                print(f"Error reading {name} supervisor status: {e}")
+                statuses[name] = None
+        if all(status is None for status in statuses.values()):
+            return None
+        return statuses
+
+    def get_self_metrics(self):
+        """이 프로세스의 자체 성능 지표 패밀리 목록 (/metrics 노출용)"""
+        return REGISTRY.collect()
+
     def get_alerts(self):
-        return self.alerts
+        return self.alert_journal.get_recent()
+
+    def get_active_alerts(self):
+        return self.alert_engine.active() + self.anomaly_detector.active()
 
     def check_alerts(self, metrics):
-        alerts = []
-        if metrics['cpu'] > self.alert_thresholds['cpu']:
-            alerts.append({
-                'type': 'cpu',
-                'message': f"CPU usage is high: {metrics['cpu']}%",
-                'timestamp': datetime.now().isoformat()
-            })
-        if metrics['memory']['usage_percent'] > self.alert_thresholds['memory']:
-            alerts.append({
-                'type': 'memory',
-                'message': f"Memory usage is high: {metrics['memory']['usage_percent']}%",
-                'timestamp': datetime.now().isoformat()
-            })
-        return alerts
-
-    # CPU 사용률 계산
-    def calculate_cpu_average(self):
-        current_time = time.time()
-        
-        self.cpu_samples.append({
-            'time': current_time,
-            'usage': psutil.cpu_percent(interval=None)
-        })
-        
-        self.cpu_samples = [
-            sample for sample in self.cpu_samples
-            if current_time - sample['time'] <= self.CPU_SAMPLE_DURATION
-        ]
-        
-        if self.cpu_samples:
-            avg_cpu = sum(sample['usage'] for sample in self.cpu_samples) / len(self.cpu_samples)
-            return round(avg_cpu, 2)
-        return 0
+        """규칙 엔진과 이상치 감지기로 샘플을 평가해 새로 발생/해제된 알림만 반환"""
+        server_id = metrics.get('server_id', 'local')
+        alerts = self.alert_engine.evaluate(server_id, metrics['timestamp'], metrics)
+        return alerts + self.anomaly_detector.update(server_id, metrics['timestamp'], metrics)
 
-    def calculate_disk_io(self):
+    # 메트릭을 로그에 저장하는 함수 추가
+    def save_metrics_to_log(self, metrics):
+        row = row_from_metrics(metrics)
         try:
-            current_disk_io = psutil.disk_io_counters()
-            current_time = time.time()
-            time_delta = current_time - self.last_disk_time
-
-            if time_delta > 0:
-                read_count_delta = current_disk_io.read_count - self.last_disk_io.read_count
-                write_count_delta = current_disk_io.write_count - self.last_disk_io.write_count
-                
-                read_iops = read_count_delta / time_delta
-                write_iops = write_count_delta / time_delta
-                
-                self.bandwidth_samples.append({
-                    'time': current_time,
-                    'read_iops': read_iops,
-                    'write_iops': write_iops
-                })
-                
-                self.bandwidth_samples = [
-                    sample for sample in self.bandwidth_samples
-                    if current_time - sample['time'] <= self.SAMPLE_DURATION
-                ]
-                
-                if self.bandwidth_samples:
-                    total_read_iops = sum(sample['read_iops'] for sample in self.bandwidth_samples)
-                    total_write_iops = sum(sample['write_iops'] for sample in self.bandwidth_samples)
-                    avg_read_iops = total_read_iops / len(self.bandwidth_samples)
-                    avg_write_iops = total_write_iops / len(self.bandwidth_samples)
-                    
-                    self.last_disk_io = current_disk_io
-                    self.last_disk_time = current_time
-                    
-                    return {
-                        'read_iops': round(avg_read_iops, 2),
-                        'write_iops': round(avg_write_iops, 2)
-                    }
+            self.segment_store.append(row)
+            self.rollups.add(row)
         except Exception as e:
-            print(f"Error in calculate_disk_io: {e}")
-        return {'read_iops': 0, 'write_iops': 0}
+            print(f"Error writing segment: {e}")
+        if row[0] >= self._next_prune:
+            # 파일 삭제는 알림 저널의 기록 스레드에서 수행
+            self._next_prune = row[0] + PRUNE_INTERVAL
+            self.alert_journal.submit(self.prune_segments)
 
-    # 메모리 정보 수집
-    def get_memory_info(self):
-        memory = psutil.virtual_memory()
-        return {
-            'total_gb': round(memory.total / (1024 * 1024 * 1024), 2),
-            'used_gb': round(memory.used / (1024 * 1024 * 1024), 2),
-            'usage_percent': memory.percent
-        }
+    def _segment_sizes(self):
+        sizes = [(('raw',), self.segment_store.nbytes)]
+        sizes.extend(((name,), tier.store.nbytes) for name, tier in self.rollups.tiers.items())
+        return sizes
 
-    # 메트릭을 로그에 저장하는 함수 추가
-    def save_metrics_to_log(self, metrics):
-        self.log_data.append(metrics)
-        
-    # 엑셀 내보내기 함수 추가
-    def export_to_csv(self):
-        if not self.log_data:
-            return None
-            
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        file_path = self.log_file_path / f'metrics_log_{timestamp}.csv'
-        
-        headers = [
-            'datetime', 'cpu_usage', 
-            'memory_total_gb', 'memory_used_gb', 'memory_usage_percent',
-            'disk_read_iops', 'disk_write_iops'
-        ]
-        
-        # 로그 파일 경로 설정
+    def prune_segments(self, now=None):
+        """보관 기간이 지난 세그먼트 파일 삭제"""
+        now = time.time() if now is None else now
         try:
-            with open(file_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                for data in self.log_data:
-                    writer.writerow({
-                        'datetime': data['datetime'],
-                        'cpu_usage': data['cpu'],
-                        'memory_total_gb': data['memory']['total_gb'],
-                        'memory_used_gb': data['memory']['used_gb'],
-                        'memory_usage_percent': data['memory']['usage_percent'],
-                        'disk_read_iops': data['disk_io']['read_iops'],
-                        'disk_write_iops': data['disk_io']['write_iops']
-                    })
-            return str(file_path)
+            days = self.config['segment_retention_days']
+            if days:
+                removed = self.segment_store.prune(now - days * 86400)
+                if removed:
+                    print(f"Pruned raw segments: {', '.join(removed)}")
+            for name, keys in self.rollups.prune(now, self.config['rollup_retention_days']).items():
+                print(f"Pruned {name} rollup segments: {', '.join(keys)}")
         except Exception as e:
-            print(f"Error saving CSV: {e}")
+            print(f"Error pruning segments: {e}")
+
+    def close(self):
+        """종료 처리: 저널 큐(대기 중인 주기 저장 포함)를 비운 뒤 마지막 기준선 저장"""
+        self.report_jobs.shutdown()
+        if self.alert_journal is not None:
+            self.alert_journal.close()
+        if self.anomaly_detector is not None:
+            self.anomaly_detector.checkpoint()
+
+    def _peek_rows(self, rows):
+        """첫 행만 읽어 데이터 유무 확인 (없으면 None)"""
+        rows = iter(rows)
+        first_row = next(rows, None)
+        if first_row is None:
+            return None
+        return itertools.chain([first_row], rows)
+
+    # 엑셀 내보내기 함수 추가
+    def stream_csv(self, start=None, end=None):
+        """[start, end) 구간 원본 샘플을 CSV 청크로 스트리밍 (기본: 보관 기간 전체)"""
+        if start is None:
+            start = time.time() - self.config['retention_seconds']
+        rows = self._peek_rows(self.segment_store.rows(start, end))
+        if rows is None:
             return None
+        return csv_chunks(rows)
 
     # 모든 메트릭 수집 함수 추가
     def get_all_metrics(self, server_id='local'):
-        metrics = {
-            'cpu': self.calculate_cpu_average(),
-            'memory': self.get_memory_info(),
-            'disk_io': self.calculate_disk_io(),
-            'datetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'server_id': server_id
-        }
+        with COLLECT_SECONDS.time():
+            return self._collect_all_metrics(server_id)
+
+    def _collect_all_metrics(self, server_id):
+        now = time.time()
+        metrics = self.sample(now)
+        metrics['server_id'] = server_id
+        metrics.update(self.extended_collector.collect(now))
         
         # 알림 체크 및 저장
         alerts = self.check_alerts(metrics)
         if alerts:
-            self.alerts.extend(alerts)
-            self._save_alerts()
+            self.alert_journal.extend(alerts)
         
         self.save_metrics_to_log(metrics)
         return metrics
 
-    def _save_alerts(self):
-        with open('config/alerts.json', 'w') as f:
-            json.dump(self.alerts, f)
-
-    def _get_report_headers(self):
-        return [
-            'datetime',
-            'cpu_usage',
-            'memory_total_gb',
-            'memory_used_gb',
-            'memory_usage_percent',
-            'disk_read_iops',
-            'disk_write_iops'
-        ]
-
-    def _generate_daily_report(self, date):
+    def _report_rows(self, resolution, start, end):
+        """해상도에 맞는 저장소에서 [start, end) 구간 행 반환"""
+        if resolution == 'raw':
+            return self.segment_store.rows(start, end)
+        if resolution == 'summary':
+            summary = self.get_report_summary_range(start, end)
+            return summary_rows(summary) if summary is not None else []
+        return self.rollups[resolution].rows(start, end)
+
+    def _report_range(self, date, report_type):
+        return report_range(date, report_type)
+
+    def _generate_daily_report(self, date, resolution='raw'):
         """일간 리포트 생성"""
         try:
-            daily_data = [entry for entry in self.log_data 
-                         if entry['datetime'].startswith(date)]
-            return daily_data
+            return self._report_rows(resolution, *self._report_range(date, 'daily'))
         except Exception as e:
             print(f"Error generating daily report: {e}")
             return []
 
-    def _generate_weekly_report(self, date):
+    def _generate_weekly_report(self, date, resolution='1h'):
         """주간 리포트 생성"""
         try:
-            # 선택된 날짜를 기준으로 일주일 데이터 필터링
-            date_obj = datetime.strptime(date, '%Y-%m-%d')
-            week_start = date_obj - timedelta(days=date_obj.weekday())
-            week_end = week_start + timedelta(days=7)
-            
-            weekly_data = [
-                entry for entry in self.log_data
-                if week_start <= datetime.strptime(entry['datetime'].split()[0], '%Y-%m-%d') < week_end
-            ]
-            return weekly_data
+            return self._report_rows(resolution, *self._report_range(date, 'weekly'))
         except Exception as e:
             print(f"Error generating weekly report: {e}")
             return []
 
-    def _generate_monthly_report(self, date):
+    def _generate_monthly_report(self, date, resolution='1h'):
         """월간 리포트 생성"""
         try:
-            # 선택된 월의 데이터 필터링
-            month = date[:7]  # YYYY-MM
-            monthly_data = [entry for entry in self.log_data 
-                           if entry['datetime'].startswith(month)]
-            return monthly_data
+            return self._report_rows(resolution, *self._report_range(date, 'monthly'))
         except Exception as e:
             print(f"Error generating monthly report: {e}")
             return []
 
-    def get_report_list(self):
-        """생성된 리포트 목록 반환"""
+    def get_report_summary_range(self, start, end):
+        """[start, end) 구간의 메트릭별 요약 통계 (리포트 작업 풀에서 일 파티션 병렬 집계)"""
+        return compute_summary(
+            self.data_path, start, end, self.summary_thresholds, self.report_jobs
+        )
+
+    def get_report_summary(self, date, report_type):
+        """리포트 기간의 요약 통계 반환 (데이터가 없으면 None)"""
+        summary = self.get_report_summary_range(*self._report_range(date, report_type))
+        if summary is not None:
+            summary.update({'date': date, 'type': report_type})
+        return summary
+
+    def get_report_list(self, limit=None, offset=0):
+        """생성된 리포트 목록 반환 (최신순, limit/offset으로 페이지 조회)"""
         try:
-            reports = []
-            for file in self.log_file_path.glob('report_*.csv'):
-                # 파일명에서 정보 추출 (report_type_timestamp.csv)
-                filename = file.stem  # 확장자 제외한 파일명
-                parts = filename.split('_')
-                if len(parts) >= 3:
-                    report_type = parts[1]
-                    timestamp = '_'.join(parts[2:])
-                    reports.append({
-                        'id': filename,
-                        'type': report_type,
-                        'created_at': datetime.strptime(timestamp, '%Y%m%d_%H%M%S').strftime('%Y-%m-%d %H:%M:%S')
-                    })
-            return sorted(reports, key=lambda x: x['created_at'], reverse=True)
+            return self.report_catalog.list(limit, offset)
         except Exception as e:
             print(f"Error getting report list: {e}")
             return []
 
+    def get_report_count(self):
+        return self.report_catalog.count()
+
+    def get_report_catalog_version(self):
+        return self.report_catalog.version()
+
     def get_report_file(self, report_id):
         """특정 리포트 파일 경로 반환"""
         try:
-            file_path = self.log_file_path / f'{report_id}.csv'
-            return str(file_path) if file_path.exists() else None
+            entry = self.report_catalog.get(report_id)
+            return str(self.log_file_path / f'{entry["id"]}.csv') if entry else None
         except Exception as e:
             print(f"Error getting report file: {e}")
             return None
 
-    def generate_report(self, date, report_type):
-        """리포트 생성 메서드"""
+    def _report_data(self, date, report_type, resolution):
+        resolution = resolve_resolution(report_type, resolution)
+
+        # 리포트 데이터 생성
+        if report_type == 'daily':
+            report_data = self._generate_daily_report(date, resolution)
+        elif report_type == 'weekly':
+            report_data = self._generate_weekly_report(date, resolution)
+        elif report_type == 'monthly':
+            report_data = self._generate_monthly_report(date, resolution)
+        else:
+            raise ValueError(f"Unknown report type: {report_type}")
+
+        # 필요한 파티션만 순차적으로 읽으므로 첫 행만 확인
+        return self._peek_rows(report_data), resolution
+
+    def _find_cached_report(self, date, report_type, resolution):
+        """같은 조건의 완결된 리포트 파일이 있으면 경로 반환"""
+        entry = self.report_catalog.find(report_type, date, resolution)
+        if entry is None:
+            return None
+        file_path = self.log_file_path / f'{entry["id"]}.csv'
         try:
-            # 리포트 데이터 생성
-            if report_type == 'daily':
-                report_data = self._generate_daily_report(date)
-            elif report_type == 'weekly':
-                report_data = self._generate_weekly_report(date)
-            elif report_type == 'monthly':
-                report_data = self._generate_monthly_report(date)
-            else:
-                raise ValueError(f"Unknown report type: {report_type}")
-
-            if not report_data:
-                print(f"No data available for {report_type} report on {date}")
-                return None
+            if file_path.stat().st_size == entry['size']:
+                return file_path
+        except FileNotFoundError:
+            pass
+        return None
 
-            # 리포트 파일 생성
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            file_path = self.log_file_path / f'report_{report_type}_{timestamp}.csv'
-
-            headers = [
-                'datetime',
-                'cpu_usage',
-                'memory_total_gb',
-                'memory_used_gb',
-                'memory_usage_percent',
-                'disk_read_iops',
-                'disk_write_iops'
-            ]
+    def _build_report(self, date, report_type, resolution):
+        """(파일 경로, CSV 청크 제너레이터) 반환, 데이터가 없으면 None"""
+        report_data, resolution = self._report_data(date, report_type, resolution)
 
-            with open(file_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                for data in report_data:
-                    writer.writerow({
-                        'datetime': data['datetime'],
-                        'cpu_usage': data['cpu'],
-                        'memory_total_gb': data['memory']['total_gb'],
-                        'memory_used_gb': data['memory']['used_gb'],
-                        'memory_usage_percent': data['memory']['usage_percent'],
-                        'disk_read_iops': data['disk_io']['read_iops'],
-                        'disk_write_iops': data['disk_io']['write_iops']
-                    })
+        cached_path = self._find_cached_report(date, report_type, resolution)
+        if cached_path is not None:
+            return cached_path, file_chunks(cached_path)
+
+        if report_data is None:
+            print(f"No data available for {report_type} report on {date}")
+            return None
+
+        file_path = new_report_path(self.log_file_path, report_type)
+        entry = new_report_entry(file_path, date, report_type, resolution)
+        chunks = tee_to_file(
+            csv_chunks(report_data, resolution), file_path, entry, self.report_catalog.add
+        )
+        return file_path, chunks
+
+    def _report_labels(self, report_type, resolution, mode):
+        resolution = resolution or self.DEFAULT_REPORT_RESOLUTIONS.get(report_type, 'unknown')
+        return report_type, resolution, mode
+
+    def _timed_chunks(self, chunks, labels, started):
+        """마지막 청크를 내보낸 시점까지를 리포트 생성 시간으로 기록 (중간에 끊기면 제외)"""
+        yield from chunks
+        REPORT_SECONDS.observe(time.perf_counter() - started, *labels)
+
+    def generate_report(self, date, report_type, resolution=None):
+        """리포트 생성 메서드"""
+        try:
+            with REPORT_SECONDS.time(*self._report_labels(report_type, resolution, 'sync')):
+                report = self._build_report(date, report_type, resolution)
+                if report is None:
+                    return None
+
+                # 리포트 파일 생성
+                file_path, chunks = report
+                for _ in chunks:
+                    pass
 
             return str(file_path)
 
         except Exception as e:
             print(f"Error generating report: {e}")
-            raise 
\ No newline at end of file
+            raise
+
+    def stream_report(self, date, report_type, resolution=None):
+        """리포트를 생성하면서 CSV 청크로 스트리밍 (동시에 리포트 파일로 저장)"""
+        try:
+            started = time.perf_counter()
+            report = self._build_report(date, report_type, resolution)
+            if report is None:
+                return None
+            labels = self._report_labels(report_type, resolution, 'stream')
+            return self._timed_chunks(report[1], labels, started)
+
+        except Exception as e:
+            print(f"Error generating report: {e}")
+            raise
+
+    def submit_report_job(self, date, report_type, resolution=None):
+        return self.report_jobs.submit(date, report_type, resolution).to_dict()
+
+    def get_report_job(self, job_id):
+        job = self.report_jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    def cancel_report_job(self, job_id):
+        job = self.report_jobs.cancel(job_id)
+        return job.to_dict() if job else None
+
+    def get_history(self, metric, start, end, points):
+        """[start, end) 구간을 최대 points개의 점으로 반환
+
+        요청한 포인트 수를 만족하는 가장 거친 해상도를 고른 뒤,
+        그래도 점이 많으면 LTTB로 줄여 응답 크기를 구간 길이와 무관하게 유지한다.
+        거친 해상도에 아직 닫힌 구간이 없으면(설치 직후 등) 더 세밀한 해상도로 내려간다.
+        """
+        if metric not in self.HISTORY_METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        index = self.HISTORY_METRICS.index(metric)
+
+        candidates = [name for name, seconds, _ in reversed(TIERS)
+                      if (end - start) / seconds >= points] + ['raw']
+        for resolution in candidates:
+            timestamps, columns = self._history_columns(resolution, index, start, end)
+            if len(timestamps):
+                break
+
+        history = {'metric': metric, 'resolution': resolution}
+
+        if len(timestamps) > points:
+            keep = lttb_indices(timestamps, columns['values'], points)
+            timestamps = timestamps[keep]
+            columns = {key: column[keep] for key, column in columns.items()}
+            history['downsampled'] = 'lttb'
+        history['timestamps'] = timestamps.tolist()
+        for key, column in columns.items():
+            history[key] = np.round(column.astype(np.float64), 2).tolist()
+        return history
+
+    def _history_columns(self, resolution, index, start, end):
+        # 매핑된 세그먼트에서 필요한 열만 모음 (행 단위 역직렬화 없음)
+        if resolution == 'raw':
+            timestamps, values = self.segment_store.columns((0, index + 1), start, end)
+            return timestamps, {'values': values}
+        # 롤업 행: 시작 시각, 샘플 수, 메트릭별 (min, max, avg, p95)
+        offset = 2 + index * 4
+        timestamps, minimum, maximum, values = self.rollups[resolution].store.columns(
+            (0, offset, offset + 1, offset + 2), start, end
+        )
+        return timestamps, {'values': values, 'min': minimum, 'max': maximum}
@@ -1,15 +1,15 @@
-import subprocess
-from time import sleep
+import logging
 
-def check(process):
-    string = 'ps -aux | grep /home/user/test/'+process
-    exec_string = "python3 /home/user/test/"+process
-    my=subprocess.check_output(string, shell=True).decode('utf-8')
+from supervisor import Supervisor
 
-    if exec_string not in my:
-        subprocess.call(exec_string + " &", shell=True)
+# ps | grep 으로 5초마다 확인하던 방식 대신 감시기가 직접 자식으로 실행하고 종료 즉시 재시작
+PROCESSES = [
+    {
+        'name': 'Metrics.py',
+        'command': ['python3', '/home/user/test/Metrics.py']
+    }
+]
 
 if __name__ == '__main__':
-    for i in range(10):
-        sleep(5)
-        check("Metrics.py")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    Supervisor(PROCESSES).run()
@@ -1,20 +1,17 @@
 import json
 import logging
-import platform
-import signal
-import subprocess
-import sys
 from pathlib import Path
-from time import sleep
+
+from supervisor import Supervisor
 
 
 class MonitoringSystem:
     def __init__(self):
         self.setup_logging()
         self.load_config()
-        self.processes = {}
 
     def setup_logging(self):
+        Path('logs').mkdir(exist_ok=True)
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
@@ -30,37 +27,15 @@ class MonitoringSystem:
                 self.config = json.load(f)
         except FileNotFoundError:
             self.config = {
-                'processes': ['Metrics.py'],
-                'check_interval': 5
+                'processes': ['Metrics.py']
             }
 
-    def start_process(self, process_name):
-        try:
-            process = subprocess.Popen(['python3', process_name])
-            self.processes[process_name] = process
-            logging.info(f"Started {process_name}")
-        except Exception as e:
-            logging.error(f"Error starting {process_name}: {e}")
-
-    def check_processes(self):
-        for process_name in self.config['processes']:
-            if process_name not in self.processes or self.processes[process_name].poll() is not None:
-                logging.warning(f"Restarting {process_name}")
-                self.start_process(process_name)
-
     def run(self):
-        signal.signal(signal.SIGINT, self.signal_handler)
-        
-        while True:
-            self.check_processes()
-            sleep(self.config['check_interval'])
-
-    def signal_handler(self, signum, frame):
-        logging.info("Shutting down monitoring system...")
-        for process in self.processes.values():
-            process.terminate()
-        sys.exit(0)
+        # 주기적으로 poll() 하는 대신 SIGCHLD로 종료를 감지해 재시작
+        settings = {key: value for key, value in self.config.items() if key != 'processes'}
+        self.supervisor = Supervisor(self.config['processes'], **settings)
+        self.supervisor.run()
 
 if __name__ == '__main__':
     monitor = MonitoringSystem()
-    monitor.run()
\ No newline at end of file
+    monitor.run()
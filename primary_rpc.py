@@ -0,0 +1,119 @@
+import threading
+from multiprocessing.connection import Client, Listener
+
+
+# 워커 프로세스가 샘플러(주) 프로세스의 메모리 상태를 조회하는 로컬 RPC
+#
+# 스냅샷처럼 자주 읽는 데이터는 SharedRing으로, 주 프로세스만 가진 상태
+# (알림 상태 머신, 원격 수집, 상위 프로세스, 리포트 작업)는 이 채널로 조회한다.
+
+PRIMARY_METHODS = frozenset((
+    'get_server_status',
+    'get_remote_metrics',
+    'get_top_processes',
+    'get_alerts',
+    'get_active_alerts',
+    'submit_report_job',
+    'get_report_job',
+    'cancel_report_job',
+    'get_self_metrics',
+))
+
+# 워커에서는 아무것도 하지 않는 메서드 (주 프로세스가 이미 실행 중)
+NOOP_METHODS = frozenset((
+    'start_remote_collection',
+    'start_process_tracking',
+))
+
+
+class PrimaryServer:
+    """주 프로세스에서 PRIMARY_METHODS 호출을 받아 수집기에 전달하는 서버"""
+
+    def __init__(self, collector, address, authkey):
+        self.collector = collector
+        self._listener = Listener(address, family='AF_UNIX', authkey=authkey)
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._accept, name='primary-rpc', daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return
+            except Exception as e:
+                # 인증 실패 등은 해당 연결만 버림
+                print(f"Error accepting RPC connection: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if method not in PRIMARY_METHODS:
+                        raise AttributeError(f"Method not allowed: {method}")
+                    conn.send(('ok', getattr(self.collector, method)(*args, **kwargs)))
+                except ValueError as e:
+                    conn.send(('value_error', str(e)))
+                except Exception as e:
+                    conn.send(('error', f"{type(e).__name__}: {e}"))
+
+    def close(self):
+        self._listener.close()
+
+
+class PrimaryClient:
+    """워커 스레드별 연결로 주 프로세스 메서드를 호출하는 클라이언트"""
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+        return conn
+
+    def call(self, method, *args, **kwargs):
+        # 주 프로세스가 재시작되어 연결이 끊겼으면 한 번 다시 연결
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send((method, args, kwargs))
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError):
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        if status == 'value_error':
+            raise ValueError(result)
+        if status == 'error':
+            raise RuntimeError(result)
+        return result
+
+
+class PrimaryProxy:
+    """워커용 수집기: 주 프로세스 상태는 RPC로, 디스크 기반 조회는 로컬 수집기로 처리"""
+
+    def __init__(self, collector, client):
+        self._collector = collector
+        self._client = client
+
+    def __getattr__(self, name):
+        if name in PRIMARY_METHODS:
+            return lambda *args, **kwargs: self._client.call(name, *args, **kwargs)
+        if name in NOOP_METHODS:
+            return lambda *args, **kwargs: None
+        return getattr(self._collector, name)
@@ -0,0 +1,154 @@
+import heapq
+import threading
+import time
+
+import psutil
+
+
+# 상위 프로세스 정렬 기준
+SORT_KEYS = ('cpu', 'memory', 'io')
+
+
+class _TrackedProcess:
+    """PID별로 유지하는 psutil.Process 객체와 직전 누적 카운터"""
+
+    __slots__ = ('process', 'cpu_total', 'io_total')
+
+    def __init__(self, process):
+        # Process 객체는 생성 시각을 기억하므로 is_running()으로 PID 재사용을 판단
+        self.process = process
+        self.cpu_total = None
+        self.io_total = None
+
+
+class ProcessTable:
+    """주기적으로 전체 프로세스를 훑어 CPU/RSS/IO 상위 N개를 유지하는 백그라운드 수집기
+
+    PID별 직전 누적 CPU 시간/IO 바이트를 캐시하고 그 차이로
+    사용률을 계산하므로 프로세스마다 cpu_percent(interval=...)로 기다리지 않는다.
+    """
+
+    def __init__(self, interval=5.0, top_n=50):
+        self.interval = interval
+        self.top_n = top_n
+        self._cache = {}
+        self._last_time = None
+        self._snapshot = None
+        self._seq = 0
+        self._cpu_count = psutil.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            # 첫 요청이 빈 응답을 받지 않도록 한 번은 즉시 갱신 (사용률은 다음 갱신부터)
+            self.refresh()
+            self._thread = threading.Thread(
+                target=self._run, name='process-table', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing process table: {e}")
+
+    def _sample(self, pid, tracked, elapsed):
+        """프로세스 하나의 CPU/RSS/IO 행 (사라졌거나 접근 불가면 psutil 예외)"""
+        process = tracked.process
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            rss = process.memory_info().rss
+            name = process.name()
+            try:
+                io = process.io_counters()
+                io_total = io.read_bytes + io.write_bytes
+            except (psutil.AccessDenied, AttributeError):
+                io_total = None
+
+        cpu_total = cpu_times.user + cpu_times.system
+        cpu = io_rate = 0.0
+        if elapsed and tracked.cpu_total is not None:
+            cpu = max(cpu_total - tracked.cpu_total, 0.0) / elapsed * 100
+        if elapsed and io_total is not None and tracked.io_total is not None:
+            io_rate = max(io_total - tracked.io_total, 0) / elapsed
+        tracked.cpu_total = cpu_total
+        tracked.io_total = io_total
+        return {
+            'pid': pid,
+            'name': name,
+            'cpu_percent': round(cpu, 2),
+            'cpu_percent_total': round(cpu / self._cpu_count, 2),
+            'rss_mb': round(rss / (1024 * 1024), 2),
+            'io_bytes_per_sec': round(io_rate, 2),
+        }
+
+    def refresh(self):
+        """모든 PID를 한 번 훑어 상위 N개 스냅샷 갱신"""
+        now = time.monotonic()
+        elapsed = now - self._last_time if self._last_time is not None else None
+        self._last_time = now
+
+        pids = psutil.pids()
+        alive = set(pids)
+        # 종료된 프로세스는 캐시에서 제거
+        for pid in [pid for pid in self._cache if pid not in alive]:
+            del self._cache[pid]
+
+        rows = []
+        for pid in pids:
+            tracked = self._cache.get(pid)
+            try:
+                if tracked is None or not tracked.process.is_running():
+                    # 처음 보거나 PID가 재사용된 새 프로세스면 기준값부터 다시 시작
+                    tracked = self._cache[pid] = _TrackedProcess(psutil.Process(pid))
+                rows.append(self._sample(pid, tracked, elapsed))
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            except psutil.NoSuchProcess:
+                self._cache.pop(pid, None)
+
+        # 정렬 기준별로 전체 정렬 대신 힙으로 상위 N개만 선택
+        top = {
+            'cpu': heapq.nlargest(self.top_n, rows, key=lambda row: row['cpu_percent']),
+            'memory': heapq.nlargest(self.top_n, rows, key=lambda row: row['rss_mb']),
+            'io': heapq.nlargest(self.top_n, rows, key=lambda row: row['io_bytes_per_sec']),
+        }
+        self._seq += 1
+        self._snapshot = {
+            'seq': self._seq,
+            'timestamp': time.time(),
+            'interval': self.interval,
+            'process_count': len(rows),
+            'top': top,
+        }
+        return self._snapshot
+
+    def top(self, sort='cpu', n=10):
+        """정렬 기준별 상위 n개 프로세스 (첫 갱신 전이면 None)"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return {
+            'seq': snapshot['seq'],
+            'timestamp': snapshot['timestamp'],
+            'interval': snapshot['interval'],
+            'process_count': snapshot['process_count'],
+            'sort': sort,
+            'processes': snapshot['top'][sort][:n],
+        }
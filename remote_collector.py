@@ -0,0 +1,258 @@
+import asyncio
+import json
+import threading
+import time
+
+from sample_codec import MIME_TYPE, decode_batch
+from sample_store import metrics_from_row
+
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+DEFAULT_AGENT_PORT = 5001
+DEFAULT_AGENT_PATH = '/api/metrics'
+DEFAULT_BATCH_PATH = '/api/samples'
+
+
+class BatchNotSupported(Exception):
+    """배치 엔드포인트가 없는 이전 에이전트 (Metrics.py 단독 실행 등)"""
+
+
+def is_remote(server):
+    """포트가 지정되었거나 로컬이 아닌 호스트는 에이전트에서 원격 수집"""
+    return 'port' in server or server.get('host', 'localhost') not in LOCAL_HOSTS
+
+
+class HostConnection:
+    """호스트 하나에 대한 keep-alive HTTP/1.1 연결 (요청마다 재연결하지 않음)"""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    async def get(self, path, accept='application/json'):
+        reused = self._writer is not None
+        try:
+            if not reused:
+                await asyncio.wait_for(self._connect(), self.timeout)
+            return await asyncio.wait_for(self._request(path, accept), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            # 서버가 유휴 연결을 닫은 경우 한 번만 새 연결로 재시도
+            await asyncio.wait_for(self._connect(), self.timeout)
+            return await asyncio.wait_for(self._request(path, accept), self.timeout)
+        except BaseException:
+            # 타임아웃 등으로 응답 경계를 알 수 없으면 연결을 버림
+            self.close()
+            raise
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def _request(self, path, accept):
+        self._writer.write((
+            f'GET {path} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            'Connection: keep-alive\r\n'
+            f'Accept: {accept}\r\n\r\n'
+        ).encode('latin-1'))
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by peer')
+        version, status = status_line.split()[:2]
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close' and version != b'HTTP/1.0'
+        if 'content-length' in headers:
+            body = await self._reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked()
+        else:
+            body = await self._reader.read()
+            keep_alive = False
+        if not keep_alive:
+            self.close()
+        return int(status), headers, body
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self._reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await self._reader.readline()
+                return b''.join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readline()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+class RemoteCollector:
+    """config/servers.json 의 원격 서버 에이전트를 동시에 폴링하는 수집기
+
+    호스트마다 독립된 코루틴과 keep-alive 연결을 사용하므로 느리거나 죽은
+    호스트가 다른 호스트의 수집 주기를 막지 않는다. 실패 시 지수 백오프.
+
+    에이전트(agent.py)에서는 batch_interval마다 마지막으로 받은 순번 이후의 샘플을
+    압축된 배치로 가져온다. 배치를 지원하지 않는 에이전트는 샘플마다 /api/metrics를 폴링한다.
+    """
+
+    def __init__(self, servers, interval=1.0, timeout=2.0, max_backoff=60,
+                 max_concurrency=200, on_metrics=None, batch_interval=10.0):
+        self.servers = {
+            server_id: server for server_id, server in servers.items() if is_remote(server)
+        }
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self.on_metrics = on_metrics
+        self.batch_interval = batch_interval
+        self._status = {
+            server_id: {'status': 'unknown', 'failures': 0} for server_id in self.servers
+        }
+        self._latest = {}
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None or not self.servers:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_until_complete, args=(self._main(),),
+                name='remote-collector', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(lambda: self._stop_event.set())
+        self._thread.join()
+        self._thread = None
+
+    def latest(self, server_id):
+        """서버의 최근 메트릭 (수집된 적이 없으면 None)"""
+        return self._latest.get(server_id)
+
+    def status(self, server_id):
+        return dict(self._status.get(server_id, {'status': 'local'}))
+
+    async def _main(self):
+        self._stop_event = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._poll(server_id)) for server_id in self.servers]
+        await self._stop_event.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_latest(self, connection, server):
+        code, _, body = await connection.get(server.get('path', DEFAULT_AGENT_PATH))
+        if code != 200:
+            raise ConnectionError(f'HTTP {code}')
+        return [json.loads(body)], False
+
+    async def _fetch_batch(self, connection, server, status):
+        """마지막으로 받은 순번 이후의 샘플을 배치로 가져옴 -> (샘플 목록, 남은 샘플 여부)"""
+        path = server.get('batch_path', DEFAULT_BATCH_PATH)
+        since = status.get('next_seq')
+        if since is not None:
+            path = f'{path}?since={since}'
+        code, headers, body = await connection.get(path, accept=MIME_TYPE)
+        if code == 404:
+            raise BatchNotSupported()
+        if code != 200:
+            raise ConnectionError(f'HTTP {code}')
+        if headers.get('content-type', '').startswith(MIME_TYPE):
+            batch = decode_batch(body)
+        else:
+            batch = json.loads(body)
+
+        known_start = status.get('agent_started_at')
+        status['agent_started_at'] = batch['started_at']
+        if known_start is not None and known_start != batch['started_at']:
+            # 에이전트가 재시작되어 순번이 0부터 다시 시작됨
+            status['agent_restarts'] = status.get('agent_restarts', 0) + 1
+            status['next_seq'] = 0
+            return [], True
+
+        if since is not None and batch['first_seq'] > since:
+            # 연결이 끊긴 동안 에이전트 버퍼에서 밀려난 샘플
+            status['lost_samples'] = status.get('lost_samples', 0) + batch['first_seq'] - since
+        status['next_seq'] = batch['first_seq'] + len(batch['rows'])
+        status['batch_bytes'] = len(body)
+        samples = [metrics_from_row(batch['columns'], row) for row in batch['rows']]
+        return samples, status['next_seq'] < batch['head_seq']
+
+    async def _poll(self, server_id):
+        server = self.servers[server_id]
+        connection = HostConnection(
+            server['host'], server.get('port', DEFAULT_AGENT_PORT), self.timeout
+        )
+        status = self._status[server_id]
+        status['protocol'] = server.get('protocol', 'batch')
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    async with self._semaphore:
+                        if status['protocol'] == 'batch':
+                            samples, more = await self._fetch_batch(connection, server, status)
+                        else:
+                            samples, more = await self._fetch_latest(connection, server)
+                except BatchNotSupported:
+                    status['protocol'] = 'poll'
+                    continue
+                except Exception as e:
+                    status['failures'] += 1
+                    status['status'] = 'down'
+                    status['last_error'] = str(e) or type(e).__name__
+                    backoff = min(self.max_backoff, self.interval * 2 ** status['failures'])
+                    next_run = loop.time() + backoff
+                else:
+                    for metrics in samples:
+                        metrics['server_id'] = server_id
+                        metrics.setdefault('timestamp', time.time())
+                        if self.on_metrics is not None:
+                            self.on_metrics(metrics)
+                    if samples:
+                        self._latest[server_id] = samples[-1]
+                        status['last_success'] = samples[-1]['timestamp']
+                    status.update({
+                        'status': 'up',
+                        'failures': 0,
+                        'latency_ms': round((time.perf_counter() - started) * 1000, 2)
+                    })
+                    # 에이전트에 남은 샘플이 있으면 바로 이어서 가져옴
+                    if status['protocol'] == 'batch':
+                        interval = self.batch_interval
+                    else:
+                        interval = self.interval
+                    next_run = loop.time() if more else max(next_run + interval, loop.time())
+                await asyncio.sleep(next_run - loop.time())
+        finally:
+            connection.close()
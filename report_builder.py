@@ -0,0 +1,219 @@
+import csv
+import hashlib
+import io
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from report_stats import SUMMARY_HEADERS, compute_summary, summary_rows
+from rollups import ROLLUP_RECORD_FORMAT, TIERS, rollup_headers
+from segment_store import SegmentStore
+
+
+# 리포트 생성 공통 로직 (수집기와 리포트 작업 프로세스에서 함께 사용)
+
+REPORT_HEADERS = [
+    'datetime',
+    'cpu_usage',
+    'memory_total_gb',
+    'memory_used_gb',
+    'memory_usage_percent',
+    'disk_read_iops',
+    'disk_write_iops'
+]
+
+# summary: 구간 전체를 메트릭별 통계 한 행으로 요약
+RESOLUTIONS = ('raw',) + tuple(name for name, _, _ in TIERS) + ('summary',)
+# 주간/월간 리포트는 기본적으로 1시간 롤업 사용 (월간 약 720행)
+DEFAULT_REPORT_RESOLUTIONS = {
+    'daily': 'raw',
+    'weekly': '1h',
+    'monthly': '1h'
+}
+
+# CSV 스트리밍 시 한 번에 내보내는 행 수
+CSV_CHUNK_ROWS = 500
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+def resolve_resolution(report_type, resolution=None):
+    resolution = resolution or DEFAULT_REPORT_RESOLUTIONS.get(report_type)
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    return resolution
+
+
+def report_range(date, report_type):
+    """리포트 유형별 [시작, 끝) 구간 (epoch 초)"""
+    if report_type == 'daily':
+        start = datetime.strptime(date, '%Y-%m-%d')
+        end = start + timedelta(days=1)
+    elif report_type == 'weekly':
+        # 선택된 날짜를 기준으로 일주일 데이터 필터링
+        date_obj = datetime.strptime(date, '%Y-%m-%d')
+        start = date_obj - timedelta(days=date_obj.weekday())
+        end = start + timedelta(days=7)
+    elif report_type == 'monthly':
+        # 선택된 월의 데이터 필터링
+        start = datetime.strptime(date[:7], '%Y-%m')
+        end = (start + timedelta(days=32)).replace(day=1)
+    else:
+        raise ValueError(f"Unknown report type: {report_type}")
+    return start.timestamp(), end.timestamp()
+
+
+def format_row(row):
+    """저장소 행을 CSV 행으로 변환"""
+    return [datetime.fromtimestamp(row[0]).strftime('%Y-%m-%d %H:%M:%S')] + [
+        round(value, 2) for value in row[1:]
+    ]
+
+
+def format_rollup_row(row):
+    """롤업 행을 CSV 행으로 변환"""
+    return [datetime.fromtimestamp(row[0]).strftime('%Y-%m-%d %H:%M:%S'), row[1]] + [
+        round(value, 2) for value in row[2:]
+    ]
+
+
+def csv_chunks(rows, resolution='raw', chunk_rows=CSV_CHUNK_ROWS):
+    """행을 chunk_rows 단위의 문자열 청크로 변환하는 제너레이터"""
+    if resolution == 'raw':
+        headers, formatter = REPORT_HEADERS, format_row
+    elif resolution == 'summary':
+        headers, formatter = SUMMARY_HEADERS, list
+    else:
+        headers, formatter = rollup_headers(), format_rollup_row
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(formatter(row))
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def tee_to_file(chunks, file_path, entry, on_complete=None):
+    """청크를 그대로 전달하면서 파일에도 기록
+
+    완료된 경우에만 최종 파일로 이동하고 entry에 행 수/크기/체크섬을 채워 on_complete 호출.
+    """
+    partial_path = file_path.with_suffix('.partial')
+    completed = False
+    digest = hashlib.sha256()
+    size = 0
+    lines = 0
+    try:
+        with open(partial_path, 'w', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                data = chunk.encode('utf-8')
+                digest.update(data)
+                size += len(data)
+                lines += chunk.count('\n')
+                yield chunk
+        os.replace(partial_path, file_path)
+        completed = True
+    finally:
+        if not completed:
+            partial_path.unlink(missing_ok=True)
+    entry.update({'rows': max(lines - 1, 0), 'size': size, 'checksum': digest.hexdigest()})
+    if on_complete is not None:
+        on_complete(entry)
+
+
+def file_chunks(file_path, chunk_size=65536):
+    with open(file_path, 'r', newline='') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            yield chunk
+
+
+def new_report_path(log_dir, report_type):
+    """report_<type>_<YYYYmmdd_HHMMSS>_<suffix>.csv
+
+    같은 초에 여러 리포트(스트리밍과 작업 프로세스 동시 생성 포함)가 만들어져도
+    서로 덮어쓰지 않도록 임의 접미사를 붙이고, 기존 파일과 겹치면 다시 고른다.
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    while True:
+        file_path = Path(log_dir) / f'report_{report_type}_{timestamp}_{uuid.uuid4().hex[:12]}.csv'
+        if not file_path.exists():
+            return file_path
+
+
+def new_report_entry(file_path, date, report_type, resolution):
+    start, end = report_range(date, report_type)
+    return {
+        'id': file_path.stem,
+        'type': report_type,
+        'report_date': date,
+        'resolution': resolution,
+        'range_start': start,
+        'range_end': end,
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'generated_at': time.time()
+    }
+
+
+class ReportSource:
+    """원본 세그먼트와 롤업 세그먼트를 읽기 전용으로 여는 리포트 데이터 소스"""
+
+    def __init__(self, data_path, thresholds=None):
+        data_path = Path(data_path)
+        self.data_path = data_path
+        self.thresholds = thresholds
+        self.stores = {'raw': SegmentStore(data_path / 'metrics')}
+        for name, _, partition in TIERS:
+            self.stores[name] = SegmentStore(
+                data_path / 'rollups' / name, ROLLUP_RECORD_FORMAT, partition
+            )
+
+    def rows(self, resolution, start, end):
+        if resolution == 'summary':
+            summary = compute_summary(self.data_path, start, end, self.thresholds)
+            return summary_rows(summary) if summary is not None else iter(())
+        return self.stores[resolution].rows(start, end)
+
+
+def build_report_file(data_dir, log_dir, date, report_type, resolution=None,
+                      progress=None, cancel_event=None, thresholds=None):
+    """리포트 파일을 생성하고 카탈로그 항목 반환 (데이터가 없으면 None)
+
+    별도 프로세스에서 실행할 수 있도록 수집기 상태 없이 디스크의 세그먼트만 읽는다.
+    progress(Value)에는 처리한 구간 비율(0~1)을 기록하고, cancel_event가 설정되면 중단한다.
+    """
+    if progress is not None:
+        progress.value = 0.0
+    resolution = resolve_resolution(report_type, resolution)
+    start, end = report_range(date, report_type)
+    rows = iter(ReportSource(data_dir, thresholds).rows(resolution, start, end))
+    first_row = next(rows, None)
+    if first_row is None:
+        return None
+
+    def tracked_rows():
+        yield first_row
+        for count, row in enumerate(rows, 1):
+            if count % CSV_CHUNK_ROWS == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled()
+                if progress is not None:
+                    progress.value = min(1.0, (row[0] - start) / (end - start))
+            yield row
+
+    file_path = new_report_path(log_dir, report_type)
+    entry = new_report_entry(file_path, date, report_type, resolution)
+    for _ in tee_to_file(csv_chunks(tracked_rows(), resolution), file_path, entry):
+        pass
+    if progress is not None:
+        progress.value = 1.0
+    return entry
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    report_date TEXT,
+    resolution TEXT,
+    range_start REAL,
+    range_end REAL,
+    rows INTEGER,
+    size INTEGER,
+    checksum TEXT,
+    created_at TEXT NOT NULL,
+    generated_at REAL
+);
+CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at);
+CREATE INDEX IF NOT EXISTS reports_lookup ON reports (type, report_date, resolution);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+LIST_COLUMNS = (
+    'id', 'type', 'report_date', 'resolution', 'range_start', 'range_end',
+    'rows', 'size', 'checksum', 'created_at'
+)
+
+
+def file_metadata(path):
+    """CSV 파일의 크기, 행 수(헤더 제외), SHA-256 체크섬"""
+    digest = hashlib.sha256()
+    size = 0
+    lines = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+            size += len(block)
+            lines += block.count(b'\n')
+    return {'size': size, 'rows': max(lines - 1, 0), 'checksum': digest.hexdigest()}
+
+
+class ReportCatalog:
+    """생성된 리포트의 SQLite 색인
+
+    목록 조회 때마다 디렉터리를 glob하지 않고, 디렉터리 mtime이 바뀐
+    경우에만 다시 스캔해 외부에서 추가/삭제된 파일을 반영한다.
+    DB(와 저널)가 리포트 디렉터리 안에 있으면 커밋할 때마다 mtime이 바뀌므로
+    db_path는 리포트 디렉터리 밖에 둔다.
+    """
+
+    def __init__(self, directory, db_path):
+        self.directory = Path(directory)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value))
+        )
+
+    def _bump_version(self):
+        self._set_meta('version', int(self._meta('version', 0)) + 1)
+
+    def version(self):
+        """목록이 바뀔 때마다 증가하는 값 (ETag 용)"""
+        with self._lock:
+            self._sync()
+            return int(self._meta('version', 0))
+
+    def _sync(self):
+        # 디렉터리 mtime이 그대로면 파일 추가/삭제가 없었으므로 스캔 생략
+        mtime = str(os.stat(self.directory).st_mtime_ns)
+        if self._meta('dir_mtime') == mtime:
+            return
+
+        on_disk = {path.stem: path for path in self.directory.glob('report_*.csv')}
+        known = {row['id'] for row in self._conn.execute('SELECT id FROM reports')}
+        changed = False
+
+        for report_id in known - on_disk.keys():
+            self._conn.execute('DELETE FROM reports WHERE id = ?', (report_id,))
+            changed = True
+
+        for report_id in on_disk.keys() - known:
+            # 카탈로그 밖에서 생긴 파일은 파일명(report_type_timestamp[_suffix])으로 등록
+            parts = report_id.split('_')
+            if len(parts) < 4:
+                continue
+            try:
+                created_at = datetime.strptime('_'.join(parts[2:4]), '%Y%m%d_%H%M%S')
+            except ValueError:
+                continue
+            entry = {
+                'id': report_id,
+                'type': parts[1],
+                'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'generated_at': created_at.timestamp()
+            }
+            entry.update(file_metadata(on_disk[report_id]))
+            self._insert(entry)
+            changed = True
+
+        if changed:
+            self._bump_version()
+        self._set_meta('dir_mtime', mtime)
+        self._conn.commit()
+
+    def _insert(self, entry):
+        columns = ', '.join(entry)
+        placeholders = ', '.join('?' for _ in entry)
+        self._conn.execute(
+            f'INSERT OR REPLACE INTO reports ({columns}) VALUES ({placeholders})',
+            tuple(entry.values())
+        )
+
+    def add(self, entry):
+        """새로 생성된 리포트 등록"""
+        with self._lock:
+            self._insert(entry)
+            self._bump_version()
+            # 직접 등록했으므로 이번 디렉터리 변경은 다시 스캔할 필요 없음
+            self._set_meta('dir_mtime', os.stat(self.directory).st_mtime_ns)
+            self._conn.commit()
+
+    def list(self, limit=None, offset=0):
+        """최신순 리포트 목록"""
+        with self._lock:
+            self._sync()
+            rows = self._conn.execute(
+                f'SELECT {", ".join(LIST_COLUMNS)} FROM reports '
+                'ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?',
+                (-1 if limit is None else limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            self._sync()
+            return self._conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+
+    def get(self, report_id):
+        with self._lock:
+            self._sync()
+            row = self._conn.execute('SELECT * FROM reports WHERE id = ?', (report_id,)).fetchone()
+        return dict(row) if row else None
+
+    def find(self, report_type, report_date, resolution):
+        """같은 조건으로 이미 생성된, 데이터가 완결된 리포트 반환
+
+        구간이 끝난 뒤에 생성된 리포트만 재사용한다 (진행 중인 구간은 데이터가 계속 늘어남).
+        """
+        with self._lock:
+            self._sync()
+            row = self._conn.execute(
+                'SELECT * FROM reports WHERE type = ? AND report_date = ? AND resolution = ? '
+                'AND generated_at >= range_end ORDER BY created_at DESC LIMIT 1',
+                (report_type, report_date, resolution)
+            ).fetchone()
+        return dict(row) if row else None
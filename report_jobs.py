@@ -0,0 +1,187 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from instrumentation import REPORT_SECONDS
+from report_builder import ReportCancelled, build_report_file, report_range, resolve_resolution
+
+
+# 수집기 프로세스에는 샘플러/저널/RPC 스레드가 돌고 있으므로 fork하지 않음
+# (fork 시점에 다른 스레드가 잡고 있던 락 때문에 자식이 멈출 수 있음)
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class ReportJob:
+    """리포트 생성 작업 하나의 상태"""
+
+    def __init__(self, date, report_type, resolution):
+        self.id = uuid.uuid4().hex
+        self.key = (date, report_type, resolution)
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.finished_at = None
+        self.entry = None
+        self.error = None
+        self.future = None
+        # 워커와 공유하는 진행률 (-1: 시작 전) / 취소 플래그
+        self.progress = None
+        self.cancel_event = None
+
+    def _progress_value(self):
+        if self.progress is None:
+            return -1.0
+        try:
+            return self.progress.value
+        except Exception:
+            return -1.0
+
+    def to_dict(self):
+        date, report_type, resolution = self.key
+        progress = self._progress_value()
+        if self.status == 'queued' and progress >= 0:
+            self.status = 'running'
+        return {
+            'id': self.id,
+            'date': date,
+            'type': report_type,
+            'resolution': resolution,
+            'status': self.status,
+            'progress': 1.0 if self.status == 'done' else round(max(0.0, progress), 3),
+            'report_id': self.entry['id'] if self.entry else None,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+
+
+class ReportJobManager:
+    """프로세스 풀에서 리포트를 비동기로 생성하는 작업 큐
+
+    같은 (날짜, 유형, 해상도) 요청은 진행 중인 작업이나 완결된 결과를 재사용한다.
+    """
+
+    def __init__(self, data_dir, log_dir, catalog, max_workers=2, max_jobs=200, thresholds=None):
+        self.data_dir = Path(data_dir)
+        self.log_dir = Path(log_dir)
+        self.catalog = catalog
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.thresholds = thresholds
+        self._jobs = OrderedDict()
+        self._by_key = {}
+        self._executor = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def map(self, fn, iterable):
+        """리포트 작업과 같은 프로세스 풀에서 fn을 병렬 실행한 결과 목록 (요약 통계 집계용)"""
+        with self._lock:
+            self._ensure_pool()
+        return list(self._executor.map(fn, iterable))
+
+    def _ensure_pool(self):
+        # 첫 작업이 들어올 때 워커 프로세스 생성
+        if self._executor is None:
+            context = multiprocessing.get_context(START_METHOD)
+            self._manager = context.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def _is_reusable(self, job):
+        if job.status in ACTIVE_STATUSES:
+            return True
+        if job.status != 'done' or job.entry is None:
+            return False
+        # 구간이 끝난 뒤 생성된 결과만 재사용 (진행 중인 구간은 데이터가 계속 늘어남)
+        return (
+            job.entry['generated_at'] >= job.entry['range_end']
+            and (self.log_dir / f"{job.entry['id']}.csv").exists()
+        )
+
+    def _register(self, job):
+        self._jobs[job.id] = job
+        self._by_key[job.key] = job.id
+        # 오래된 완료 작업부터 정리
+        while len(self._jobs) > self.max_jobs:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in ACTIVE_STATUSES:
+                break
+            del self._jobs[oldest_id]
+            if self._by_key.get(oldest.key) == oldest_id:
+                del self._by_key[oldest.key]
+
+    def submit(self, date, report_type, resolution=None):
+        """작업을 등록하고 ReportJob 반환 (잘못된 인자는 ValueError)"""
+        resolution = resolve_resolution(report_type, resolution)
+        report_range(date, report_type)
+        key = (date, report_type, resolution)
+
+        with self._lock:
+            job = self._jobs.get(self._by_key.get(key))
+            if job is not None and self._is_reusable(job):
+                return job
+
+            job = ReportJob(date, report_type, resolution)
+            cached = self.catalog.find(report_type, date, resolution)
+            if cached is not None and (self.log_dir / f"{cached['id']}.csv").exists():
+                job.status = 'done'
+                job.entry = cached
+                job.finished_at = time.time()
+                self._register(job)
+                return job
+
+            self._ensure_pool()
+            job.progress = self._manager.Value('d', -1.0)
+            job.cancel_event = self._manager.Event()
+            job.future = self._executor.submit(
+                build_report_file, str(self.data_dir), str(self.log_dir),
+                date, report_type, resolution, job.progress, job.cancel_event, self.thresholds
+            )
+            self._register(job)
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _finish(self, job, future):
+        job.finished_at = time.time()
+        if future.cancelled():
+            job.status = 'cancelled'
+            return
+        error = future.exception()
+        if isinstance(error, ReportCancelled):
+            job.status = 'cancelled'
+        elif error is not None:
+            job.status = 'failed'
+            job.error = str(error)
+        elif future.result() is None:
+            job.status = 'empty'
+            job.error = 'No data available'
+        else:
+            job.entry = future.result()
+            self.catalog.add(job.entry)
+            job.status = 'done'
+            # 대기열에 있던 시간을 포함한 작업 완료까지의 시간
+            date, report_type, resolution = job.key
+            REPORT_SECONDS.observe(job.finished_at - job.created_at, report_type, resolution, 'job')
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """작업 취소 (대기 중이면 즉시, 실행 중이면 다음 청크에서 중단)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status in ACTIVE_STATUSES and job.future is not None:
+            if not job.future.cancel():
+                job.cancel_event.set()
+        return job
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._manager.shutdown()
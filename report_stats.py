@@ -0,0 +1,243 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from sample_store import COLUMN_NAMES
+from segment_store import RECORD_DTYPE, map_range, partition_keys
+
+
+# 리포트 요약 통계: 원본 세그먼트를 일 단위로 벡터화 집계한 뒤 병합
+
+METRIC_NAMES = COLUMN_NAMES[1:]
+
+PERCENTILES = (50, 90, 99)
+
+SUMMARY_HEADERS = [
+    'metric', 'samples', 'min', 'max', 'mean', 'stddev', 'p50', 'p90', 'p99',
+    'threshold', 'seconds_above'
+] + [f'hour_{hour:02d}_mean' for hour in range(24)] + ['hourly_histogram_edges'] + [
+    f'hour_{hour:02d}_histogram' for hour in range(24)
+]
+
+# 알림 규칙의 메트릭 경로 -> 저장소 컬럼
+RULE_COLUMNS = {
+    'cpu': 'cpu_usage',
+    'memory.usage_percent': 'memory_usage_percent',
+}
+
+# 샘플 간격이 중앙값의 이 배수보다 길면 수집 공백으로 보고 시간에 넣지 않음
+MAX_GAP_FACTOR = 5
+
+PERCENT_METRICS = ('cpu_usage', 'memory_usage_percent')
+
+
+def _histogram_edges(name):
+    # 백분율 지표는 0.05 단위의 균등 구간을 쓰고, 나머지는 구간 폭이 약 0.9%(10^(12/3000))인 로그 구간을 씀
+    if name in PERCENT_METRICS:
+        return np.linspace(0.0, 100.0, 2001)
+    return np.concatenate(([0.0], np.geomspace(1e-3, 1e9, 3001)))
+
+
+def _hourly_histogram_edges(name):
+    # 리포트에 싣는 시간대별 히스토그램은 백분율 10% 단위, 나머지는 10배 단위의 굵은 구간
+    if name in PERCENT_METRICS:
+        return np.linspace(0.0, 100.0, 11)
+    return np.concatenate(([0.0], np.logspace(-3, 9, 13)))
+
+
+HISTOGRAM_EDGES = [_histogram_edges(name) for name in METRIC_NAMES]
+HOURLY_HISTOGRAM_EDGES = [_hourly_histogram_edges(name) for name in METRIC_NAMES]
+
+
+def thresholds_from_rules(rules):
+    """알림 규칙에서 메트릭별 임계값(above) 추출"""
+    thresholds = {}
+    for rule in rules:
+        column = RULE_COLUMNS.get(rule.get('metric'))
+        if column is not None and 'above' in rule:
+            thresholds[column] = min(float(rule['above']), thresholds.get(column, np.inf))
+    return thresholds
+
+
+def read_segment(path, start=None, end=None):
+    """세그먼트 파일을 mmap으로 매핑해 [start, end) 구간 구조화 배열 뷰 반환"""
+    try:
+        return map_range(path, RECORD_DTYPE, start, end)
+    except FileNotFoundError:
+        return np.empty(0, dtype=RECORD_DTYPE)
+
+
+def day_partial(segment_path, day_key, start, end, thresholds):
+    """하루치 세그먼트의 부분 집계 (병합 가능한 형태, 데이터가 없으면 None)"""
+    records = read_segment(segment_path, start, end)
+    if not len(records):
+        return None
+    timestamps = records['timestamp']
+    values = np.stack([records[name].astype(np.float64) for name in METRIC_NAMES], axis=1)
+    count = len(records)
+
+    # 샘플별 유지 시간 (다음 샘플까지, 공백은 제외)
+    if count > 1:
+        gaps = np.diff(timestamps)
+        interval = float(np.median(gaps))
+        durations = np.append(gaps, interval)
+        durations[durations > interval * MAX_GAP_FACTOR] = 0.0
+    else:
+        durations = np.zeros(1)
+    limits = np.array([thresholds.get(name, np.inf) for name in METRIC_NAMES])
+    above = ((values > limits) * durations[:, None]).sum(axis=0)
+
+    # 시간대(0~23시)별 합계/최댓값, 타임스탬프가 정렬되어 있으므로 reduceat 사용
+    day_start = datetime.strptime(day_key, '%Y-%m-%d').timestamp()
+    hours = np.clip(((timestamps - day_start) // 3600).astype(np.int64), 0, 23)
+    hourly_count = np.bincount(hours, minlength=24)
+    hourly_sum = np.zeros((24, len(METRIC_NAMES)))
+    hourly_max = np.full((24, len(METRIC_NAMES)), -np.inf)
+    present = np.flatnonzero(hourly_count)
+    offsets = np.searchsorted(hours, present)
+    hourly_sum[present] = np.add.reduceat(values, offsets, axis=0)
+    hourly_max[present] = np.maximum.reduceat(values, offsets, axis=0)
+    # 시간대별 히스토그램: (시간대, 구간) 쌍을 한 인덱스로 합쳐 bincount (범위 밖은 양 끝 구간)
+    hourly_hist = []
+    for i, edges in enumerate(HOURLY_HISTOGRAM_EDGES):
+        bins = len(edges) - 1
+        index = np.clip(np.searchsorted(edges, values[:, i], side='right') - 1, 0, bins - 1)
+        hourly_hist.append(np.bincount(hours * bins + index, minlength=24 * bins).reshape(24, bins))
+
+    mean = values.mean(axis=0)
+    return {
+        'count': count,
+        'min': values.min(axis=0),
+        'max': values.max(axis=0),
+        'mean': mean,
+        'm2': ((values - mean) ** 2).sum(axis=0),
+        'above': above,
+        'hist': [
+            np.histogram(np.clip(values[:, i], edges[0], edges[-1]), bins=edges)[0]
+            for i, edges in enumerate(HISTOGRAM_EDGES)
+        ],
+        'hourly_count': hourly_count,
+        'hourly_sum': hourly_sum,
+        'hourly_max': hourly_max,
+        'hourly_hist': hourly_hist,
+    }
+
+
+def merge_partials(a, b):
+    """부분 집계 두 개를 병합 (평균/분산은 Chan 병렬 알고리즘)"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    count = a['count'] + b['count']
+    delta = b['mean'] - a['mean']
+    return {
+        'count': count,
+        'min': np.minimum(a['min'], b['min']),
+        'max': np.maximum(a['max'], b['max']),
+        'mean': a['mean'] + delta * b['count'] / count,
+        'm2': a['m2'] + b['m2'] + delta ** 2 * a['count'] * b['count'] / count,
+        'above': a['above'] + b['above'],
+        'hist': [x + y for x, y in zip(a['hist'], b['hist'])],
+        'hourly_count': a['hourly_count'] + b['hourly_count'],
+        'hourly_sum': a['hourly_sum'] + b['hourly_sum'],
+        'hourly_max': np.maximum(a['hourly_max'], b['hourly_max']),
+        'hourly_hist': [x + y for x, y in zip(a['hourly_hist'], b['hourly_hist'])],
+    }
+
+
+def _histogram_percentile(counts, edges, q, lower, upper):
+    # 누적 개수에서 순위가 속한 구간을 찾고 구간 안에서 선형 보간
+    cumulative = np.cumsum(counts)
+    rank = q / 100.0 * cumulative[-1]
+    index = min(int(np.searchsorted(cumulative, rank, side='left')), len(counts) - 1)
+    before = cumulative[index - 1] if index else 0
+    fraction = (rank - before) / counts[index] if counts[index] else 0.0
+    value = edges[index] + fraction * (edges[index + 1] - edges[index])
+    return float(np.clip(value, lower, upper))
+
+
+def finalize(partial, thresholds):
+    """병합된 부분 집계를 메트릭별 요약 통계로 변환"""
+    count = partial['count']
+    hourly_count = partial['hourly_count']
+    metrics = {}
+    for i, name in enumerate(METRIC_NAMES):
+        lower, upper = float(partial['min'][i]), float(partial['max'][i])
+        stats = {
+            'min': lower,
+            'max': upper,
+            'mean': float(partial['mean'][i]),
+            'stddev': float(np.sqrt(partial['m2'][i] / count)),
+            'threshold': thresholds.get(name),
+            'seconds_above': float(partial['above'][i]) if name in thresholds else None,
+            'hourly_histogram_edges': HOURLY_HISTOGRAM_EDGES[i].tolist(),
+            'hourly': [
+                {
+                    'hour': hour,
+                    'samples': int(hourly_count[hour]),
+                    'mean': float(partial['hourly_sum'][hour, i] / hourly_count[hour]),
+                    'max': float(partial['hourly_max'][hour, i]),
+                    'histogram': partial['hourly_hist'][i][hour].tolist(),
+                }
+                for hour in range(24) if hourly_count[hour]
+            ],
+        }
+        for q in PERCENTILES:
+            stats[f'p{q}'] = _histogram_percentile(
+                partial['hist'][i], HISTOGRAM_EDGES[i], q, lower, upper
+            )
+        metrics[name] = stats
+    return {'samples': int(count), 'metrics': metrics}
+
+
+def _partial_for_day(args):
+    return day_partial(*args)
+
+
+def compute_summary(data_dir, start, end, thresholds=None, pool=None):
+    """[start, end) 구간 요약 통계 (데이터가 없으면 None)
+
+    일 파티션별 부분 집계를 여러 날이면 pool(ReportJobManager)의 작업 프로세스에서 병렬로 계산한다.
+    """
+    thresholds = thresholds or {}
+    directory = Path(data_dir) / 'metrics'
+    tasks = [
+        (str(directory / f'{key}.seg'), key, start, end, thresholds)
+        for key in partition_keys(start, end, 'day')
+        if (directory / f'{key}.seg').exists()
+    ]
+    if pool is not None and len(tasks) > 1:
+        partials = pool.map(_partial_for_day, tasks)
+    else:
+        partials = [_partial_for_day(task) for task in tasks]
+
+    merged = None
+    for partial in partials:
+        merged = merge_partials(merged, partial)
+    if merged is None:
+        return None
+    summary = finalize(merged, thresholds)
+    summary.update({'range_start': start, 'range_end': end, 'days': len(tasks)})
+    return summary
+
+
+def summary_rows(summary):
+    """요약 통계를 SUMMARY_HEADERS 순서의 CSV 행으로 변환"""
+    for name, stats in summary['metrics'].items():
+        hourly = {item['hour']: item for item in stats['hourly']}
+        # 히스토그램은 구간별 개수를 '|'로 이어 한 칸에 기록 (구간 경계는 hourly_histogram_edges)
+        yield [
+            name, summary['samples'],
+            round(stats['min'], 2), round(stats['max'], 2),
+            round(stats['mean'], 2), round(stats['stddev'], 2),
+            round(stats['p50'], 2), round(stats['p90'], 2), round(stats['p99'], 2),
+            '' if stats['threshold'] is None else stats['threshold'],
+            '' if stats['seconds_above'] is None else round(stats['seconds_above'], 1),
+        ] + [round(hourly[hour]['mean'], 2) if hour in hourly else '' for hour in range(24)] + [
+            '|'.join(f'{edge:g}' for edge in stats['hourly_histogram_edges'])
+        ] + [
+            '|'.join(map(str, hourly[hour]['histogram'])) if hour in hourly else ''
+            for hour in range(24)
+        ]
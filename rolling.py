@@ -0,0 +1,86 @@
+import math
+from collections import deque
+
+
+class RollingWindow:
+    """시간 기반 슬라이딩 윈도우 집계 (합계/개수/최소/최대/EWMA, 샘플당 상각 O(1))"""
+
+    def __init__(self, duration, ewma=False):
+        self.duration = duration
+        self._samples = deque()
+        # 최소/최대 후보만 유지하는 단조 덱
+        self._min = deque()
+        self._max = deque()
+        self.sum = 0.0
+        # ewma=True이면 윈도우 길이를 시간 상수로 하는 EWMA (load average와 같은 방식)
+        self._ewma_enabled = ewma
+        self.ewma = None
+        self._last_time = None
+
+    def add(self, t, value):
+        self._samples.append((t, value))
+        self.sum += value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((t, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((t, value))
+
+        if self._ewma_enabled:
+            if self.ewma is None:
+                self.ewma = value
+            else:
+                alpha = 1 - math.exp(-(t - self._last_time) / self.duration)
+                self.ewma += alpha * (value - self.ewma)
+        self._last_time = t
+
+        self.expire(t)
+
+    def expire(self, now):
+        """윈도우 밖으로 밀려난 샘플 제거"""
+        cutoff = now - self.duration
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            self.sum -= samples.popleft()[1]
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+        if not samples:
+            # 부동소수점 누적 오차 초기화
+            self.sum = 0.0
+
+    @property
+    def count(self):
+        return len(self._samples)
+
+    @property
+    def mean(self):
+        return self.sum / len(self._samples) if self._samples else 0
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else 0
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else 0
+
+
+class MultiWindow:
+    """여러 길이의 윈도우를 동시에 유지 (예: 1분/5분/15분)"""
+
+    def __init__(self, durations, ewma=False):
+        self.windows = {duration: RollingWindow(duration, ewma=ewma) for duration in durations}
+
+    def add(self, t, value):
+        for window in self.windows.values():
+            window.add(t, value)
+
+    def __getitem__(self, duration):
+        return self.windows[duration]
+
+    def means(self):
+        return {duration: window.mean for duration, window in self.windows.items()}
@@ -0,0 +1,175 @@
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sample_store import COLUMN_NAMES
+from segment_store import SegmentStore
+
+
+# 롤업 단계: (이름, 버킷 길이(초), 세그먼트 파티션 단위)
+TIERS = (
+    ('1m', 60, 'day'),
+    ('1h', 3600, 'month'),
+    ('1d', 86400, 'month'),
+)
+
+METRIC_NAMES = COLUMN_NAMES[1:]
+STATS = ('min', 'max', 'avg', 'p95')
+
+# 버킷 시작 시각(double) + 샘플 수(uint32) + 메트릭별 통계(float32)
+ROLLUP_RECORD_FORMAT = '<dI' + 'f' * (len(METRIC_NAMES) * len(STATS))
+
+
+def rollup_headers():
+    return ['datetime', 'samples'] + [
+        f'{metric}_{stat}' for metric in METRIC_NAMES for stat in STATS
+    ]
+
+
+class QuantileSketch:
+    """로그 스케일 버킷 히스토그램으로 분위수 추정 (상대 오차 약 1%, 메모리 제한)"""
+
+    GAMMA = 1.02
+    LOG_GAMMA = math.log(GAMMA)
+
+    def __init__(self):
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 1e-9:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.LOG_GAMMA)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q):
+        if not self.count:
+            return 0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # 버킷 (gamma^(k-1), gamma^k] 의 대표값
+                return 2 * self.GAMMA ** key / (self.GAMMA + 1)
+        return 2 * self.GAMMA ** max(self.buckets) / (self.GAMMA + 1)
+
+
+class _MetricStats:
+    __slots__ = ('count', 'sum', 'min', 'max', 'sketch')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+
+class RollupTier:
+    """한 해상도의 롤업 버킷을 샘플 단위로 갱신하고 닫힌 버킷을 세그먼트에 기록"""
+
+    def __init__(self, name, seconds, directory, partition):
+        self.name = name
+        self.seconds = seconds
+        self.store = SegmentStore(Path(directory) / name, ROLLUP_RECORD_FORMAT, partition)
+        last = self.store.last()
+        # 이미 기록된 버킷 이후의 샘플만 반영 (재시작 시 중복 기록 방지)
+        self.floor = self._bounds(last[0])[1] if last else None
+        self._start = None
+        self._end = None
+        self._bucket = None
+
+    def _bounds(self, ts):
+        # 일/시간 경계를 로컬 시간 기준으로 맞춤
+        dt = datetime.fromtimestamp(ts)
+        if self.seconds == 60:
+            start = dt.replace(second=0, microsecond=0)
+            end = start + timedelta(minutes=1)
+        elif self.seconds == 3600:
+            start = dt.replace(minute=0, second=0, microsecond=0)
+            end = start + timedelta(hours=1)
+        else:
+            start = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+            end = start + timedelta(days=1)
+        return start.timestamp(), end.timestamp()
+
+    def add(self, row):
+        ts = row[0]
+        if self.floor is not None and ts < self.floor:
+            return
+        if self._bucket is None or ts >= self._end:
+            self.flush()
+            self._start, self._end = self._bounds(ts)
+            self._bucket = [_MetricStats() for _ in METRIC_NAMES]
+        for stats, value in zip(self._bucket, row[1:]):
+            stats.add(value)
+
+    def flush(self):
+        """현재 버킷을 닫고 기록"""
+        if self._bucket is None:
+            return
+        record = [self._start, self._bucket[0].count]
+        for stats in self._bucket:
+            record.extend((
+                stats.min, stats.max, stats.sum / stats.count, stats.sketch.quantile(0.95)
+            ))
+        self.store.append(record)
+        self.floor = self._end
+        self._bucket = None
+
+    def rows(self, start=None, end=None):
+        return self.store.rows(start, end)
+
+
+class RollupManager:
+    """1분/1시간/1일 롤업 단계를 함께 관리"""
+
+    def __init__(self, directory):
+        self.tiers = {
+            name: RollupTier(name, seconds, directory, partition)
+            for name, seconds, partition in TIERS
+        }
+
+    def __getitem__(self, name):
+        return self.tiers[name]
+
+    def add(self, row):
+        for tier in self.tiers.values():
+            tier.add(row)
+
+    def replay_start(self):
+        """원본 세그먼트에서 다시 반영해야 하는 시작 시각 (None이면 전체)"""
+        floors = [tier.floor for tier in self.tiers.values()]
+        if None in floors:
+            return None
+        return min(floors)
+
+    def replay(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def prune(self, now, retention_days):
+        """단계별 보관 기간(일, 없거나 0이면 유지)이 지난 세그먼트 삭제 -> {단계: 삭제한 키 목록}"""
+        removed = {}
+        for name, tier in self.tiers.items():
+            days = retention_days.get(name)
+            if days:
+                keys = tier.store.prune(now - days * 86400)
+                if keys:
+                    removed[name] = keys
+        return removed
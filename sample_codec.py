@@ -0,0 +1,214 @@
+import struct
+
+
+# 에이전트 -> 중앙 수집기 샘플 배치 압축 형식 (표준 라이브러리만 사용)
+#
+# 헤더: magic, version, 컬럼 수, 행 수, 첫 행 순번, 에이전트 head 순번, 에이전트 시작 시각
+# 컬럼 이름: varint 길이 + 쉼표로 구분한 UTF-8
+# 타임스탬프: 마이크로초 정수의 delta-of-delta를 zigzag varint로 (일정 주기면 대부분 1~2바이트)
+# 값 컬럼: float32 비트 패턴을 직전 값과 XOR하는 Gorilla 방식 비트 스트림 (값이 같으면 1비트)
+#
+# 값 컬럼은 손실 없이 복원되고, 타임스탬프는 마이크로초 단위로 반올림된다.
+
+MIME_TYPE = 'application/x-monitor-samples'
+MAGIC = b'MSB1'
+VERSION = 1
+HEADER = struct.Struct('<4sBBIQQd')
+
+FLOAT32 = struct.Struct('<f')
+UINT32 = struct.Struct('<I')
+
+
+class BitWriter:
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value, bits):
+        self._acc = (self._acc << bits) | value
+        self._bits += bits
+        while self._bits >= 8:
+            self._bits -= 8
+            self.buffer.append((self._acc >> self._bits) & 0xFF)
+        self._acc &= (1 << self._bits) - 1
+
+    def getvalue(self):
+        if self._bits:
+            return bytes(self.buffer) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self.buffer)
+
+
+class BitReader:
+    def __init__(self, data):
+        self._data = data
+        self._pos = 0
+        self._acc = 0
+        self._bits = 0
+
+    def read(self, bits):
+        while self._bits < bits:
+            if self._pos >= len(self._data):
+                raise ValueError("Truncated sample batch")
+            self._acc = (self._acc << 8) | self._data[self._pos]
+            self._pos += 1
+            self._bits += 8
+        self._bits -= bits
+        value = self._acc >> self._bits
+        self._acc &= (1 << self._bits) - 1
+        return value
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated sample batch")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _encode_timestamps(timestamps):
+    out = bytearray()
+    previous = delta = 0
+    for i, ts in enumerate(timestamps):
+        micros = round(ts * 1_000_000)
+        if i == 0:
+            _write_varint(out, micros)
+        else:
+            new_delta = micros - previous
+            _write_varint(out, _zigzag(new_delta - delta))
+            delta = new_delta
+        previous = micros
+    return bytes(out)
+
+
+def _decode_timestamps(data, count):
+    timestamps = []
+    pos = 0
+    previous = delta = 0
+    for i in range(count):
+        value, pos = _read_varint(data, pos)
+        if i == 0:
+            previous = value
+        else:
+            delta += _unzigzag(value)
+            previous += delta
+        timestamps.append(previous / 1_000_000)
+    return timestamps
+
+
+def _encode_floats(values):
+    writer = BitWriter()
+    previous = None
+    prev_leading = prev_trailing = -1
+    for value in values:
+        bits = UINT32.unpack(FLOAT32.pack(value))[0]
+        if previous is None:
+            writer.write(bits, 32)
+            previous = bits
+            continue
+        xor = bits ^ previous
+        previous = bits
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        leading = min(32 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if prev_leading >= 0 and leading >= prev_leading and trailing >= prev_trailing:
+            # 직전 유효 비트 구간 안에 들어가면 구간 정보 없이 기록
+            writer.write(0b10, 2)
+            writer.write(xor >> prev_trailing, 32 - prev_leading - prev_trailing)
+        else:
+            length = 32 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 5)
+            writer.write(length - 1, 5)
+            writer.write(xor >> trailing, length)
+            prev_leading, prev_trailing = leading, trailing
+    return writer.getvalue()
+
+
+def _decode_floats(data, count):
+    reader = BitReader(data)
+    values = []
+    previous = None
+    leading = trailing = 0
+    for _ in range(count):
+        if previous is None:
+            previous = reader.read(32)
+        elif reader.read(1):
+            if reader.read(1):
+                leading = reader.read(5)
+                trailing = 32 - leading - (reader.read(5) + 1)
+            previous ^= reader.read(32 - leading - trailing) << trailing
+        values.append(FLOAT32.unpack(UINT32.pack(previous))[0])
+    return values
+
+
+def encode_batch(columns, rows, first_seq, head_seq, started_at):
+    """행 목록(첫 컬럼은 타임스탬프)을 압축된 배치 바이트로 변환"""
+    out = bytearray(HEADER.pack(
+        MAGIC, VERSION, len(columns), len(rows), first_seq, head_seq, started_at
+    ))
+    names = ','.join(columns).encode('utf-8')
+    _write_varint(out, len(names))
+    out += names
+    for index in range(len(columns)):
+        column = [row[index] for row in rows]
+        data = _encode_timestamps(column) if index == 0 else _encode_floats(column)
+        _write_varint(out, len(data))
+        out += data
+    return bytes(out)
+
+
+def decode_batch(data):
+    """encode_batch 결과를 {'columns', 'rows', 'first_seq', 'head_seq', 'started_at'}로 복원
+
+    형식이 맞지 않으면 ValueError.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated sample batch")
+    (magic, version, column_count, row_count,
+     first_seq, head_seq, started_at) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a sample batch")
+    length, pos = _read_varint(data, HEADER.size)
+    columns = data[pos:pos + length].decode('utf-8').split(',')
+    pos += length
+    if len(columns) != column_count:
+        raise ValueError("Column count mismatch in sample batch")
+
+    decoded = []
+    for index in range(column_count):
+        length, pos = _read_varint(data, pos)
+        section = data[pos:pos + length]
+        pos += length
+        decode = _decode_timestamps if index == 0 else _decode_floats
+        decoded.append(decode(section, row_count))
+    return {
+        'columns': columns,
+        'rows': list(zip(*decoded)) if row_count else [],
+        'first_seq': first_seq,
+        'head_seq': head_seq,
+        'started_at': started_at,
+    }
@@ -0,0 +1,174 @@
+import threading
+from array import array
+from datetime import datetime
+
+
+# 컬럼 정의 (타임스탬프만 double, 나머지 값은 float32 -> 샘플당 32바이트)
+COLUMNS = (
+    ('timestamp', 'd'),
+    ('cpu_usage', 'f'),
+    ('memory_total_gb', 'f'),
+    ('memory_used_gb', 'f'),
+    ('memory_usage_percent', 'f'),
+    ('disk_read_iops', 'f'),
+    ('disk_write_iops', 'f'),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+# 에이전트가 중앙 수집기로 보내는 컬럼 (알림 규칙이 쓰는 디스크 사용률 포함)
+SHIPPED_COLUMNS = COLUMNS + (
+    ('disk_total_gb', 'f'),
+    ('disk_used_gb', 'f'),
+    ('disk_usage_percent', 'f'),
+)
+SHIPPED_COLUMN_NAMES = tuple(name for name, _ in SHIPPED_COLUMNS)
+
+# 컬럼 이름 -> get_all_metrics 결과에서의 위치
+METRIC_PATHS = {
+    'cpu_usage': ('cpu',),
+    'memory_total_gb': ('memory', 'total_gb'),
+    'memory_used_gb': ('memory', 'used_gb'),
+    'memory_usage_percent': ('memory', 'usage_percent'),
+    'disk_read_iops': ('disk_io', 'read_iops'),
+    'disk_write_iops': ('disk_io', 'write_iops'),
+    'disk_total_gb': ('disk', 'total_gb'),
+    'disk_used_gb': ('disk', 'used_gb'),
+    'disk_usage_percent': ('disk', 'usage_percent'),
+}
+
+# 읽기 시 락을 잡는 단위 (샘플러의 append를 오래 막지 않도록)
+READ_CHUNK = 1024
+
+
+def row_from_metrics(metrics):
+    """get_all_metrics 결과를 저장소 행(tuple)으로 변환"""
+    return (
+        metrics['timestamp'],
+        metrics['cpu'],
+        metrics['memory']['total_gb'],
+        metrics['memory']['used_gb'],
+        metrics['memory']['usage_percent'],
+        metrics['disk_io']['read_iops'],
+        metrics['disk_io']['write_iops'],
+    )
+
+
+def shipped_row(metrics):
+    """SHIPPED_COLUMNS 순서의 행"""
+    return row_from_metrics(metrics) + (
+        metrics['disk']['total_gb'],
+        metrics['disk']['used_gb'],
+        metrics['disk']['usage_percent'],
+    )
+
+
+def metrics_from_row(columns, row):
+    """행을 get_all_metrics 형식 dict로 복원 (모르는 컬럼은 무시)"""
+    metrics = {
+        'timestamp': row[0],
+        'datetime': datetime.fromtimestamp(row[0]).strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    for name, value in zip(columns[1:], row[1:]):
+        path = METRIC_PATHS.get(name)
+        if path is None:
+            continue
+        # float32로 저장된 값이므로 수집 시와 같은 소수 둘째 자리로 되돌림
+        if len(path) == 1:
+            metrics[path[0]] = round(value, 2)
+        else:
+            metrics.setdefault(path[0], {})[path[1]] = round(value, 2)
+    return metrics
+
+
+class SampleStore:
+    """고정 용량 링 버퍼 기반 컬럼형 시계열 저장소"""
+
+    def __init__(self, capacity, columns=COLUMNS):
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self.capacity = capacity
+        self.column_names = tuple(name for name, _ in columns)
+        self._columns = [array(code, [0]) * capacity for _, code in columns]
+        self._timestamps = self._columns[0]
+        # 지금까지 기록된 전체 샘플 수 (논리 인덱스 k는 k % capacity 위치에 저장)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._written, self.capacity)
+
+    @property
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self._columns)
+
+    def append(self, row):
+        """행 하나 추가 (O(1), 가장 오래된 샘플을 덮어씀)"""
+        with self._lock:
+            pos = self._written % self.capacity
+            for column, value in zip(self._columns, row):
+                column[pos] = value
+            self._written += 1
+
+    def _oldest(self):
+        return max(0, self._written - self.capacity)
+
+    def _bisect(self, ts, lo, hi):
+        # 타임스탬프는 단조 증가하므로 논리 인덱스 위에서 이진 탐색
+        timestamps = self._timestamps
+        capacity = self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if timestamps[mid % capacity] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def rows(self, start=None, end=None):
+        """[start, end) 구간의 행을 시간순으로 반환하는 제너레이터"""
+        with self._lock:
+            lo, hi = self._oldest(), self._written
+            k = lo if start is None else self._bisect(start, lo, hi)
+        while True:
+            with self._lock:
+                # 읽는 동안 덮어쓰인 샘플은 건너뜀
+                k = max(k, self._oldest())
+                stop = min(k + READ_CHUNK, self._written)
+                chunk = [
+                    tuple(column[i % self.capacity] for column in self._columns)
+                    for i in range(k, stop)
+                ]
+            for row in chunk:
+                if end is not None and row[0] >= end:
+                    return
+                yield row
+            if stop - k < READ_CHUNK:
+                return
+            k = stop
+
+    @property
+    def next_seq(self):
+        """다음에 기록될 샘플의 순번 (= 지금까지 기록된 샘플 수)"""
+        return self._written
+
+    def since(self, seq, limit):
+        """순번 seq부터 최대 limit개의 행 -> (첫 행의 순번, 행 목록)
+
+        이미 덮어쓰인 샘플은 건너뛰므로 첫 행의 순번이 seq보다 크면 그 사이가 유실된 것이다.
+        """
+        with self._lock:
+            first = min(max(seq, self._oldest()), self._written)
+            stop = min(first + limit, self._written)
+            rows = [
+                tuple(column[i % self.capacity] for column in self._columns)
+                for i in range(first, stop)
+            ]
+        return first, rows
+
+    def latest(self):
+        """가장 최근 행 반환 (비어 있으면 None)"""
+        with self._lock:
+            if not self._written:
+                return None
+            pos = (self._written - 1) % self.capacity
+            return tuple(column[pos] for column in self._columns)
@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from collections import deque, namedtuple
+
+
+# 샘플러가 발행하는 스냅샷 (발행 후에는 수정하지 않음)
+# payload는 JSON 본문, frame은 SSE 이벤트로 미리 인코딩한 바이트
+Snapshot = namedtuple('Snapshot', ['seq', 'metrics', 'payload', 'frame'])
+
+
+class MetricsSampler:
+    """고정 주기로 메트릭을 수집하고 최신 스냅샷을 발행하는 백그라운드 수집기"""
+
+    def __init__(self, collector, interval=1.0, backfill=60, publisher=None):
+        self.collector = collector
+        self.interval = interval
+        # 다른 프로세스에 스냅샷을 전달하는 콜백 publisher(seq, payload) (예: SharedRing.publish)
+        self.publisher = publisher
+        self._publish_failed = False
+        self._snapshot = None
+        self._seq = 0
+        # 새로 접속한 구독자에게 보낼 최근 스냅샷
+        self._history = deque(maxlen=backfill)
+        self._condition = threading.Condition()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            # 첫 요청이 빈 응답을 받지 않도록 한 번은 즉시 수집
+            self._tick()
+            self._thread = threading.Thread(
+                target=self._run, name='metrics-sampler', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def latest(self):
+        """가장 최근 스냅샷 반환 (수집 전이면 None)"""
+        return self._snapshot
+
+    def _tick(self):
+        try:
+            metrics = self.collector.get_all_metrics()
+        except Exception as e:
+            print(f"Error in sampler tick: {e}")
+            return
+        self._seq += 1
+        # 요청/구독자마다 인코딩하지 않도록 발행 시점에 한 번만 직렬화
+        payload = json.dumps(metrics, separators=(',', ':')).encode('utf-8')
+        frame = b'id: %d\ndata: %s\n\n' % (self._seq, payload)
+        snapshot = Snapshot(self._seq, metrics, payload, frame)
+        if self.publisher is not None:
+            try:
+                self.publisher(self._seq, payload)
+                self._publish_failed = False
+            except Exception as e:
+                # 실패가 이어지는 동안 워커는 마지막으로 발행된 스냅샷을 보게 되므로 처음 한 번만 남김
+                if not self._publish_failed:
+                    print(f"Error publishing snapshot, workers will serve stale data: {e}")
+                self._publish_failed = True
+        with self._condition:
+            self._snapshot = snapshot
+            self._history.append(snapshot)
+            self._condition.notify_all()
+
+    def subscribe(self, since_seq=None, backfill=0, timeout=15.0):
+        """스냅샷 스트림 제너레이터
+
+        since_seq가 있으면 그 이후 스냅샷부터, 없으면 최근 backfill개부터 보낸다.
+        timeout 동안 새 스냅샷이 없으면 None을 내보낸다 (연결 유지용).
+        """
+        with self._condition:
+            if since_seq is not None:
+                pending = [snapshot for snapshot in self._history if snapshot.seq > since_seq]
+            elif backfill > 0:
+                pending = list(self._history)[-backfill:]
+            else:
+                pending = []
+            last_seq = self._snapshot.seq if self._snapshot else 0
+            if pending:
+                last_seq = max(last_seq, pending[-1].seq)
+        yield from pending
+
+        while not self._stop_event.is_set():
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stop_event.is_set() or (
+                        self._snapshot is not None and self._snapshot.seq > last_seq
+                    ),
+                    timeout
+                )
+                # 느린 구독자가 놓친 스냅샷도 순서대로 전달
+                pending = [snapshot for snapshot in self._history if snapshot.seq > last_seq]
+            if not pending:
+                yield None
+                continue
+            yield from pending
+            last_seq = pending[-1].seq
+
+    def _run(self):
+        next_run = time.monotonic() + self.interval
+        while not self._stop_event.wait(max(0.0, next_run - time.monotonic())):
+            self._tick()
+            next_run += self.interval
+            now = time.monotonic()
+            # 수집이 주기보다 오래 걸리면 밀린 틱은 건너뜀
+            if next_run < now:
+                next_run = now + self.interval
@@ -0,0 +1,234 @@
+import bisect
+import os
+import re
+import struct
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from sample_store import COLUMN_NAMES
+
+
+# 샘플 레코드: 타임스탬프(double) + 값 6개(float32) = 32바이트 고정 폭
+RECORD_FORMAT = '<d6f'
+
+# 읽기 단위 (레코드 수)
+READ_CHUNK = 4096
+
+# struct 형식 문자 -> numpy 타입
+DTYPE_CODES = {'d': 'f8', 'f': 'f4', 'I': 'u4', 'i': 'i4', 'Q': 'u8', 'q': 'i8'}
+
+# 파티션 단위별 파일 이름 형식
+PARTITION_FORMATS = {
+    'day': '%Y-%m-%d',
+    'month': '%Y-%m',
+}
+
+
+class SegmentStore:
+    """날짜 파티션으로 나뉜 추가 전용 바이너리 세그먼트 저장소
+
+    각 세그먼트(기본은 YYYY-MM-DD.seg)는 시간순으로 정렬된 고정 폭 레코드이므로
+    레코드 번호 자체가 타임스탬프 인덱스 역할을 한다 (이진 탐색).
+    """
+
+    def __init__(self, directory, record_format=RECORD_FORMAT, partition='day'):
+        if partition not in PARTITION_FORMATS:
+            raise ValueError(f"Unknown partition: {partition}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._struct = struct.Struct(record_format)
+        self.record_size = self._struct.size
+        self.dtype = record_dtype(record_format)
+        self.partition = partition
+        self._name_format = PARTITION_FORMATS[partition]
+        self._file = None
+        self._file_key = None
+        self._last_ts = None
+        self._lock = threading.Lock()
+
+    def _partition_key(self, ts):
+        return datetime.fromtimestamp(ts).strftime(self._name_format)
+
+    def _segment_path(self, key):
+        return self.directory / f'{key}.seg'
+
+    def _open_segment(self, key):
+        if self._file is not None:
+            self._file.close()
+        path = self._segment_path(key)
+        self._file = open(path, 'ab')
+        # 비정상 종료로 남은 불완전한 레코드 제거
+        size = self._file.tell()
+        if size % self.record_size:
+            self._file.truncate(size - size % self.record_size)
+        self._file_key = key
+        last = self._read_last(path)
+        self._last_ts = last[0] if last else None
+
+    def _read_last(self, path):
+        with open(path, 'rb') as f:
+            count = os.fstat(f.fileno()).st_size // self.record_size
+            if not count:
+                return None
+            f.seek((count - 1) * self.record_size)
+            return self._struct.unpack(f.read(self.record_size))
+
+    def append(self, row):
+        """행 하나를 해당 파티션 세그먼트 끝에 추가"""
+        with self._lock:
+            key = self._partition_key(row[0])
+            if key != self._file_key:
+                self._open_segment(key)
+            # 시계가 뒤로 가더라도 세그먼트 내 정렬을 유지
+            if self._last_ts is not None and row[0] < self._last_ts:
+                row = (self._last_ts,) + tuple(row[1:])
+            self._file.write(self._struct.pack(*row))
+            self._file.flush()
+            self._last_ts = row[0]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._file_key = None
+
+    @property
+    def nbytes(self):
+        """세그먼트 파일 전체 크기"""
+        return sum(path.stat().st_size for path in self.directory.glob('*.seg'))
+
+    def prune(self, before):
+        """before가 속한 파티션보다 오래된 세그먼트를 삭제하고 삭제한 파티션 키 목록 반환"""
+        cutoff = self._partition_key(before)
+        removed = []
+        with self._lock:
+            for key in self.partitions():
+                # 키는 문자열 정렬 = 시간 정렬
+                if key >= cutoff:
+                    break
+                if key == self._file_key:
+                    continue
+                self._segment_path(key).unlink(missing_ok=True)
+                removed.append(key)
+        return removed
+
+    def partitions(self):
+        """저장된 세그먼트 파티션 키 목록 (오름차순)"""
+        return sorted(path.stem for path in self.directory.glob('*.seg'))
+
+    def last(self):
+        """가장 마지막에 기록된 행 반환 (없으면 None)"""
+        for key in reversed(self.partitions()):
+            row = self._read_last(self._segment_path(key))
+            if row is not None:
+                return row
+        return None
+
+    def _segment_view(self, path, start, end):
+        return map_range(path, self.dtype, start, end)
+
+    def _segment_rows(self, path, start, end):
+        view = self._segment_view(path, start, end)
+        # 매핑된 페이지를 그대로 바이트 뷰로 보고 레코드 단위로 해석
+        data = memoryview(view.view(np.uint8)) if len(view) else memoryview(b'')
+        for offset in range(0, len(data), READ_CHUNK * self.record_size):
+            yield from self._struct.iter_unpack(data[offset:offset + READ_CHUNK * self.record_size])
+
+    def _keys_in_range(self, start, end):
+        if start is not None and end is not None:
+            return partition_keys(start, end, self.partition)
+        # 한쪽이 열린 구간은 저장된 파티션 중에서 고름 (키는 문자열 정렬 = 시간 정렬)
+        keys = self.partitions()
+        if start is not None:
+            first = self._partition_key(start)
+            keys = [key for key in keys if key >= first]
+        if end is not None:
+            last = self._partition_key(end - 1e-6)
+            keys = [key for key in keys if key <= last]
+        return keys
+
+    def rows(self, start=None, end=None):
+        """[start, end) 구간과 겹치는 세그먼트만 읽어 행을 시간순으로 반환"""
+        for key in self._keys_in_range(start, end):
+            path = self._segment_path(key)
+            if path.exists():
+                yield from self._segment_rows(path, start, end)
+
+    def views(self, start=None, end=None):
+        """[start, end) 구간의 파티션별 레코드 배열 뷰 (페이지 캐시를 그대로 참조)
+
+        필드 이름은 f0(타임스탬프), f1, ... 순서이다.
+        """
+        for key in self._keys_in_range(start, end):
+            path = self._segment_path(key)
+            if path.exists():
+                view = self._segment_view(path, start, end)
+                if len(view):
+                    yield view
+
+    def columns(self, fields, start=None, end=None):
+        """[start, end) 구간에서 지정한 필드 번호의 열만 모은 배열 목록"""
+        views = list(self.views(start, end))
+        return [
+            np.concatenate([view[f'f{field}'] for view in views]) if views
+            else np.empty(0, dtype=self.dtype[field])
+            for field in fields
+        ]
+
+
+def record_dtype(record_format, names=None):
+    """struct 형식('<d6f' 등)과 같은 배치의 구조화 dtype (필드 이름이 없으면 f0, f1, ...)"""
+    byte_order = record_format[0] if record_format[0] in '<>=!' else '='
+    codes = []
+    for count, code in re.findall(r'(\d*)([a-zA-Z])', record_format.lstrip('<>=!@')):
+        codes.extend([code] * int(count or 1))
+    prefix = '>' if byte_order in '>!' else '<'
+    names = names or [f'f{i}' for i in range(len(codes))]
+    return np.dtype([(name, prefix + DTYPE_CODES[code]) for name, code in zip(names, codes)])
+
+
+# 원본 샘플 세그먼트를 컬럼 이름으로 읽는 dtype (리포트 집계용)
+RECORD_DTYPE = record_dtype(RECORD_FORMAT, COLUMN_NAMES)
+
+
+def map_segment(path, dtype):
+    """세그먼트 파일 전체를 읽기 전용 레코드 배열로 매핑 (여러 프로세스가 같은 페이지를 공유)
+
+    기록 중인 세그먼트의 불완전한 마지막 레코드는 제외한다.
+    """
+    count = os.path.getsize(path) // dtype.itemsize
+    if not count:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+def map_range(path, dtype, start=None, end=None):
+    """세그먼트를 매핑해 [start, end) 구간 레코드 배열 뷰 반환 (복사 없음)
+
+    첫 필드(타임스탬프) 열을 이진 탐색한다. np.searchsorted는 레코드 간격으로
+    띄엄띄엄 놓인 열을 연속 배열로 복사하므로 필요한 레코드만 건드리는 bisect를 사용.
+    """
+    records = map_segment(path, dtype)
+    timestamps = records[dtype.names[0]]
+    lo = 0 if start is None else bisect.bisect_left(timestamps, start)
+    hi = len(records) if end is None else bisect.bisect_left(timestamps, end)
+    return records[lo:hi]
+
+
+def partition_keys(start, end, partition='day'):
+    """[start, end) 구간에 걸친 파티션 키 목록"""
+    name_format = PARTITION_FORMATS[partition]
+    day = datetime.fromtimestamp(start).date()
+    # end는 포함하지 않으므로 자정에 끝나는 구간은 다음 파티션을 건드리지 않음
+    last = datetime.fromtimestamp(end - 1e-6).date()
+    keys = []
+    while day <= last:
+        key = day.strftime(name_format)
+        if not keys or keys[-1] != key:
+            keys.append(key)
+        day += timedelta(days=1)
+    return keys
@@ -0,0 +1,142 @@
+import argparse
+import json
+import logging
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+from metrics_collector import MetricsCollector
+from primary_rpc import PrimaryServer
+from sampler import MetricsSampler
+from shared_ring import SharedRing, slot_size_for
+from supervisor import Supervisor
+
+try:
+    import gunicorn
+except ImportError:
+    gunicorn = None
+
+
+# 운영용 다중 워커 실행 진입점
+#
+# 이 프로세스(주 프로세스)가 수집기와 샘플러를 하나만 실행해 스냅샷을 mmap 링에 발행하고,
+# HTTP 워커(gunicorn, 없으면 내장 워커)는 MONITOR_ROLE=reader로 app을 불러와 링에서 읽는다.
+# 워커는 supervisor로 감시되어 종료되면 즉시 재시작된다.
+#
+#   python serve.py --workers 4 --bind 0.0.0.0:5001
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Monitoring server (multi-worker)')
+    parser.add_argument('--bind', default='0.0.0.0:5001')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    # SSE 스트림이 연결마다 스레드를 하나씩 점유하므로 워커당 스레드를 넉넉히 둠
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--no-gunicorn', action='store_true', help='use built-in workers')
+    parser.add_argument('--worker-fd', type=int, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def run_worker(fd, bind):
+    """내장 워커: 주 프로세스가 열어 둔 리슨 소켓을 넘겨받아 스레드 서버로 처리"""
+    from werkzeug.serving import make_server
+
+    from app import app
+
+    host, port = bind.rsplit(':', 1)
+    make_server(host, int(port), app, threaded=True, fd=fd).serve_forever()
+
+
+def worker_processes(args):
+    if gunicorn is not None and not args.no_gunicorn:
+        return [{
+            'name': 'gunicorn',
+            'command': [
+                sys.executable, '-m', 'gunicorn',
+                '--workers', str(args.workers),
+                '--worker-class', 'gthread',
+                '--threads', str(args.threads),
+                '--bind', args.bind,
+                'app:app'
+            ]
+        }]
+
+    host, port = args.bind.rsplit(':', 1)
+    listener = socket.create_server((host, int(port)), backlog=1024)
+    listener.set_inheritable(True)
+    fd = listener.detach()
+    return [
+        {
+            'name': f'worker-{index}',
+            'command': [sys.executable, __file__, '--worker-fd', str(fd), '--bind', args.bind],
+            'pass_fds': [fd]
+        }
+        for index in range(args.workers)
+    ]
+
+
+def main():
+    args = parse_args()
+    if args.worker_fd is not None:
+        run_worker(args.worker_fd, args.bind)
+        return
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    collector = MetricsCollector()
+    config = collector.config
+    data_path = Path(config['data_dir'])
+
+    # 코어/디스크/NIC가 많은 호스트는 스냅샷이 설정값보다 클 수 있으므로 첫 스냅샷 크기로 슬롯을 정함
+    now = time.time()
+    probe = collector.sample(now)
+    probe.update(collector.extended_collector.collect(now))
+    probe_payload = json.dumps(probe, separators=(',', ':')).encode('utf-8')
+    ring_path = data_path / 'metrics.ring'
+    ring = SharedRing(
+        ring_path,
+        slots=max(config['ring_slots'], config['stream_backfill'] + 1),
+        slot_size=slot_size_for(probe_payload, config['ring_slot_size']),
+        interval=config['sample_interval'],
+        create=True
+    )
+    sampler = MetricsSampler(
+        collector,
+        interval=config['sample_interval'],
+        backfill=config['stream_backfill'],
+        publisher=ring.publish
+    )
+
+    rpc_address = str(data_path / 'primary.sock')
+    if os.path.exists(rpc_address):
+        os.unlink(rpc_address)
+    authkey = os.urandom(16)
+    rpc_server = PrimaryServer(collector, rpc_address, authkey)
+    rpc_server.start()
+
+    sampler.start()
+    collector.start_remote_collection()
+    collector.start_process_tracking()
+
+    # 워커가 상속받는 환경 변수
+    os.environ.update({
+        'MONITOR_ROLE': 'reader',
+        'MONITOR_RING_PATH': str(ring_path),
+        'MONITOR_RPC_ADDRESS': rpc_address,
+        'MONITOR_RPC_AUTHKEY': authkey.hex(),
+    })
+    logging.info(f"Serving on {args.bind} with {args.workers} workers")
+    supervisor = Supervisor(
+        worker_processes(args), status_path=config['supervisor_status_paths']['serve']
+    )
+    try:
+        supervisor.run()
+    finally:
+        sampler.stop()
+        rpc_server.close()
+        collector.close()
+
+
+if __name__ == '__main__':
+    main()
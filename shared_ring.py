@@ -0,0 +1,217 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from sampler import Snapshot
+
+
+# 샘플러 프로세스가 스냅샷을 발행하고 여러 워커 프로세스가 읽는 메모리 매핑 링 파일
+#
+# 헤더: magic, version, 슬롯 수, 슬롯 크기, 마지막 발행 seq, 발행 주기
+# 슬롯: 버전(seqlock, 쓰는 중이면 홀수), seq, 길이, JSON 본문
+
+MAGIC = b'MRNG'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIQd')
+HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct('<QQI')
+SLOT_HEADER_SIZE = 24
+HEAD_OFFSET = 16
+
+# 읽는 도중 덮어쓰기가 계속되면 포기하는 재시도 횟수
+MAX_READ_RETRIES = 100
+
+# 이후 스냅샷이 더 커질 수 있으므로(rate 필드, 새 장치 등) 첫 스냅샷 크기의 이 배수로 슬롯을 잡음
+SLOT_HEADROOM = 2
+
+
+def slot_size_for(payload, minimum=0):
+    """payload(첫 스냅샷)가 여유 있게 들어가는 슬롯 크기 (4KB 단위로 올림)"""
+    size = max(minimum, SLOT_HEADER_SIZE + len(payload) * SLOT_HEADROOM)
+    return -(-size // 4096) * 4096
+
+
+class SharedRing:
+    """seqlock으로 보호되는 고정 크기 슬롯의 mmap 링 (쓰기 프로세스는 하나)"""
+
+    def __init__(self, path, slots=256, slot_size=16384, interval=1.0, create=False):
+        self.path = Path(path)
+        if create:
+            self.slots = slots
+            self.slot_size = slot_size
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 새 파일을 만든 뒤 교체하므로 기존 링을 열고 있던 리더는 영향이 없음
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.truncate(HEADER_SIZE + slots * slot_size)
+                f.write(HEADER.pack(MAGIC, VERSION, slots, slot_size, 0, interval))
+            os.replace(tmp_path, self.path)
+        with open(self.path, 'r+b') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+            stat = os.fstat(f.fileno())
+        # 매핑한 파일 식별자 (같은 경로에 링이 새로 만들어졌는지 판단)
+        self._file_id = (stat.st_dev, stat.st_ino)
+        magic, version, self.slots, self.slot_size, _, self.interval = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a metrics ring file: {self.path}")
+        self.max_payload = self.slot_size - SLOT_HEADER_SIZE
+
+    def _slot_offset(self, seq):
+        return HEADER_SIZE + (seq % self.slots) * self.slot_size
+
+    def replaced(self):
+        """경로의 링 파일이 새로 만들어져 이 매핑과 다른 파일이 되었는지"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._file_id
+
+    def head(self):
+        """마지막으로 발행된 seq (발행 전이면 0)"""
+        return struct.unpack_from('<Q', self._mmap, HEAD_OFFSET)[0]
+
+    def publish(self, seq, payload):
+        """slot(seq)에 payload를 기록하고 head를 seq로 갱신"""
+        if len(payload) > self.max_payload:
+            raise ValueError(f"Snapshot too large for ring slot: {len(payload)} bytes")
+        offset = self._slot_offset(seq)
+        version = struct.unpack_from('<Q', self._mmap, offset)[0]
+        # 홀수 버전 = 기록 중 (리더는 다시 읽음)
+        struct.pack_into('<Q', self._mmap, offset, version + 1)
+        self._mmap[offset + SLOT_HEADER_SIZE:offset + SLOT_HEADER_SIZE + len(payload)] = payload
+        struct.pack_into('<QI', self._mmap, offset + 8, seq, len(payload))
+        struct.pack_into('<Q', self._mmap, offset, version + 2)
+        struct.pack_into('<Q', self._mmap, HEAD_OFFSET, seq)
+
+    def read(self, seq):
+        """seq 스냅샷의 JSON 본문 (이미 덮어써졌으면 None)"""
+        offset = self._slot_offset(seq)
+        for _ in range(MAX_READ_RETRIES):
+            before, slot_seq, length = SLOT_HEADER.unpack_from(self._mmap, offset)
+            if before % 2:
+                continue
+            payload = self._mmap[offset + SLOT_HEADER_SIZE:offset + SLOT_HEADER_SIZE + length]
+            if struct.unpack_from('<Q', self._mmap, offset)[0] == before:
+                return payload if slot_seq == seq else None
+        return None
+
+    def close(self):
+        self._mmap.close()
+
+
+class SharedRingReader:
+    """SharedRing을 MetricsSampler와 같은 인터페이스(latest/subscribe)로 읽는 리더
+
+    워커 프로세스에서 샘플러 대신 사용한다. 새 스냅샷은 head를 짧은 주기로 확인해 감지한다.
+    샘플러가 재시작되어 링 파일이 교체되면 발행 주기마다 한 번 확인해 새 파일로 다시 매핑한다.
+    """
+
+    def __init__(self, path, backfill=60, cache_size=256):
+        self.path = Path(path)
+        self.backfill = backfill
+        self._ring = None
+        # 같은 스냅샷을 요청마다 디코딩하지 않도록 최근 스냅샷 캐시
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        # 샘플러 프로세스가 링 파일을 만들 때까지 기다림
+        while self._ring is None:
+            with self._lock:
+                if self._ring is not None:
+                    break
+                try:
+                    self._ring = SharedRing(self.path)
+                except (FileNotFoundError, ValueError):
+                    pass
+            if self._ring is None:
+                time.sleep(0.1)
+
+    def _current(self):
+        """현재 링 (파일이 교체되었으면 새 링으로 바꿔 반환)"""
+        self.start()
+        ring = self._ring
+        now = time.monotonic()
+        if now - self._checked_at < ring.interval:
+            return ring
+        self._checked_at = now
+        if not ring.replaced():
+            return ring
+        try:
+            new_ring = SharedRing(self.path)
+        except (FileNotFoundError, ValueError):
+            return ring
+        with self._lock:
+            if self._ring is ring:
+                # 새 링의 seq는 처음부터 다시 시작하므로 캐시도 비움
+                # (이전 링은 읽는 중인 스레드가 있을 수 있어 닫지 않고 참조가 사라질 때 해제)
+                self._ring = new_ring
+                self._cache.clear()
+            return self._ring
+
+    def _snapshot(self, ring, seq):
+        key = (ring, seq)
+        with self._lock:
+            snapshot = self._cache.get(key)
+            if snapshot is not None:
+                return snapshot
+        payload = ring.read(seq)
+        if payload is None:
+            return None
+        frame = b'id: %d\ndata: %s\n\n' % (seq, payload)
+        snapshot = Snapshot(seq, json.loads(payload), payload, frame)
+        with self._lock:
+            self._cache[key] = snapshot
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return snapshot
+
+    def latest(self):
+        ring = self._current()
+        seq = ring.head()
+        return self._snapshot(ring, seq) if seq else None
+
+    def _since(self, ring, last_seq, head):
+        # 링에서 이미 밀려난 스냅샷은 건너뜀
+        first = max(last_seq + 1, head - ring.slots + 1, 1)
+        for seq in range(first, head + 1):
+            snapshot = self._snapshot(ring, seq)
+            if snapshot is not None:
+                yield snapshot
+
+    def subscribe(self, since_seq=None, backfill=0, timeout=15.0):
+        """MetricsSampler.subscribe와 같은 스냅샷 스트림 제너레이터"""
+        ring = self._current()
+        head = ring.head()
+        if since_seq is not None:
+            # 샘플러가 재시작되어 seq가 처음부터 다시 시작된 경우
+            last_seq = since_seq if since_seq <= head else head
+        else:
+            last_seq = head - min(backfill, self.backfill)
+        yield from self._since(ring, last_seq, head)
+        last_seq = head
+
+        poll_interval = min(0.05, ring.interval / 10)
+        while True:
+            deadline = time.monotonic() + timeout
+            head = ring.head()
+            while head <= last_seq and time.monotonic() < deadline:
+                time.sleep(poll_interval)
+                current = self._current()
+                if current is not ring:
+                    # 링이 새로 만들어지면 새 링에 쌓인 스냅샷부터 이어서 전달
+                    ring, last_seq = current, 0
+                head = ring.head()
+            if head <= last_seq:
+                yield None
+                continue
+            yield from self._since(ring, last_seq, head)
+            last_seq = head
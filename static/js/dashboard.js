@@ -1,5 +1,8 @@
 // 차트 설정
 const maxDataPoints = 60;
+const historyPoints = 300;
+// 'live'이면 실시간 스트림으로 차트 갱신, 아니면 선택한 기간의 이력 표시
+let chartRange = 'live';
 const charts = {
     cpu: createChart('cpuChart', '사용률 (%)', 'rgba(255, 99, 132, 0.2)', 'rgba(255, 99, 132, 1)'),
     memory: createChart('memoryChart', '사용률 (%)', 'rgba(54, 162, 235, 0.2)', 'rgba(54, 162, 235, 1)'),
@@ -48,54 +51,150 @@ function updateChart(chart, value, label) {
     chart.update();
 }
 
+function showMetrics(data) {
+    // 값 업데이트
+    document.getElementById('cpu-value').textContent = `${data.cpu}%`;
+    document.getElementById('memory-value').textContent = `${data.memory.usage_percent}%`;
+    document.getElementById('disk-read').textContent = `${data.disk_io.read_iops} IOPS`;
+    document.getElementById('disk-write').textContent = `${data.disk_io.write_iops} IOPS`;
+
+    if (chartRange !== 'live') {
+        return;
+    }
+
+    // 차트 업데이트
+    const time = data.datetime.split(' ')[1];
+    updateChart(charts.cpu, data.cpu, time);
+    updateChart(charts.memory, data.memory.usage_percent, time);
+    updateChart(charts.diskRead, data.disk_io.read_iops, time);
+    updateChart(charts.diskWrite, data.disk_io.write_iops, time);
+}
+
+function showError(error) {
+    console.error('Error:', error);
+    ['cpu-value', 'memory-value', 'disk-read', 'disk-write'].forEach(id => {
+        document.getElementById(id).textContent = 'Error';
+    });
+}
+
 function fetchMetrics() {
     fetch('/api/metrics')
         .then(response => response.json())
-        .then(data => {
-            // 값 업데이트
-            document.getElementById('cpu-value').textContent = `${data.cpu}%`;
-            document.getElementById('memory-value').textContent = `${data.memory.usage_percent}%`;
-            document.getElementById('disk-read').textContent = `${data.disk_io.read_iops} IOPS`;
-            document.getElementById('disk-write').textContent = `${data.disk_io.write_iops} IOPS`;
-
-            // 차트 업데이트
-            const time = data.datetime.split(' ')[1];
-            updateChart(charts.cpu, data.cpu, time);
-            updateChart(charts.memory, data.memory.usage_percent, time);
-            updateChart(charts.diskRead, data.disk_io.read_iops, time);
-            updateChart(charts.diskWrite, data.disk_io.write_iops, time);
-        })
-        .catch(error => {
-            console.error('Error:', error);
-            ['cpu-value', 'memory-value', 'disk-read', 'disk-write'].forEach(id => {
-                document.getElementById(id).textContent = 'Error';
-            });
-        });
+        .then(showMetrics)
+        .catch(showError);
+}
+
+if (window.EventSource) {
+    // 서버가 새 스냅샷을 푸시 (처음 연결 시 최근 데이터로 차트 채움, 끊기면 자동 재연결)
+    const source = new EventSource(`/api/metrics/stream?backfill=${maxDataPoints}`);
+    source.onmessage = event => showMetrics(JSON.parse(event.data));
+    source.onerror = () => console.warn('Metrics stream disconnected, retrying...');
+} else {
+    // 1초마다 메트릭 업데이트
+    setInterval(fetchMetrics, 1000);
+    fetchMetrics(); // 초기 로드 
 }
 
-// 1초마다 메트릭 업데이트
-setInterval(fetchMetrics, 1000);
-fetchMetrics(); // 초기 로드 
+function formatTimestamp(timestamp, range) {
+    const date = new Date(timestamp * 1000);
+    const time = date.toTimeString().slice(0, 8);
+    return range > 86400 ? `${date.toISOString().slice(5, 10)} ${time.slice(0, 5)}` : time;
+}
 
-// 엑셀 내보내기 기능
-document.getElementById('exportButton').addEventListener('click', async () => {
+// 서버에서 최대 historyPoints개로 줄여 준 이력으로 차트를 다시 그림
+async function loadHistory(range) {
+    const to = Date.now() / 1000;
+    const from = to - range;
+    const series = {
+        cpu: 'cpu_usage',
+        memory: 'memory_usage_percent',
+        diskRead: 'disk_read_iops',
+        diskWrite: 'disk_write_iops'
+    };
+
+    await Promise.all(Object.entries(series).map(async ([chartName, metric]) => {
+        const response = await fetch(
+            `/api/metrics/history?metric=${metric}&from=${from}&to=${to}&points=${historyPoints}`
+        );
+        if (!response.ok) {
+            throw new Error('History load failed');
+        }
+        const history = await response.json();
+        const chart = charts[chartName];
+        chart.data.labels = history.timestamps.map(timestamp => formatTimestamp(timestamp, range));
+        chart.data.datasets[0].data = history.values;
+        chart.update();
+    }));
+}
+
+document.getElementById('rangeSelect').addEventListener('change', async event => {
+    chartRange = event.target.value;
+    Object.values(charts).forEach(chart => {
+        chart.data.labels = [];
+        chart.data.datasets[0].data = [];
+        chart.update();
+    });
+    if (chartRange === 'live') {
+        return;
+    }
+    try {
+        await loadHistory(Number(chartRange));
+    } catch (error) {
+        console.error('Error loading history:', error);
+    }
+});
+
+// 상위 프로세스 표 (서버가 별도 주기로 갱신하므로 같은 주기로 조회)
+const processTable = document.getElementById('processTable');
+const processSort = document.getElementById('processSort');
+let processRefreshMs = 5000;
+let processTimer = null;
+
+async function loadProcesses() {
     try {
-        const response = await fetch('/api/export-csv');
+        const response = await fetch(`/api/processes/top?sort=${processSort.value}&n=10`);
         if (!response.ok) {
-            throw new Error('Export failed');
+            throw new Error('Process list load failed');
         }
-        
-        const blob = await response.blob();
-        const url = window.URL.createObjectURL(blob);
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `metrics_log_${new Date().toISOString().slice(0,19).replace(/[:]/g, '')}.csv`;
-        document.body.appendChild(a);
-        a.click();
-        window.URL.revokeObjectURL(url);
-        a.remove();
+        const top = await response.json();
+        processRefreshMs = top.interval * 1000;
+        // 프로세스 이름은 로컬 사용자가 임의로 정할 수 있으므로 HTML로 해석하지 않고 텍스트로 넣음
+        processTable.replaceChildren(...top.processes.map(process => {
+            const row = document.createElement('tr');
+            row.className = 'border-b';
+            [
+                [process.pid, 'py-1'],
+                [process.name, 'py-1'],
+                [process.cpu_percent, 'py-1 text-right'],
+                [process.rss_mb, 'py-1 text-right'],
+                [(process.io_bytes_per_sec / 1024).toFixed(1), 'py-1 text-right'],
+            ].forEach(([value, className]) => {
+                const cell = document.createElement('td');
+                cell.className = className;
+                cell.textContent = value;
+                row.appendChild(cell);
+            });
+            return row;
+        }));
     } catch (error) {
-        console.error('Error exporting data:', error);
-        alert('데이터 내보내기에 실패했습니다.');
+        console.error('Error loading processes:', error);
     }
+    processTimer = setTimeout(loadProcesses, processRefreshMs);
+}
+
+processSort.addEventListener('change', () => {
+    clearTimeout(processTimer);
+    loadProcesses();
+});
+
+loadProcesses();
+
+// 엑셀 내보내기 기능 (서버가 스트리밍하는 CSV를 브라우저가 바로 파일로 저장)
+document.getElementById('exportButton').addEventListener('click', () => {
+    const a = document.createElement('a');
+    a.href = '/api/export-csv';
+    a.download = `metrics_log_${new Date().toISOString().slice(0,19).replace(/[:]/g, '')}.csv`;
+    document.body.appendChild(a);
+    a.click();
+    a.remove();
 }); 
\ No newline at end of file
@@ -2,25 +2,44 @@ document.addEventListener('DOMContentLoaded', function() {
     const generateReportBtn = document.getElementById('generateReportBtn');
     const dateFilter = document.getElementById('dateFilter');
     const reportType = document.getElementById('reportType');
+    const reportResolution = document.getElementById('reportResolution');
     const reportsList = document.getElementById('reportsList');
 
     // 오늘 날짜를 기본값으로 설정
     dateFilter.valueAsDate = new Date();
 
-    // 리포트 생성 버튼 클릭 이벤트
+    // 작업이 끝날 때까지 진행률 확인
+    async function waitForJob(job) {
+        while (job.status === 'queued' || job.status === 'running') {
+            generateReportBtn.textContent = `생성 중... ${Math.round(job.progress * 100)}%`;
+            await new Promise(resolve => setTimeout(resolve, 500));
+            const response = await fetch(`/api/reports/jobs/${job.id}`);
+            if (!response.ok) {
+                throw new Error('작업 상태 조회 실패');
+            }
+            job = await response.json();
+        }
+        return job;
+    }
+
+    // 리포트 생성 버튼 클릭 이벤트 (서버에서 비동기 작업으로 생성 후 다운로드)
     generateReportBtn.addEventListener('click', async () => {
         const date = dateFilter.value;
         const type = reportType.value;
+        const resolution = reportResolution.value;
+        const buttonLabel = generateReportBtn.textContent;
+        generateReportBtn.disabled = true;
         
         try {
-            const response = await fetch('/api/generate-report', {
+            const response = await fetch('/api/reports/jobs', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
                     date: date,
-                    type: type
+                    type: type,
+                    resolution: resolution || undefined
                 })
             });
 
@@ -28,21 +47,25 @@ document.addEventListener('DOMContentLoaded', function() {
                 throw new Error('리포트 생성 실패');
             }
 
-            const blob = await response.blob();
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = `system_report_${type}_${date}.csv`;
-            document.body.appendChild(a);
-            a.click();
-            window.URL.revokeObjectURL(url);
-            a.remove();
+            const job = await waitForJob(await response.json());
+            if (job.status === 'empty') {
+                alert('선택한 기간에 데이터가 없습니다.');
+                return;
+            }
+            if (job.status !== 'done') {
+                throw new Error(job.error || '리포트 생성 실패');
+            }
+
+            await downloadReport(job.report_id);
 
             // 리포트 목록 업데이트
             loadReports();
         } catch (error) {
             console.error('Error:', error);
             alert('리포트 생성에 실패했습니다.');
+        } finally {
+            generateReportBtn.disabled = false;
+            generateReportBtn.textContent = buttonLabel;
         }
     });
 
@@ -74,6 +97,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 <div class="report-info">
                     <h3>${report.type} 리포트</h3>
                     <p>생성일: ${report.created_at}</p>
+                    ${report.rows != null ? `<p>행 수: ${report.rows} / 크기: ${(report.size / 1024).toFixed(1)} KB</p>` : ''}
                 </div>
                 <div class="report-actions">
                     <button onclick="downloadReport('${report.id}')" class="download-btn">다운로드</button>
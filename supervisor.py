@@ -0,0 +1,277 @@
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows (상태 파일 읽기만 지원)
+    resource = None
+
+
+# 자식 프로세스 자원 제한 (설정 키 -> (rlimit 이름, 단위 배수))
+RLIMITS = {
+    'memory_mb': ('RLIMIT_AS', 1024 * 1024),
+    'open_files': ('RLIMIT_NOFILE', 1),
+    'cpu_seconds': ('RLIMIT_CPU', 1),
+}
+
+DEFAULT_SETTINGS = {
+    'backoff_initial': 1.0,
+    'backoff_max': 60.0,
+    # 이 시간 이상 살아 있었으면 정상 실행으로 보고 backoff 초기화
+    'stable_seconds': 30.0,
+    # window 안에 restarts번 이상 종료되면 crash loop로 보고 cooldown 동안 재시작 중단
+    'crash_loop_restarts': 5,
+    'crash_loop_window': 60.0,
+    'crash_loop_cooldown': 300.0,
+    'status_path': 'data/supervisor.json',
+    'status_interval': 5.0,
+}
+
+
+class Child:
+    """감시 대상 프로세스 하나의 설정과 실행 상태"""
+
+    def __init__(self, spec, backoff_initial):
+        if isinstance(spec, str):
+            spec = {'name': spec}
+        self.name = spec['name']
+        self.command = spec.get('command') or ['python3', self.name]
+        self.cwd = spec.get('cwd')
+        self.rlimits = spec.get('rlimits', {})
+        # 자식에게 그대로 넘겨줄 파일 디스크립터 (예: 미리 열어 둔 리슨 소켓)
+        self.pass_fds = tuple(spec.get('pass_fds', ()))
+        self.process = None
+        self.usage = None
+        self.state = 'stopped'
+        self.started_at = None
+        self.restarts = 0
+        self.last_exit_code = None
+        self.last_exit_at = None
+        self.backoff = backoff_initial
+        self.next_start = 0.0
+        self.exits = deque()
+
+    def _apply_rlimits(self):
+        # fork 이후 exec 이전에 자식 프로세스 안에서 실행됨
+        for key, value in self.rlimits.items():
+            name, scale = RLIMITS[key]
+            resource.setrlimit(getattr(resource, name), (int(value * scale), int(value * scale)))
+
+    def spawn(self):
+        self.process = subprocess.Popen(
+            self.command, cwd=self.cwd, pass_fds=self.pass_fds,
+            preexec_fn=self._apply_rlimits if self.rlimits else None
+        )
+        try:
+            self.usage = psutil.Process(self.process.pid)
+            # 다음 cpu_percent 호출부터 직전 호출 이후의 사용률을 반환
+            self.usage.cpu_percent(interval=None)
+        except psutil.Error:
+            # 시작 직후 종료된 경우 (SIGCHLD로 회수됨)
+            self.usage = None
+        self.state = 'running'
+        self.started_at = time.time()
+
+    def status(self):
+        status = {
+            'state': self.state,
+            'pid': self.process.pid if self.state == 'running' else None,
+            'command': self.command,
+            'uptime': round(time.time() - self.started_at, 1) if self.state == 'running' else 0,
+            'restarts': self.restarts,
+            'last_exit_code': self.last_exit_code,
+            'last_exit_at': self.last_exit_at,
+            'next_start': self.next_start if self.state in ('backoff', 'crash_loop') else None,
+        }
+        if self.state == 'running' and self.usage is not None:
+            try:
+                with self.usage.oneshot():
+                    status.update({
+                        'cpu_percent': self.usage.cpu_percent(interval=None),
+                        'rss_mb': round(self.usage.memory_info().rss / (1024 * 1024), 2),
+                        'num_threads': self.usage.num_threads(),
+                    })
+            except psutil.Error:
+                pass
+        return status
+
+
+class Supervisor:
+    """SIGCHLD로 자식 종료를 즉시 감지해 재시작하는 프로세스 감시기
+
+    종료 신호는 set_wakeup_fd 소켓으로 select 루프를 깨우므로 주기적인 폴링이 없고,
+    재시작은 지수 backoff와 crash loop 감지로 제한한다.
+    상태(가동 시간, 재시작 횟수, 자원 사용량)는 status_path JSON 파일로 내보낸다.
+    """
+
+    def __init__(self, processes, **settings):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings)
+        self.children = [Child(spec, self.settings['backoff_initial']) for spec in processes]
+        self._by_pid = {}
+        self._stopping = False
+        self.status_path = Path(self.settings['status_path'])
+
+    def _install_signals(self):
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        signal.set_wakeup_fd(self._wakeup_w.fileno())
+        # 핸들러가 있어야 SIGCHLD 수신 시 wakeup fd에 기록됨 (실제 처리는 루프에서)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+
+    def _start(self, child):
+        try:
+            child.spawn()
+            self._by_pid[child.process.pid] = child
+            logging.info(f"Started {child.name} (pid {child.process.pid})")
+        except Exception as e:
+            logging.error(f"Error starting {child.name}: {e}")
+            self._schedule_restart(child, time.time())
+
+    def _schedule_restart(self, child, now):
+        # 충분히 오래 실행됐던 프로세스는 backoff를 처음부터 다시 적용
+        if child.started_at is not None and now - child.started_at >= self.settings['stable_seconds']:
+            child.backoff = self.settings['backoff_initial']
+
+        child.exits.append(now)
+        while child.exits and now - child.exits[0] > self.settings['crash_loop_window']:
+            child.exits.popleft()
+        if len(child.exits) >= self.settings['crash_loop_restarts']:
+            child.state = 'crash_loop'
+            child.next_start = now + self.settings['crash_loop_cooldown']
+            child.exits.clear()
+            logging.error(
+                f"{child.name} is crash looping, pausing restarts for "
+                f"{self.settings['crash_loop_cooldown']:g}s"
+            )
+            return
+
+        child.state = 'backoff'
+        child.next_start = now + child.backoff
+        logging.warning(f"Restarting {child.name} in {child.backoff:g}s")
+        child.backoff = min(child.backoff * 2, self.settings['backoff_max'])
+
+    def _reap(self):
+        """종료된 자식을 모두 회수 (WNOHANG이므로 블록하지 않음)
+
+        같은 프로세스의 다른 자식(예: 프로세스 풀)은 건드리지 않도록 감시 대상 PID만 확인한다.
+        """
+        changed = False
+        for pid in list(self._by_pid):
+            try:
+                waited, wait_status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                continue
+            if waited == 0:
+                continue
+            child = self._by_pid.pop(pid)
+            now = time.time()
+            child.process.returncode = os.waitstatus_to_exitcode(wait_status)
+            child.last_exit_code = child.process.returncode
+            child.last_exit_at = now
+            logging.warning(f"{child.name} (pid {pid}) exited with {child.last_exit_code}")
+            if not self._stopping:
+                self._schedule_restart(child, now)
+            changed = True
+        return changed
+
+    def _start_due(self, now):
+        changed = False
+        for child in self.children:
+            if child.state in ('stopped', 'backoff', 'crash_loop') and child.next_start <= now:
+                if child.state != 'stopped':
+                    child.restarts += 1
+                self._start(child)
+                changed = True
+        return changed
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'updated_at': time.time(),
+            'status_interval': self.settings['status_interval'],
+            'processes': {child.name: child.status() for child in self.children},
+        }
+
+    def write_status(self):
+        try:
+            self.status_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.status_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.status(), f)
+            os.replace(tmp_path, self.status_path)
+        except Exception as e:
+            logging.error(f"Error writing supervisor status: {e}")
+
+    def run(self):
+        self._install_signals()
+        next_status = 0.0
+        while not self._stopping:
+            now = time.time()
+            changed = self._start_due(now)
+            if changed or now >= next_status:
+                self.write_status()
+                next_status = now + self.settings['status_interval']
+
+            # 다음 재시작 예정 시각이나 상태 기록 시각까지 신호를 기다림
+            deadlines = [next_status] + [
+                child.next_start for child in self.children if child.state != 'running'
+            ]
+            timeout = max(0.0, min(deadlines) - time.time())
+            select.select([self._wakeup_r], [], [], timeout)
+            try:
+                while self._wakeup_r.recv(4096):
+                    pass
+            except BlockingIOError:
+                pass
+            if self._reap():
+                self.write_status()
+        self.shutdown()
+
+    def shutdown(self, timeout=10.0):
+        logging.info("Shutting down supervised processes...")
+        running = [child for child in self.children if child.state == 'running']
+        for child in running:
+            child.process.terminate()
+        deadline = time.time() + timeout
+        for child in running:
+            try:
+                child.process.wait(max(0.0, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                child.process.kill()
+                child.process.wait()
+            child.state = 'stopped'
+        self.write_status()
+
+
+def read_status(status_path):
+    """감시기가 기록한 상태 파일을 읽어 반환 (없으면 None)
+
+    감시기 프로세스가 없거나 상태 갱신이 멈췄으면 running=False로 표시한다.
+    """
+    try:
+        with open(status_path, 'r') as f:
+            status = json.load(f)
+    except FileNotFoundError:
+        return None
+    stale_after = status.get('status_interval', DEFAULT_SETTINGS['status_interval']) * 3
+    status['running'] = (
+        psutil.pid_exists(status['pid']) and time.time() - status['updated_at'] <= stale_after
+    )
+    return status
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# 모듈이 저장소 루트에 평평하게 놓여 있으므로 루트를 import 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metrics_collector import MetricsCollector
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    # 설정 파일이 없는 빈 작업 디렉터리에서 기본 설정으로 생성 (data/, logs/는 tmp_path 아래)
+    monkeypatch.chdir(tmp_path)
+    collector = MetricsCollector()
+    yield collector
+    collector.close()
+    collector.segment_store.close()
@@ -0,0 +1,74 @@
+from alert_engine import AlertEngine
+
+RULES = [
+    {'id': 'cpu_high', 'metric': 'cpu', 'above': 80, 'clear': 70, 'for_seconds': 60,
+     'severity': 'high'},
+    {'id': 'disk_full', 'metric': 'disk.usage_percent', 'above': 85, 'for_seconds': 0},
+    {'id': 'db_memory', 'metric': 'memory.usage_percent', 'above': 90, 'servers': ['db']},
+]
+
+
+def sample(cpu=10.0, disk=50.0, memory=50.0):
+    return {'cpu': cpu, 'disk': {'usage_percent': disk}, 'memory': {'usage_percent': memory}}
+
+
+def states(alerts):
+    return [(alert['rule'], alert['state']) for alert in alerts]
+
+
+def test_pending_fires_after_duration_then_resolves_below_clear():
+    engine = AlertEngine(RULES)
+    assert engine.evaluate('local', 0, sample(cpu=90)) == []
+    assert [(a['rule'], a['state']) for a in engine.active()] == [('cpu_high', 'pending')]
+    assert engine.evaluate('local', 30, sample(cpu=95)) == []
+
+    fired = engine.evaluate('local', 60, sample(cpu=91))
+    assert states(fired) == [('cpu_high', 'firing')]
+    assert fired[0]['value'] == 91 and fired[0]['threshold'] == 80
+    assert fired[0]['severity'] == 'high'
+    # 발생 중에는 같은 알림을 다시 만들지 않음
+    assert engine.evaluate('local', 90, sample(cpu=99)) == []
+
+    # 발생 임계값 아래지만 해제 임계값 위면 유지 (히스테리시스)
+    assert engine.evaluate('local', 120, sample(cpu=75)) == []
+    resolved = engine.evaluate('local', 150, sample(cpu=65))
+    assert states(resolved) == [('cpu_high', 'resolved')]
+    assert resolved[0]['threshold'] == 70
+    assert engine.active() == []
+
+
+def test_pending_returns_to_ok_when_condition_does_not_hold():
+    engine = AlertEngine(RULES)
+    engine.evaluate('local', 0, sample(cpu=90))
+    assert engine.evaluate('local', 30, sample(cpu=50)) == []
+    assert engine.active() == []
+    # 다시 넘으면 지속 시간을 처음부터 셈
+    engine.evaluate('local', 40, sample(cpu=90))
+    assert engine.evaluate('local', 70, sample(cpu=90)) == []
+    assert states(engine.evaluate('local', 100, sample(cpu=90))) == [('cpu_high', 'firing')]
+
+
+def test_zero_duration_rule_fires_immediately_and_can_refire():
+    engine = AlertEngine(RULES)
+    assert states(engine.evaluate('local', 0, sample(disk=90))) == [('disk_full', 'firing')]
+    assert states(engine.evaluate('local', 1, sample(disk=80))) == [('disk_full', 'resolved')]
+    assert states(engine.evaluate('local', 2, sample(disk=90))) == [('disk_full', 'firing')]
+
+
+def test_servers_are_tracked_independently_and_scoped_rules_apply():
+    engine = AlertEngine(RULES)
+    assert engine.evaluate('web', 0, sample(memory=95)) == []
+    assert states(engine.evaluate('db', 0, sample(memory=95, disk=90))) == [
+        ('disk_full', 'firing'), ('db_memory', 'firing')
+    ]
+    assert engine.evaluate('web', 1, sample()) == []
+    assert {(a['server_id'], a['rule']) for a in engine.active()} == {
+        ('db', 'disk_full'), ('db', 'db_memory')
+    }
+
+
+def test_missing_metric_keeps_state():
+    engine = AlertEngine(RULES)
+    engine.evaluate('local', 0, sample(disk=90))
+    assert engine.evaluate('local', 1, {'cpu': 10.0}) == []
+    assert [a['rule'] for a in engine.active()] == ['disk_full']
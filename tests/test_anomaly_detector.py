@@ -0,0 +1,31 @@
+import json
+import time
+
+from anomaly_detector import AnomalyDetector
+
+
+def test_queued_checkpoint_does_not_overwrite_newer(tmp_path):
+    # 저널 큐 대신 작업을 모아 두었다가 순서를 바꿔 실행
+    queued = []
+    path = tmp_path / 'anomaly_state.json'
+    detector = AnomalyDetector(queued.append, checkpoint_path=str(path), checkpoint_interval=0, metrics=['cpu'])
+
+    now = time.time()
+    detector.update('local', now, {'cpu': 10.0})
+    detector.update('local', now + 1, {'cpu': 20.0})
+    assert len(queued) == 2
+    queued[1]()
+    with open(path) as f:
+        latest = json.load(f)
+
+    queued[0]()
+    with open(path) as f:
+        assert json.load(f) == latest
+    assert latest['servers']['local']['last_time'] == now + 1
+
+
+def test_checkpoint_skipped_when_clean(tmp_path):
+    path = tmp_path / 'anomaly_state.json'
+    detector = AnomalyDetector(checkpoint_path=str(path))
+    detector.checkpoint()
+    assert not path.exists()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from downsample import lttb_indices
+
+
+def test_keeps_endpoints_and_returns_sorted_unique_indices():
+    xs = np.arange(10_000, dtype=float)
+    ys = np.sin(xs / 50.0)
+    keep = lttb_indices(xs, ys, 300)
+    assert len(keep) == 300
+    assert keep[0] == 0 and keep[-1] == len(xs) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_preserves_isolated_spikes():
+    xs = np.arange(5_000, dtype=float)
+    ys = np.zeros(5_000)
+    ys[1234] = 100.0
+    ys[4321] = -50.0
+    keep = lttb_indices(xs, ys, 50)
+    assert 1234 in keep and 4321 in keep
+
+
+def test_short_series_are_returned_unchanged():
+    xs = np.arange(10, dtype=float)
+    assert lttb_indices(xs, xs, 10).tolist() == list(range(10))
+    assert lttb_indices(xs, xs, 100).tolist() == list(range(10))
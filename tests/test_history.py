@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+def fill(collector, start, count):
+    for i in range(count):
+        cpu = 90.0 if i == count // 2 else 10.0 + i % 5
+        collector.segment_store.append((start + i, cpu, 16.0, 8.0, 50.0, 1.0, 2.0))
+
+
+def test_raw_history_is_downsampled_with_lttb(collector):
+    start = time.time() - 3600
+    fill(collector, start, 3600)
+    history = collector.get_history('cpu_usage', start, start + 3600, 300)
+    assert history['resolution'] == 'raw'
+    assert history['downsampled'] == 'lttb'
+    assert len(history['timestamps']) == len(history['values']) == 300
+    # 단일 피크가 남아 있어야 함
+    assert max(history['values']) == 90.0
+
+
+def test_history_below_point_limit_is_returned_as_is(collector):
+    start = time.time() - 100
+    fill(collector, start, 100)
+    history = collector.get_history('cpu_usage', start, start + 100, 300)
+    assert 'downsampled' not in history
+    assert len(history['values']) == 100
+
+
+def test_coarse_range_without_rollups_falls_back_to_raw(collector):
+    now = time.time()
+    fill(collector, now - 50, 50)
+    history = collector.get_history('cpu_usage', now - 7 * 86400, now + 1, 100)
+    assert history['resolution'] == 'raw'
+    assert len(history['values']) == 50
+
+
+def test_unknown_metric_is_rejected(collector):
+    with pytest.raises(ValueError):
+        collector.get_history('nope', 0, 1, 10)
@@ -0,0 +1,35 @@
+import os
+
+import psutil
+
+from process_table import ProcessTable
+
+
+def test_refresh_reuses_cached_process_objects():
+    table = ProcessTable(top_n=5)
+    table.refresh()
+    process = table._cache[os.getpid()].process
+    table.refresh()
+    assert table._cache[os.getpid()].process is process
+
+
+def test_refresh_replaces_reused_pid(monkeypatch):
+    table = ProcessTable(top_n=5)
+    table.refresh()
+    tracked = table._cache[os.getpid()]
+    tracked.cpu_total = 1e9
+    # 같은 PID에 다른 프로세스가 뜬 것처럼 기존 객체가 더는 실행 중이 아니라고 응답
+    monkeypatch.setattr(tracked.process, 'is_running', lambda: False)
+    table.refresh()
+    replaced = table._cache[os.getpid()]
+    assert replaced is not tracked
+    assert replaced.cpu_total < 1e9
+
+
+def test_refresh_drops_exited_pids(monkeypatch):
+    table = ProcessTable(top_n=5)
+    table.refresh()
+    pids = [pid for pid in psutil.pids() if pid != os.getpid()]
+    monkeypatch.setattr(psutil, 'pids', lambda: pids)
+    table.refresh()
+    assert os.getpid() not in table._cache
@@ -0,0 +1,229 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from remote_collector import HostConnection, RemoteCollector
+from sample_codec import MIME_TYPE, encode_batch
+from sample_store import SHIPPED_COLUMN_NAMES, metrics_from_row
+
+
+def make_row(seq):
+    # float32로 정확히 표현되는 값만 사용 (코덱 왕복 후 비교)
+    return (1_700_000_000.0 + seq, 10.0 + seq % 8, 16.0, 8.0, 50.0, 1.5, 2.5, 100.0, 40.0, 40.0)
+
+
+class StandInAgent:
+    """agent.py와 같은 엔드포인트를 흉내 내는 asyncio 기반 로컬 에이전트"""
+
+    def __init__(self, batch=True, binary=True):
+        self.batch = batch
+        self.binary = binary
+        self.rows = []
+        # 링 버퍼에서 밀려난 가장 오래된 샘플 수
+        self.dropped = 0
+        self.started_at = 1000.0
+        self.connections = 0
+        self.requests = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def add(self, count):
+        start = self.dropped + len(self.rows)
+        self.rows.extend(make_row(seq) for seq in range(start, start + count))
+
+    def drop(self, count):
+        del self.rows[:count]
+        self.dropped += count
+
+    @property
+    def head(self):
+        return self.dropped + len(self.rows)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                _, target, _ = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                self.requests.append(target)
+                status, content_type, body = self._respond(target, headers)
+                writer.write((
+                    f'HTTP/1.1 {status} X\r\nContent-Type: {content_type}\r\n'
+                    f'Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n'
+                ).encode('latin-1') + body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _respond(self, target, headers):
+        url = urlsplit(target)
+        if url.path == '/api/metrics' and self.rows:
+            metrics = metrics_from_row(SHIPPED_COLUMN_NAMES, self.rows[-1])
+            return 200, 'application/json', json.dumps(metrics).encode()
+        if url.path == '/api/samples' and self.batch:
+            query = parse_qs(url.query)
+            since = int(query['since'][0]) if 'since' in query else max(self.head - 1, 0)
+            first = min(max(since, self.dropped), self.head)
+            rows = self.rows[first - self.dropped:]
+            if self.binary and MIME_TYPE in headers.get('accept', ''):
+                body = encode_batch(SHIPPED_COLUMN_NAMES, rows, first, self.head, self.started_at)
+                return 200, MIME_TYPE, body
+            batch = {
+                'columns': SHIPPED_COLUMN_NAMES, 'rows': rows, 'first_seq': first,
+                'head_seq': self.head, 'started_at': self.started_at,
+            }
+            return 200, 'application/json', json.dumps(batch).encode()
+        return 404, 'application/json', b'{"error":"Not found"}'
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def make_collector(agent, **kwargs):
+    received = []
+    collector = RemoteCollector(
+        {'agent': {'host': '127.0.0.1', 'port': agent.port}},
+        interval=0.01, timeout=1.0, batch_interval=0.01,
+        on_metrics=received.append, **kwargs
+    )
+    return collector, received
+
+
+async def run_until(collector, condition):
+    """수집기 코루틴을 조건이 만족될 때까지 실행한 뒤 정지"""
+    task = asyncio.ensure_future(collector._main())
+    await asyncio.sleep(0)
+    while not condition():
+        await asyncio.sleep(0.01)
+    collector._stop_event.set()
+    await task
+
+
+def test_batch_fetch_follows_sequence_numbers():
+    async def scenario():
+        agent = StandInAgent()
+        await agent.start()
+        agent.add(5)
+        collector, _ = make_collector(agent)
+        status = {}
+        connection = HostConnection('127.0.0.1', agent.port, 1.0)
+        server = collector.servers['agent']
+
+        # 처음에는 최신 샘플 하나부터
+        samples, more = await collector._fetch_batch(connection, server, status)
+        assert [s['timestamp'] for s in samples] == [make_row(4)[0]]
+        assert status['next_seq'] == 5 and not more
+
+        agent.add(3)
+        samples, more = await collector._fetch_batch(connection, server, status)
+        assert [s['cpu'] for s in samples] == [make_row(seq)[1] for seq in (5, 6, 7)]
+        assert samples[0]['disk']['usage_percent'] == 40.0
+        assert status['next_seq'] == 8
+        assert agent.requests[-1] == '/api/samples?since=5'
+        # 같은 keep-alive 연결을 재사용
+        assert agent.connections == 1
+        connection.close()
+        await agent.stop()
+
+    run(scenario())
+
+
+def test_batch_fetch_counts_lost_samples_and_restarts():
+    async def scenario():
+        agent = StandInAgent(binary=False)
+        await agent.start()
+        agent.add(3)
+        collector, _ = make_collector(agent)
+        status = {}
+        connection = HostConnection('127.0.0.1', agent.port, 1.0)
+        server = collector.servers['agent']
+        await collector._fetch_batch(connection, server, status)
+
+        # 끊긴 동안 버퍼에서 밀려난 샘플
+        agent.add(10)
+        agent.drop(6)
+        samples, _ = await collector._fetch_batch(connection, server, status)
+        assert status['lost_samples'] == 3
+        assert len(samples) == 7 and status['next_seq'] == 13
+
+        # 재시작한 에이전트는 순번 0부터 다시 보냄
+        agent.started_at = 2000.0
+        samples, more = await collector._fetch_batch(connection, server, status)
+        assert samples == [] and more
+        assert status['agent_restarts'] == 1 and status['next_seq'] == 0
+        connection.close()
+        await agent.stop()
+
+    run(scenario())
+
+
+def test_poll_loop_delivers_every_sample_once():
+    async def scenario():
+        agent = StandInAgent()
+        await agent.start()
+        agent.add(1)
+        collector, received = make_collector(agent)
+
+        async def feed():
+            # 첫 요청은 에이전트의 최신 샘플부터 시작하므로 첫 수신 이후에 추가
+            while not received:
+                await asyncio.sleep(0.005)
+            for _ in range(4):
+                await asyncio.sleep(0.02)
+                agent.add(5)
+
+        feeder = asyncio.ensure_future(feed())
+        await run_until(collector, lambda: feeder.done() and len(received) >= 21)
+        timestamps = [metrics['timestamp'] for metrics in received]
+        assert timestamps == [make_row(seq)[0] for seq in range(agent.head)]
+        assert all(metrics['server_id'] == 'agent' for metrics in received)
+        assert collector.status('agent')['status'] == 'up'
+        assert collector.latest('agent')['timestamp'] == make_row(20)[0]
+        await agent.stop()
+
+    run(scenario())
+
+
+def test_falls_back_to_polling_without_batch_endpoint():
+    async def scenario():
+        agent = StandInAgent(batch=False)
+        await agent.start()
+        agent.add(1)
+        collector, received = make_collector(agent)
+        await run_until(collector, lambda: len(received) >= 2)
+        assert collector.status('agent')['protocol'] == 'poll'
+        assert '/api/metrics' in agent.requests
+        assert received[0]['cpu'] == make_row(0)[1]
+        await agent.stop()
+
+    run(scenario())
+
+
+def test_unreachable_agent_is_marked_down():
+    async def scenario():
+        agent = StandInAgent()
+        await agent.start()
+        await agent.stop()
+        collector, received = make_collector(agent)
+        await run_until(collector, lambda: collector.status('agent')['failures'] >= 2)
+        status = collector.status('agent')
+        assert status['status'] == 'down' and status['last_error']
+        assert received == []
+
+    run(scenario())
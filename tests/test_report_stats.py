@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from report_stats import SUMMARY_HEADERS, compute_summary, summary_rows
+from segment_store import SegmentStore
+
+
+def day(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').timestamp()
+
+
+def test_summary_includes_hourly_histograms(tmp_path):
+    store = SegmentStore(tmp_path / 'metrics')
+    # 10시에는 CPU 5% 샘플 3개, 11시에는 95% 샘플 2개
+    for ts, cpu in (('10:00:00', 5.0), ('10:00:01', 5.0), ('10:00:02', 5.0),
+                    ('11:00:00', 95.0), ('11:00:01', 95.0)):
+        store.append((day(f'2024-01-01 {ts}'), cpu, 16.0, 8.0, 50.0, 1.0, 2.0))
+    store.close()
+
+    summary = compute_summary(tmp_path, day('2024-01-01 00:00:00'), day('2024-01-02 00:00:00'))
+    cpu = summary['metrics']['cpu_usage']
+    assert len(cpu['hourly_histogram_edges']) == 11
+    hourly = {item['hour']: item['histogram'] for item in cpu['hourly']}
+    assert set(hourly) == {10, 11}
+    assert hourly[10] == [3] + [0] * 9
+    assert hourly[11] == [0] * 9 + [2]
+
+    rows = {row[0]: dict(zip(SUMMARY_HEADERS, row)) for row in summary_rows(summary)}
+    assert rows['cpu_usage']['hour_10_histogram'] == '3|0|0|0|0|0|0|0|0|0'
+    assert rows['cpu_usage']['hour_09_histogram'] == ''
+    assert rows['cpu_usage']['hourly_histogram_edges'].startswith('0|10|20')
+    assert all(len(row) == len(SUMMARY_HEADERS) for row in rows.values())
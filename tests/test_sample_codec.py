@@ -0,0 +1,59 @@
+import random
+import struct
+
+import pytest
+
+from sample_codec import HEADER, decode_batch, encode_batch
+
+COLUMNS = ('timestamp', 'cpu_usage', 'memory_usage_percent', 'disk_read_iops')
+
+
+def as_float32(value):
+    return struct.unpack('<f', struct.pack('<f', value))[0]
+
+
+def test_round_trip_is_lossless_for_float32_values():
+    rng = random.Random(7)
+    rows = []
+    ts = 1_700_000_000.123456
+    for _ in range(500):
+        # 주기가 흔들리고 값이 크게 바뀌거나 그대로인 경우가 섞이도록
+        ts += 1.0 + rng.uniform(-0.01, 0.01)
+        rows.append((
+            ts,
+            rng.choice([0.0, 12.5, rng.uniform(0, 100)]),
+            rng.uniform(0, 100),
+            rng.choice([0.0, 1e6 * rng.random(), -3.25]),
+        ))
+    data = encode_batch(COLUMNS, rows, 42, 600, 1234.5)
+    batch = decode_batch(data)
+
+    assert batch['columns'] == list(COLUMNS)
+    assert (batch['first_seq'], batch['head_seq'], batch['started_at']) == (42, 600, 1234.5)
+    assert len(batch['rows']) == len(rows)
+    for original, decoded in zip(rows, batch['rows']):
+        assert decoded[0] == pytest.approx(original[0], abs=1e-6)
+        assert decoded[1:] == tuple(as_float32(value) for value in original[1:])
+
+
+def test_regular_samples_compress_well():
+    rows = [(1_700_000_000.0 + i, 25.0, 50.0, 0.0) for i in range(1000)]
+    data = encode_batch(COLUMNS, rows, 0, 1000, 0.0)
+    # 고정 주기 타임스탬프는 1바이트, 변하지 않는 값은 1비트
+    assert len(data) < 1500
+    assert decode_batch(data)['rows'] == rows
+
+
+def test_empty_batch():
+    batch = decode_batch(encode_batch(COLUMNS, [], 10, 10, 5.0))
+    assert batch['rows'] == [] and batch['first_seq'] == 10
+
+
+def test_rejects_foreign_or_truncated_data():
+    data = encode_batch(COLUMNS, [(1.0, 2.0, 3.0, 4.0), (2.0, 5.0, 6.0, 7.0)], 0, 2, 0.0)
+    with pytest.raises(ValueError):
+        decode_batch(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        decode_batch(data[:HEADER.size - 1])
+    with pytest.raises(ValueError):
+        decode_batch(data[:-3])
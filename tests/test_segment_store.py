@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from rollups import RollupManager
+from segment_store import SegmentStore
+
+
+def day(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M').timestamp()
+
+
+def row(ts, cpu=10.0):
+    return (ts, cpu, 16.0, 8.0, 50.0, 1.0, 2.0)
+
+
+def test_rows_span_day_partitions_in_order(tmp_path):
+    store = SegmentStore(tmp_path)
+    timestamps = [day('2024-01-01 23:59'), day('2024-01-02 00:00'), day('2024-01-02 12:00')]
+    for ts in timestamps:
+        store.append(row(ts))
+    assert store.partitions() == ['2024-01-01', '2024-01-02']
+    assert [r[0] for r in store.rows()] == timestamps
+    assert [r[0] for r in store.rows(day('2024-01-02 00:00'), None)] == timestamps[1:]
+    assert store.nbytes == 3 * store.record_size
+    store.close()
+
+
+def test_prune_removes_only_partitions_before_the_cutoff(tmp_path):
+    store = SegmentStore(tmp_path)
+    for value in ('2024-01-01 10:00', '2024-01-02 10:00', '2024-01-03 10:00'):
+        store.append(row(day(value)))
+    removed = store.prune(day('2024-01-02 18:00'))
+    assert removed == ['2024-01-01']
+    assert store.partitions() == ['2024-01-02', '2024-01-03']
+    # 기록 중인 세그먼트는 기준보다 오래돼도 지우지 않음
+    assert store.prune(day('2024-02-01 00:00')) == ['2024-01-02']
+    assert store.partitions() == ['2024-01-03']
+    store.append(row(day('2024-01-03 11:00')))
+    assert len(list(store.rows())) == 2
+    store.close()
+
+
+def test_rollup_tiers_are_pruned_by_their_own_retention(tmp_path):
+    rollups = RollupManager(tmp_path)
+    for value in ('2023-01-01 10:00', '2023-01-01 10:01', '2024-01-01 10:00', '2024-01-01 10:01'):
+        rollups.add(row(day(value)))
+    rollups.add(row(day('2024-01-02 10:00')))
+    assert rollups['1m'].store.partitions()[0] == '2023-01-01'
+
+    removed = rollups.prune(day('2024-01-02 12:00'), {'1m': 30, '1h': 0})
+    assert removed == {'1m': ['2023-01-01']}
+    assert rollups['1m'].store.partitions()[0] == '2024-01-01'
+    assert rollups['1h'].store.partitions()[0] == '2023-01'
@@ -0,0 +1,115 @@
+import json
+import struct
+import threading
+
+import pytest
+
+from shared_ring import SLOT_HEADER_SIZE, SharedRing, SharedRingReader, slot_size_for
+
+
+def test_publish_and_read_wrap_around(tmp_path):
+    ring = SharedRing(tmp_path / 'metrics.ring', slots=4, slot_size=256, create=True)
+    for seq in range(1, 7):
+        ring.publish(seq, json.dumps({'seq': seq}).encode())
+    assert ring.head() == 6
+    assert json.loads(ring.read(6)) == {'seq': 6}
+    assert json.loads(ring.read(3)) == {'seq': 3}
+    # 덮어쓰인 슬롯은 None
+    assert ring.read(2) is None
+    ring.close()
+
+
+def test_oversized_payload_is_rejected(tmp_path):
+    ring = SharedRing(tmp_path / 'metrics.ring', slots=2, slot_size=128, create=True)
+    with pytest.raises(ValueError):
+        ring.publish(1, b'x' * (128 - SLOT_HEADER_SIZE + 1))
+    assert ring.head() == 0
+    ring.close()
+
+
+def test_slot_size_leaves_headroom_for_the_first_snapshot():
+    payload = b'x' * 10_000
+    size = slot_size_for(payload, 4096)
+    assert size % 4096 == 0 and size - SLOT_HEADER_SIZE >= 2 * len(payload)
+    assert slot_size_for(b'{}', 16384) == 16384
+
+
+def test_reader_skips_slot_while_writer_holds_it(tmp_path):
+    path = tmp_path / 'metrics.ring'
+    ring = SharedRing(path, slots=4, slot_size=256, create=True)
+    ring.publish(1, b'{"seq":1}')
+    reader = SharedRing(path)
+    # 쓰기 중(홀수 버전)인 슬롯은 일관된 값을 읽을 수 없으므로 None
+    offset = ring._slot_offset(1)
+    version = struct.unpack_from('<Q', ring._mmap, offset)[0]
+    struct.pack_into('<Q', ring._mmap, offset, version + 1)
+    assert reader.read(1) is None
+    struct.pack_into('<Q', ring._mmap, offset, version + 2)
+    assert reader.read(1) == b'{"seq":1}'
+    reader.close()
+    ring.close()
+
+
+def test_concurrent_reader_never_sees_torn_snapshots(tmp_path):
+    path = tmp_path / 'metrics.ring'
+    ring = SharedRing(path, slots=2, slot_size=4096, create=True)
+    reader = SharedRing(path)
+    done = threading.Event()
+
+    def payload(seq):
+        return json.dumps({'seq': seq, 'pad': chr(97 + seq % 26) * 1000}).encode()
+
+    ring.publish(1, payload(1))
+
+    def writer():
+        for seq in range(2, 3000):
+            ring.publish(seq, payload(seq))
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    checked = 0
+    while not done.is_set():
+        seq = reader.head()
+        data = reader.read(seq)
+        if data is not None:
+            assert data == payload(seq)
+            checked += 1
+    thread.join()
+    assert checked
+    reader.close()
+    ring.close()
+
+
+def test_ring_reader_serves_latest_and_backfill(tmp_path):
+    path = tmp_path / 'metrics.ring'
+    ring = SharedRing(path, slots=8, slot_size=256, interval=0.1, create=True)
+    for seq in range(1, 6):
+        ring.publish(seq, json.dumps({'seq': seq}).encode())
+    reader = SharedRingReader(path, backfill=3)
+    assert reader.latest().metrics == {'seq': 5}
+    stream = reader.subscribe(backfill=3)
+    assert [next(stream).seq for _ in range(3)] == [3, 4, 5]
+    ring.publish(6, b'{"seq":6}')
+    assert next(stream).metrics == {'seq': 6}
+    ring.close()
+
+
+def test_ring_reader_remaps_recreated_ring(tmp_path):
+    path = tmp_path / 'metrics.ring'
+    old_ring = SharedRing(path, slots=8, slot_size=256, interval=0.01, create=True)
+    for seq in range(1, 4):
+        old_ring.publish(seq, json.dumps({'seq': seq}).encode())
+    reader = SharedRingReader(path)
+    assert reader.latest().metrics == {'seq': 3}
+    stream = reader.subscribe(timeout=1.0)
+
+    # 샘플러 재시작: 같은 경로에 새 링을 만들고 seq 1부터 다시 발행
+    new_ring = SharedRing(path, slots=8, slot_size=256, interval=0.01, create=True)
+    new_ring.publish(1, b'{"restarted":1}')
+    assert next(stream).metrics == {'restarted': 1}
+    assert reader.latest().metrics == {'restarted': 1}
+    new_ring.publish(2, b'{"restarted":2}')
+    assert next(stream).metrics == {'restarted': 2}
+    old_ring.close()
+    new_ring.close()
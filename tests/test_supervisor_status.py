@@ -0,0 +1,28 @@
+import json
+import os
+import time
+from pathlib import Path
+
+
+def write_status(path, processes):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'pid': os.getpid(), 'updated_at': time.time(), 'status_interval': 5.0,
+            'processes': processes,
+        }, f)
+
+
+def test_supervisor_status_reads_every_supervisor(collector):
+    assert collector.get_supervisor_status() is None
+
+    paths = collector.config['supervisor_status_paths']
+    write_status(paths['serve'], {'worker-0': {'state': 'running'}})
+    status = collector.get_supervisor_status()
+    assert status['monitor'] is None
+    assert status['serve']['running'] is True
+    assert status['serve']['processes'] == {'worker-0': {'state': 'running'}}
+
+    write_status(paths['monitor'], {'Metrics.py': {'state': 'running'}})
+    assert set(collector.get_supervisor_status()['monitor']['processes']) == {'Metrics.py'}
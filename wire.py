@@ -0,0 +1,58 @@
+import gzip
+import hashlib
+import json
+
+import msgpack
+from flask import Response, request
+
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+# 이보다 작은 응답은 압축 이득보다 비용이 큼
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+
+def dumps(data):
+    """공백 없는 JSON 바이트로 직렬화"""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def api_response(data=None, body=None, etag=None, status=200):
+    """Accept / Accept-Encoding / If-None-Match 에 맞춘 API 응답 생성
+
+    body에 미리 직렬화한 JSON을 넘기면 다시 인코딩하지 않는다.
+    etag=True이면 JSON 본문의 해시를 ETag로 사용한다.
+    """
+    if body is None:
+        body = dumps(data)
+    if etag is True:
+        etag = hashlib.md5(body).hexdigest()
+
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    mimetype = JSON_MIMETYPE
+    accepted = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, MSGPACK_MIMETYPE], default=JSON_MIMETYPE
+    )
+    if accepted == MSGPACK_MIMETYPE:
+        if data is None:
+            data = json.loads(body)
+        body = msgpack.packb(data, use_bin_type=True)
+        mimetype = MSGPACK_MIMETYPE
+
+    response = Response(body, status=status, mimetype=mimetype)
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    if etag is not None:
+        # 인코딩만 다른 표현도 같은 데이터이므로 약한 ETag 사용
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+
+    if len(body) >= GZIP_MIN_SIZE and 'gzip' in request.accept_encodings:
+        response.set_data(gzip.compress(body, GZIP_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response